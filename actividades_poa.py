@@ -0,0 +1,254 @@
+"""
+Actividades por carrera
+=======================
+
+Lector perezoso de la hoja actividades_carreras. La hoja se recorre una
+sola vez en modo streaming (openpyxl read_only) y se vuelca a un Parquet
+con un row group por bloque contiguo de carrera, junto con un índice
+carrera → row groups. Después, cada consulta solo lee los row groups de
+la carrera seleccionada. Si la caché no se puede escribir (directorio de
+solo lectura o disco lleno), la hoja se conserva en memoria.
+"""
+
+import json
+import os
+import unicodedata
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+from datos_poa import escribir_atomico, hash_archivo, ruta_cache
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+HOJA_ACTIVIDADES = 'actividades_carreras'
+VERSION_INDICE = 1
+FILAS_POR_GRUPO = 5000
+
+# Columnas A:P de la hoja, en orden
+COLUMNAS_ACTIVIDADES = [
+    'Carrera', 'Numero Estrategia', 'Numero Objetivo', 'Estado', 'Prioridad',
+    'Fecha de entrega', 'Tarea', 'Docente Responsable', 'Descripción', 'Entregable',
+    '% Ejecutado', 'Costos fijos', 'Horas estimadas', 'Horas actuales', 'Observación', 'año',
+]
+COLUMNAS_NUMERICAS = ['% Ejecutado', 'Costos fijos', 'Horas estimadas', 'Horas actuales']
+
+ESQUEMA_ACTIVIDADES = pa.schema(
+    [(c, pa.bool_()) if c == 'Estado'
+     else (c, pa.float64()) if c in COLUMNAS_NUMERICAS
+     else (c, pa.string())
+     for c in COLUMNAS_ACTIVIDADES]
+)
+
+# =============================================================================
+# NORMALIZACIÓN
+# =============================================================================
+def _nombre_normalizado(nombre):
+    """Nombre de carrera sin tildes, sin mayúsculas y con espacios simples."""
+    texto = unicodedata.normalize('NFKD', str(nombre))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.casefold().split())
+
+def clave_carrera(nombre):
+    """
+    Clave de comparación de una carrera: sin tildes, sin mayúsculas y
+    recortada a 31 caracteres (límite de Excel para nombres de hoja).
+    """
+    return _nombre_normalizado(nombre)[:31].rstrip()
+
+def _registrar_nombre(nombres, clave, nombre):
+    """
+    Asocia el nombre completo a su clave. Dos carreras distintas que solo
+    difieren después del carácter 31 comparten clave y mezclarían sus
+    actividades: en ese caso se rechaza la hoja.
+    """
+    anterior = nombres.setdefault(clave, nombre)
+    if _nombre_normalizado(anterior) != _nombre_normalizado(nombre):
+        raise ValueError(f"Las carreras '{anterior}' y '{nombre}' coinciden en sus primeros "
+                         f"31 caracteres y no se pueden distinguir de su hoja")
+
+def _a_estado(valor):
+    """Convierte la casilla Estado (bool, 0/1 o texto) a booleano."""
+    if isinstance(valor, str):
+        return valor.strip().upper() in ('TRUE', '1', 'VERDADERO', 'SI', 'SÍ')
+    return bool(valor) if valor is not None else False
+
+def _a_numero(valor):
+    """Convierte un valor de celda a float; None si no es numérico."""
+    if valor is None or isinstance(valor, bool):
+        return None
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return None
+
+def _a_texto(valor):
+    """Convierte un valor de celda a texto; None si está vacía."""
+    if valor is None:
+        return None
+    texto = str(valor).strip()
+    return texto or None
+
+def _normalizar_fila(fila):
+    """Convierte una fila cruda de la hoja a valores del esquema."""
+    fila = (list(fila) + [None] * len(COLUMNAS_ACTIVIDADES))[:len(COLUMNAS_ACTIVIDADES)]
+    registro = {}
+    for columna, valor in zip(COLUMNAS_ACTIVIDADES, fila):
+        if columna == 'Estado':
+            registro[columna] = _a_estado(valor)
+        elif columna in COLUMNAS_NUMERICAS:
+            registro[columna] = _a_numero(valor)
+        else:
+            registro[columna] = _a_texto(valor)
+    return registro
+
+# =============================================================================
+# LECTOR INDEXADO
+# =============================================================================
+class LectorActividades:
+    """
+    Acceso por carrera a la hoja actividades_carreras sin cargarla completa.
+    """
+
+    def __init__(self, file_path, file_hash=None):
+        self.file_path = file_path
+        self.file_hash = file_hash or hash_archivo(file_path)
+        self.ruta_datos = ruta_cache(file_path, self.file_hash, "actividades.parquet")
+        self.ruta_indice = ruta_cache(file_path, self.file_hash, "actividades.json")
+        # Tabla completa en memoria, solo cuando no se pudo escribir el Parquet
+        self._tabla = None
+        self.indice = self._leer_indice() or self._construir_indice()
+
+    def _leer_indice(self):
+        """Lee el índice persistido si corresponde a esta versión del workbook."""
+        try:
+            with open(self.ruta_indice, encoding="utf-8") as f:
+                indice = json.load(f)
+            if indice.get('version') != VERSION_INDICE or not os.path.exists(self.ruta_datos):
+                return None
+            return indice
+        except (OSError, ValueError):
+            return None
+
+    def _filas(self, wb):
+        """Filas de la hoja ya normalizadas, omitiendo las que no tienen carrera."""
+        if HOJA_ACTIVIDADES not in wb.sheetnames:
+            return
+        for fila in wb[HOJA_ACTIVIDADES].iter_rows(min_row=2, values_only=True):
+            registro = _normalizar_fila(fila)
+            if registro['Carrera']:
+                yield registro
+
+    def _indice_en_memoria(self):
+        """
+        Sin caché escribible: lee la hoja completa en una tabla en memoria y
+        devuelve el índice carrera → filas de esa tabla.
+        """
+        wb = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            registros = list(self._filas(wb))
+        finally:
+            wb.close()
+        self._tabla = pa.Table.from_pylist(registros, schema=ESQUEMA_ACTIVIDADES)
+        filas, nombres = {}, {}
+        for posicion, registro in enumerate(registros):
+            clave = clave_carrera(registro['Carrera'])
+            filas.setdefault(clave, []).append(posicion)
+            _registrar_nombre(nombres, clave, registro['Carrera'])
+        return {'version': VERSION_INDICE, 'hash': self.file_hash, 'filas': filas, 'nombres': nombres}
+
+    def _construir_indice(self):
+        """
+        Recorre la hoja una vez, escribe el Parquet por bloques de carrera
+        y devuelve el índice carrera → row groups.
+        """
+        grupos = {}
+        nombres = {}
+        estado = {'grupo': 0}
+
+        def escribir(ruta):
+            wb = load_workbook(self.file_path, read_only=True, data_only=True)
+            try:
+                with pq.ParquetWriter(ruta, ESQUEMA_ACTIVIDADES) as writer:
+                    bloque, clave_bloque = [], None
+
+                    def volcar():
+                        if not bloque:
+                            return
+                        tabla = pa.Table.from_pylist(bloque, schema=ESQUEMA_ACTIVIDADES)
+                        writer.write_table(tabla, row_group_size=len(bloque))
+                        grupos.setdefault(clave_bloque, []).append(estado['grupo'])
+                        estado['grupo'] += 1
+                        bloque.clear()
+
+                    for registro in self._filas(wb):
+                        clave = clave_carrera(registro['Carrera'])
+                        if clave != clave_bloque or len(bloque) >= FILAS_POR_GRUPO:
+                            volcar()
+                            clave_bloque = clave
+                        _registrar_nombre(nombres, clave, registro['Carrera'])
+                        bloque.append(registro)
+                    volcar()
+            finally:
+                wb.close()
+
+        try:
+            escribir_atomico(self.ruta_datos, escribir)
+        except OSError:
+            return self._indice_en_memoria()
+
+        indice = {'version': VERSION_INDICE, 'hash': self.file_hash,
+                  'grupos': grupos, 'nombres': nombres}
+        def escribir_indice(ruta):
+            with open(ruta, "w", encoding="utf-8") as f:
+                json.dump(indice, f, ensure_ascii=False)
+        try:
+            escribir_atomico(self.ruta_indice, escribir_indice)
+        except OSError:
+            # El Parquet ya está escrito: el índice queda solo en memoria
+            pass
+        return indice
+
+    def actividades(self, carrera):
+        """DataFrame con las actividades de una carrera (solo sus row groups)."""
+        clave = clave_carrera(carrera)
+        if self._tabla is not None:
+            filas = self.indice['filas'].get(clave)
+            if not filas:
+                return pd.DataFrame(columns=COLUMNAS_ACTIVIDADES)
+            return self._tabla.take(filas).to_pandas()
+        grupos = self.indice['grupos'].get(clave)
+        if not grupos:
+            return pd.DataFrame(columns=COLUMNAS_ACTIVIDADES)
+        return pq.ParquetFile(self.ruta_datos).read_row_groups(grupos).to_pandas()
+
+    def tabla(self, columnas=None):
+        """Todas las actividades como tabla Arrow, en el orden de la hoja."""
+        if self._tabla is not None:
+            return self._tabla.select(columnas) if columnas else self._tabla
+        return pq.read_table(self.ruta_datos, columns=columnas)
+
+# =============================================================================
+# RESÚMENES
+# =============================================================================
+def resumen_actividades(df):
+    """Totales de estado y horas de un DataFrame de actividades."""
+    total = len(df)
+    completadas = int(df['Estado'].sum()) if total else 0
+    return {
+        'total': total,
+        'completadas': completadas,
+        'pendientes': total - completadas,
+        'ejecutado_promedio': float(df['% Ejecutado'].mean() * 100) if total and df['% Ejecutado'].notna().any() else 0.0,
+        'horas_estimadas': float(df['Horas estimadas'].sum()) if total else 0.0,
+        'horas_actuales': float(df['Horas actuales'].sum()) if total else 0.0,
+        'por_prioridad': df['Prioridad'].fillna('Sin prioridad').value_counts().to_dict() if total else {},
+    }
+
+def detalle_estado(resumen):
+    """Línea con pendientes y conteo por prioridad de un resumen de actividades."""
+    prioridades = ' · '.join(f"{prioridad}: {conteo}" for prioridad, conteo in resumen['por_prioridad'].items())
+    return f"Pendientes: {resumen['pendientes']}" + (f" | Por prioridad: {prioridades}" if prioridades else '')
@@ -0,0 +1,184 @@
+"""
+Almacén multianual del Dashboard POA Carreras
+=============================================
+
+Registra una matriz de seguimiento por año y carga cada año solo cuando se
+consulta, manteniendo en memoria un número acotado de años (LRU).
+
+Los workbooks se descubren por nombre ('Matriz Seguimiento Carreras AAAA.xlsx')
+en el directorio de datos (el de la aplicación, o POA_DIRECTORIO_DATOS si
+está definido); el archivo anios_poa.json permite registrar rutas
+adicionales o sobrescribirlas: {"2024": "ruta/al/archivo.xlsx"}.
+Un año también puede ser un directorio 'Matriz Seguimiento Carreras AAAA'
+o un manifiesto JSON con un workbook por sede (ver consolidacion_poa).
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from consolidacion_poa import cargar_consolidado, es_consolidado, leer_fuentes
+from datos_poa import ARCHIVO_EXCEL, cargar_datos
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+DIRECTORIO_BASE = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_ANIOS = 'anios_poa.json'
+PATRON_WORKBOOK = re.compile(r'^Matriz Seguimiento Carreras (\d{4})\.xlsx$')
+PATRON_DIRECTORIO = re.compile(r'^Matriz Seguimiento Carreras (\d{4})$')
+MAX_ANIOS_EN_MEMORIA = 2
+
+def directorio_datos():
+    """Directorio donde se buscan los workbooks (POA_DIRECTORIO_DATOS o el de la aplicación)."""
+    return os.environ.get('POA_DIRECTORIO_DATOS') or DIRECTORIO_BASE
+
+# =============================================================================
+# REGISTRO DE AÑOS
+# =============================================================================
+def descubrir_workbooks(directorio=None):
+    """
+    Busca workbooks anuales (o directorios con un workbook por sede) por
+    nombre en el directorio: {año: ruta}.
+    """
+    directorio = directorio or directorio_datos()
+    workbooks = {}
+    for ruta in glob.glob(os.path.join(directorio, 'Matriz Seguimiento Carreras *')):
+        patron = PATRON_DIRECTORIO if os.path.isdir(ruta) else PATRON_WORKBOOK
+        coincidencia = patron.match(os.path.basename(ruta))
+        if coincidencia:
+            workbooks[int(coincidencia.group(1))] = ruta
+    return workbooks
+
+def leer_registro(directorio=None):
+    """Lee anios_poa.json: {año: ruta}; las rutas relativas son relativas al directorio."""
+    directorio = directorio or directorio_datos()
+    try:
+        with open(os.path.join(directorio, ARCHIVO_ANIOS), encoding="utf-8") as f:
+            registro = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {int(anio): os.path.join(directorio, ruta) for anio, ruta in registro.items()}
+
+class AlmacenAnios:
+    """
+    Registro año → workbook con carga perezosa y caché LRU acotada de los
+    años cargados. Es seguro compartirlo entre sesiones: todas leen la
+    misma VistaCarreras inmutable de cada año, cada año se carga una sola
+    vez aunque lo pidan varias sesiones a la vez, y una versión nueva
+    reemplaza a la anterior de una sola vez.
+    """
+
+    def __init__(self, workbooks=None, max_en_memoria=MAX_ANIOS_EN_MEMORIA):
+        if workbooks is None:
+            workbooks = {**descubrir_workbooks(), **leer_registro()}
+        if not workbooks:
+            workbooks = {None: os.path.join(directorio_datos(), ARCHIVO_EXCEL)}
+        self.workbooks = dict(sorted(workbooks.items(), key=lambda item: (item[0] is None, item[0])))
+        self.max_en_memoria = max_en_memoria
+        self._cargados = OrderedDict()
+        self._lock = threading.Lock()
+        self._locks_carga = {}
+
+    def anios(self):
+        """Años registrados, en orden ascendente."""
+        return list(self.workbooks)
+
+    def anio_actual(self):
+        """Año más reciente registrado."""
+        return self.anios()[-1]
+
+    def anio_anterior(self, anio):
+        """Año registrado inmediatamente anterior, o None."""
+        anteriores = [a for a in self.anios() if a is not None and anio is not None and a < anio]
+        return anteriores[-1] if anteriores else None
+
+    def ruta(self, anio):
+        """Ruta del workbook de un año."""
+        return self.workbooks[anio]
+
+    def archivos(self):
+        """{año: workbooks del año} (uno, o uno por sede si está consolidado)."""
+        archivos = {}
+        for anio, ruta in list(self.workbooks.items()):
+            try:
+                archivos[anio] = list(leer_fuentes(ruta).values()) if es_consolidado(ruta) else [ruta]
+            except (OSError, ValueError):
+                archivos[anio] = []
+        return archivos
+
+    def _lock_carga(self, anio):
+        """Lock que serializa la carga de un año."""
+        with self._lock:
+            return self._locks_carga.setdefault(anio, threading.Lock())
+
+    def _cargar(self, anio):
+        """Lee del disco (snapshot o Excel) los datos de un año."""
+        ruta = self.workbooks[anio]
+        return cargar_consolidado(ruta, anio) if es_consolidado(ruta) else cargar_datos(ruta, anio=anio)
+
+    def _guardar(self, anio, datos):
+        """Publica los datos de un año y descarta el usado hace más tiempo."""
+        with self._lock:
+            self._cargados[anio] = datos
+            self._cargados.move_to_end(anio)
+            while len(self._cargados) > self.max_en_memoria:
+                self._cargados.popitem(last=False)
+
+    def recargar(self, anio):
+        """
+        Vuelve a cargar un año que está en memoria y lo reemplaza de una sola
+        vez; mientras tanto las sesiones siguen leyendo la versión anterior.
+        """
+        with self._lock_carga(anio):
+            if anio not in self._cargados:
+                return
+            datos = self._cargar(anio)
+            with self._lock:
+                if anio in self._cargados:
+                    self._cargados[anio] = datos
+
+    def cargados(self):
+        """Años actualmente en memoria."""
+        return list(self._cargados)
+
+    def obtener(self, anio):
+        """
+        Devuelve (carreras_data, carreras_list) del año, cargándolo si no
+        está en memoria y descartando el año usado hace más tiempo.
+        """
+        with self._lock:
+            if anio in self._cargados:
+                self._cargados.move_to_end(anio)
+                return self._cargados[anio]
+        with self._lock_carga(anio):
+            # Otra sesión pudo cargarlo mientras se esperaba el lock
+            with self._lock:
+                if anio in self._cargados:
+                    return self._cargados[anio]
+            datos = self._cargar(anio)
+            self._guardar(anio, datos)
+        return datos
+
+# =============================================================================
+# COMPARACIÓN ENTRE AÑOS
+# =============================================================================
+def comparar_anios(carreras_actual, carreras_list, carreras_anterior):
+    """
+    Tabla de avance POA por carrera del año seleccionado frente al anterior,
+    con columnas avance_anterior, avance_actual y diferencia.
+    """
+    actual = carreras_actual.tabla['avance_poa']
+    anterior = carreras_anterior.tabla['avance_poa']
+    carreras = [c for c in carreras_list if c in actual.index]
+    tabla = pd.DataFrame({
+        'avance_anterior': anterior.reindex(carreras),
+        'avance_actual': actual.reindex(carreras),
+    })
+    tabla['diferencia'] = tabla['avance_actual'] - tabla['avance_anterior']
+    return tabla
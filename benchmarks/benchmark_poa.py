@@ -0,0 +1,238 @@
+"""
+Benchmarks del Dashboard POA Carreras
+=====================================
+
+Mide, sobre workbooks sintéticos de distintas escalas, el tiempo y la
+memoria pico de:
+    - la carga de datos en frío (parseo del Excel + snapshot) y en caliente,
+    - el índice y la lectura de actividades de una carrera,
+    - cada constructor de gráficos,
+    - una ejecución completa del script con streamlit.testing (AppTest).
+
+Los resultados se comparan con un archivo baseline para detectar regresiones.
+
+Uso por línea de comandos:
+    python -m benchmarks.benchmark_poa --escalas 20,200,2000
+    python -m benchmarks.benchmark_poa --guardar-baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generar_workbook import generar_workbook, nombre_workbook
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_RAIZ = os.path.dirname(DIRECTORIO)
+DIRECTORIO_DATOS = os.path.join(DIRECTORIO, 'datos')
+ARCHIVO_BASELINE = os.path.join(DIRECTORIO, 'baseline.json')
+APP_STREAMLIT = os.path.join(DIRECTORIO_RAIZ, 'dashboard_poa_carrerasx.py')
+
+ESCALAS = [20, 200, 2000]
+ACTIVIDADES_POR_CARRERA = 50
+MAX_ACTIVIDADES = 100_000
+REPETICIONES = 5
+# Un caso es regresión si su tiempo supera al baseline en este factor
+TOLERANCIA = 1.25
+
+# =============================================================================
+# MEDICIÓN
+# =============================================================================
+def medir(funcion, repeticiones=1, preparar=None):
+    """
+    Ejecuta funcion() y devuelve (resultado, mediana en segundos, memoria pico en MB).
+    Los tiempos se toman sin tracemalloc; la memoria pico se mide en una
+    ejecución adicional. preparar() se llama antes de cada ejecución, fuera
+    de la medición.
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    if preparar:
+        preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return resultado, statistics.median(tiempos), pico / 2**20
+
+def preparar_escala(n_carreras, n_actividades, regenerar=False):
+    """Genera (o reutiliza) el workbook sintético de una escala."""
+    directorio = os.path.join(DIRECTORIO_DATOS, f"{n_carreras}_{n_actividades}")
+    ruta = os.path.join(directorio, nombre_workbook())
+    if regenerar or not os.path.exists(ruta):
+        generar_workbook(ruta, n_carreras, n_actividades)
+    return ruta
+
+def _limpiar_snapshot(ruta):
+    """Elimina el snapshot y los índices para forzar una carga en frío."""
+    shutil.rmtree(os.path.join(os.path.dirname(ruta), '.poa_cache'), ignore_errors=True)
+
+def _apptest(ruta):
+    """AppTest del script completo sobre el workbook indicado, con las cachés vacías."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    os.environ['POA_DIRECTORIO_DATOS'] = os.path.dirname(ruta)
+    os.environ['POA_PRECALENTAR_FIGURAS'] = '0'
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    app = AppTest.from_file(APP_STREAMLIT, default_timeout=600)
+    return app
+
+def _apptest_ejecutado(ruta):
+    """Primera ejecución del script con AppTest; devuelve la app ya ejecutada."""
+    app = _apptest(ruta)
+    app.run()
+    return app
+
+def benchmark_escala(n_carreras, n_actividades, repeticiones=REPETICIONES, con_apptest=True):
+    """Ejecuta todos los casos de una escala y devuelve {caso: {tiempo_s, memoria_mb}}."""
+    from actividades_poa import LectorActividades
+    from datos_poa import cargar_datos
+    from graficos_poa import grafico_barras, grafico_barras_unica, grafico_donut
+
+    ruta = preparar_escala(n_carreras, n_actividades)
+    resultados = {}
+
+    def registrar(caso, tiempo, memoria):
+        resultados[caso] = {'tiempo_s': round(tiempo, 6), 'memoria_mb': round(memoria, 3)}
+
+    def limpiar():
+        _limpiar_snapshot(ruta)
+
+    (carreras_data, carreras_list), t, m = medir(lambda: cargar_datos(ruta), preparar=limpiar)
+    registrar('load_data_frio', t, m)
+    _, t, m = medir(lambda: cargar_datos(ruta), repeticiones)
+    registrar('load_data_caliente', t, m)
+
+    _, t, m = medir(lambda: LectorActividades(ruta), preparar=limpiar)
+    registrar('actividades_indice_frio', t, m)
+    carrera = carreras_list[len(carreras_list) // 2]
+    _, t, m = medir(lambda: LectorActividades(ruta).actividades(carrera), repeticiones)
+    registrar('actividades_carrera', t, m)
+
+    avance = carreras_data[carrera]['avance_poa']
+    _, t, m = medir(lambda: grafico_barras(carreras_data, carreras_list), repeticiones)
+    registrar('grafico_barras', t, m)
+    _, t, m = medir(lambda: grafico_barras_unica(carrera, avance), repeticiones)
+    registrar('grafico_barras_unica', t, m)
+    _, t, m = medir(lambda: grafico_donut(avance), repeticiones)
+    registrar('grafico_donut', t, m)
+
+    if con_apptest:
+        # Cada medición parte de una app nueva con las cachés vacías
+        app, t, m = medir(lambda: _apptest_ejecutado(ruta))
+        registrar('apptest_primera_ejecucion', t, m)
+        _, t, m = medir(app.run, repeticiones)
+        registrar('apptest_rerun', t, m)
+        next(s for s in app.selectbox if s.label == 'SELECCIONAR CARRERA:').select(carrera)
+        _, t, m = medir(app.run, repeticiones)
+        registrar('apptest_carrera_rerun', t, m)
+
+    return resultados
+
+# =============================================================================
+# BASELINE Y REPORTE
+# =============================================================================
+def leer_baseline(ruta=ARCHIVO_BASELINE):
+    """Resultados guardados previamente, o {} si no hay baseline."""
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def guardar_baseline(resultados, ruta=ARCHIVO_BASELINE):
+    """Guarda los resultados como nuevo baseline."""
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+def comparar(resultados, baseline, tolerancia=TOLERANCIA):
+    """
+    Imprime la tabla de resultados frente al baseline y devuelve la lista
+    de regresiones (escala, caso, factor).
+    """
+    regresiones = []
+    print(f"{'escala':<14}{'caso':<28}{'tiempo (ms)':>12}{'memoria (MB)':>14}{'vs baseline':>13}")
+    for escala, casos in resultados.items():
+        for caso, valor in casos.items():
+            previo = baseline.get(escala, {}).get(caso)
+            comparacion = ''
+            if previo and previo['tiempo_s'] > 0:
+                factor = valor['tiempo_s'] / previo['tiempo_s']
+                comparacion = f"{factor:.2f}x"
+                if factor > tolerancia:
+                    comparacion += ' !'
+                    regresiones.append((escala, caso, factor))
+            print(f"{escala:<14}{caso:<28}{valor['tiempo_s'] * 1000:>12.1f}"
+                  f"{valor['memoria_mb']:>14.2f}{comparacion:>13}")
+    return regresiones
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmarks del dashboard POA con workbooks sintéticos.")
+    parser.add_argument('--escalas', default=','.join(str(e) for e in ESCALAS),
+                        help="Número de carreras por escala, separado por comas.")
+    parser.add_argument('--actividades', type=int, default=None,
+                        help=f"Filas de actividades (por defecto {ACTIVIDADES_POR_CARRERA} por carrera, "
+                             f"máximo {MAX_ACTIVIDADES}).")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES)
+    parser.add_argument('--sin-apptest', action='store_true', help="Omite la ejecución con AppTest.")
+    parser.add_argument('--baseline', default=ARCHIVO_BASELINE)
+    parser.add_argument('--guardar-baseline', action='store_true', help="Guarda estos resultados como baseline.")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA)
+    parser.add_argument('--salida-json', default=None, help="Escribe los resultados en este archivo.")
+    args = parser.parse_args(argv)
+
+    # Los módulos del dashboard usan rutas relativas a la raíz del repositorio
+    os.chdir(DIRECTORIO_RAIZ)
+    if DIRECTORIO_RAIZ not in sys.path:
+        sys.path.insert(0, DIRECTORIO_RAIZ)
+
+    resultados = {}
+    for n_carreras in (int(e) for e in args.escalas.split(',') if e.strip()):
+        n_actividades = args.actividades or min(n_carreras * ACTIVIDADES_POR_CARRERA, MAX_ACTIVIDADES)
+        escala = f"{n_carreras}x{n_actividades}"
+        print(f"Escala {escala}...", file=sys.stderr)
+        resultados[escala] = benchmark_escala(n_carreras, n_actividades, args.repeticiones,
+                                              con_apptest=not args.sin_apptest)
+
+    regresiones = comparar(resultados, leer_baseline(args.baseline), args.tolerancia)
+
+    if args.salida_json:
+        with open(args.salida_json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False, sort_keys=True)
+    if args.guardar_baseline:
+        guardar_baseline({**leer_baseline(args.baseline), **resultados}, args.baseline)
+        print(f"Baseline guardado en {args.baseline}", file=sys.stderr)
+    elif regresiones:
+        print(f"{len(regresiones)} regresiones sobre el baseline (tolerancia {args.tolerancia:.2f}x)",
+              file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Generador de workbooks sintéticos
+=================================
+
+Escribe una matriz con la misma forma que 'Matriz Seguimiento Carreras 2025.xlsx'
+(hoja Resumen con los gid y sus fórmulas, una hoja por carrera,
+resumen_carreras, indicadores_carreras y actividades_carreras) con el
+número de carreras y de actividades que se indique.
+
+Uso por línea de comandos:
+    python -m benchmarks.generar_workbook --carreras 200 --actividades 10000 --salida benchmarks/datos/200
+"""
+
+import argparse
+import os
+import random
+import sys
+
+from openpyxl import Workbook
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+ANIO = 2025
+FILAS_RESUMEN_POR_CARRERA = 11
+SEMAFOROS = ['VERDE', 'AMARILLO', 'NARANJA', 'ROJO']
+ESTADOS_ENTREGA = ['ENTREGADO', 'ENTREGADO', 'ENTREGADO', 'NO ENTREGADO']
+PRIORIDADES = ['Alta', 'Media', 'Baja']
+RESPONSABLES = ['Director/a carrera', 'Director/a carrera\nDocentes',
+                'Responsable de Moodle de la carrera', 'Director/a carrera - gestor académico']
+DIRECTORES = ['Mgtr. Ana Pérez', 'Mgtr. Luis Andrade', 'Dra. María Ordóñez',
+              'Mgtr. José Quezada', 'Mgtr. Lucía Peñafiel', 'Mgtr. Iván Vélez']
+TAREAS = ['Planificar las capacitaciones docentes', 'Revisión y actualización de los PEAS',
+          'Socializar el uso de la plataforma Moodle', 'Elaboración del distributivo docente',
+          'Seguimiento a graduados de la carrera', 'Informe de prácticas y vinculación']
+
+COLUMNAS_RESUMEN = ['Nro.', 'CARRERA', 'DIRECTOR/A', 'POA', 'INFORME SEMESTRAL', 'MATRIZ SEMESTRAL',
+                    'INFORME FINAL', 'MATRIZ FINAL', 'Estrategia', 'Objetivo', 'Cumplimiento',
+                    'Observación', '%Avance poa', 'año']
+COLUMNAS_ACTIVIDADES = ['Carrera', 'Numero Estrategia', 'Numero Objetivo', 'Estado', 'Prioridad',
+                        'Fecha de entrega', 'Tarea', 'Docente\nResponsable', 'Descripción', 'Entregable',
+                        '% Ejecutado', 'Costos fijos', 'Horas estimadas', 'Horas actuales', 'Observación', 'año']
+
+# =============================================================================
+# GENERACIÓN
+# =============================================================================
+def nombre_workbook(anio=ANIO):
+    """Nombre del workbook para que el almacén de años lo descubra."""
+    return f"Matriz Seguimiento Carreras {anio}.xlsx"
+
+def _nombre_hoja(i):
+    """Nombre de hoja de la carrera i (máximo 31 caracteres en Excel)."""
+    return f"Carrera Sintética {i + 1:04d}"
+
+def generar_workbook(ruta, n_carreras, n_actividades, semilla=2025):
+    """Escribe el workbook sintético en ruta y devuelve la ruta."""
+    rng = random.Random(semilla)
+    carreras = [_nombre_hoja(i) for i in range(n_carreras)]
+    gids = rng.sample(range(10_000_000, 2_000_000_000), n_carreras)
+    avances = [round(rng.random(), 4) for _ in carreras]
+
+    wb = Workbook(write_only=True)
+
+    # Hoja Resumen: fila por carrera con el gid y la fórmula que apunta a su hoja
+    ws = wb.create_sheet('Resumen')
+    ws.append([None, 'MATRIZ DE CUMPLIMIENTO DE LAS CARRERAS.'])
+    ws.append(['Nro.', 'CARRERA', 'DIRECTOR/A', 'POA'] + [None] * 15 + ['Observación', '%Avance poa'])
+    ws.append([])
+    ws.append([])
+    for i, carrera in enumerate(carreras):
+        ws.append([i + 1, f"gid={gids[i]}", DIRECTORES[i % len(DIRECTORES)], 'ENTREGADO']
+                  + [None] * 15 + ['', f"='{carrera}'!$I$59"])
+
+    # Una hoja por carrera
+    for carrera, avance in zip(carreras, avances):
+        ws = wb.create_sheet(carrera)
+        ws.append([None, carrera.upper()])
+        for _ in range(57):
+            ws.append([])
+        ws.append([None] * 8 + [avance])
+
+    # resumen_carreras: FILAS_RESUMEN_POR_CARRERA filas por carrera
+    ws = wb.create_sheet('resumen_carreras')
+    ws.append(COLUMNAS_RESUMEN)
+    for i, carrera in enumerate(carreras):
+        fila = [i + 1, f"gid={gids[i]}", DIRECTORES[i % len(DIRECTORES)],
+                'ENTREGADO', rng.choice(ESTADOS_ENTREGA), rng.choice(ESTADOS_ENTREGA), 'S/N', 'S/N']
+        observacion = rng.choice(['EVIDENCIAS POR COMPLETAR SEGUNDO SEMESTRE', 'SIN NOVEDAD', None])
+        for j in range(FILAS_RESUMEN_POR_CARRERA):
+            ws.append(fila + [f"Estrategia {j // 3 + 1}", f"Objetivo {j % 3 + 1}", 'X',
+                              observacion, avances[i], ANIO])
+
+    # indicadores_carreras: semáforo por carrera
+    ws = wb.create_sheet('indicadores_carreras')
+    ws.append(['año', 'Carrera', 'INDICADORES', 'N° IND', '%'])
+    for carrera in carreras:
+        conteos = [rng.randint(0, 30) for _ in SEMAFOROS]
+        total = sum(conteos) or 1
+        for semaforo, conteo in zip(SEMAFOROS, conteos):
+            ws.append([ANIO, carrera, semaforo, conteo, conteo / total])
+        ws.append([ANIO, carrera, 'TOTAL:', sum(conteos), 1])
+
+    # actividades_carreras: bloques contiguos por carrera
+    ws = wb.create_sheet('actividades_carreras')
+    ws.append(COLUMNAS_ACTIVIDADES)
+    por_carrera = [n_actividades // n_carreras + (1 if i < n_actividades % n_carreras else 0)
+                   for i in range(n_carreras)]
+    for carrera, n in zip(carreras, por_carrera):
+        for k in range(n):
+            completada = rng.random() < 0.3
+            ws.append([
+                carrera.upper(), f"ESTRATEGIA {k // 10 + 1}", f"OBJETIVO OPERATIVO {k // 3 + 1}",
+                completada, rng.choice(PRIORIDADES), '2025-I ( fin ciclo)', rng.choice(TAREAS),
+                rng.choice(RESPONSABLES), 'Descripción de la actividad', 'Informe de la actividad',
+                1.0 if completada else rng.choice([0, 0.5]), 0, rng.randint(0, 40), rng.randint(0, 40),
+                0, ANIO,
+            ])
+
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    wb.save(ruta)
+    return ruta
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Genera un workbook POA sintético.")
+    parser.add_argument('--carreras', type=int, default=20)
+    parser.add_argument('--actividades', type=int, default=1000)
+    parser.add_argument('--salida', default=os.path.join('benchmarks', 'datos'))
+    parser.add_argument('--semilla', type=int, default=2025)
+    args = parser.parse_args(argv)
+
+    ruta = generar_workbook(os.path.join(args.salida, nombre_workbook()),
+                            args.carreras, args.actividades, args.semilla)
+    print(ruta)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Búsqueda de texto en actividades y observaciones
+================================================
+
+Índice invertido sobre las columnas de texto de actividades_carreras
+(Tarea, Descripción, Entregable, Docente Responsable) y la Observación
+de cada carrera en resumen_carreras. Los textos se normalizan sin tildes
+ni mayúsculas, de modo que "evaluacion" encuentra "Evaluación".
+
+El índice se construye una vez por versión del workbook y se guarda junto
+a él (.poa_cache/<workbook>.<hash>.busqueda.v1.npz) como arreglos numpy:
+vocabulario ordenado y listas de documentos en formato CSR. Buscar un
+prefijo es una búsqueda binaria en el vocabulario y un corte contiguo de
+las listas; los filtros por carrera, estado y año son máscaras sobre los
+documentos encontrados, sin recorrer las tablas.
+"""
+
+import bisect
+import re
+
+import numpy as np
+import pandas as pd
+
+from actividades_poa import LectorActividades, clave_carrera
+from consolidacion_poa import COLUMNA_CARRERA_FUENTE, ubicaciones
+from datos_poa import (construir_tabla_carreras, escribir_atomico, hash_archivo,
+                       leer_mapa_gid_config, obtener_resumen, ruta_cache)
+from ranking_poa import normalizar_texto
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+VERSION_BUSQUEDA = 1
+
+# Columnas de actividades_carreras que se indexan y se muestran
+COLUMNAS_TEXTO = ['Tarea', 'Descripción', 'Entregable', 'Docente Responsable']
+COLUMNAS_RESULTADO = ['Carrera', 'Tipo', 'Estado', 'Tarea', 'Docente Responsable', 'Entregable', 'Detalle']
+
+TIPO_ACTIVIDAD = 0
+TIPO_OBSERVACION = 1
+TIPOS = {TIPO_ACTIVIDAD: 'Actividad', TIPO_OBSERVACION: 'Observación'}
+
+# Estado de cada documento (las observaciones no tienen estado)
+ESTADOS = {'Pendiente': 0, 'Completada': 1}
+SIN_ESTADO = -1
+SIN_ANIO = -1
+
+MAX_RESULTADOS = 200
+
+_PATRON_TERMINO = re.compile(r'\w+')
+
+def terminos(texto):
+    """Términos de un texto: palabras sin tildes ni mayúsculas."""
+    if texto is None or (isinstance(texto, float) and np.isnan(texto)):
+        return []
+    return _PATRON_TERMINO.findall(normalizar_texto(texto))
+
+def _a_anio(valor):
+    """Año de una fila como entero, o SIN_ANIO."""
+    try:
+        return int(float(valor))
+    except (TypeError, ValueError):
+        return SIN_ANIO
+
+# =============================================================================
+# ÍNDICE DE UN WORKBOOK
+# =============================================================================
+class IndiceBusqueda:
+    """
+    Índice invertido de un workbook. Los documentos son las actividades (en
+    el orden de la hoja de actividades) seguidas de las observaciones de
+    las carreras. Las carreras se identifican por su clave_carrera.
+    """
+
+    ARREGLOS = ('terminos', 'inicio', 'documentos', 'doc_carrera', 'doc_tipo',
+                'doc_estado', 'doc_anio', 'doc_fila', 'claves', 'observaciones')
+
+    def __init__(self, arreglos, lector):
+        for nombre in self.ARREGLOS:
+            setattr(self, nombre, arreglos[nombre])
+        self._vocabulario = self.terminos.tolist()
+
+        # Textos de las actividades para mostrar los resultados
+        columnas = ['Carrera'] + COLUMNAS_TEXTO
+        tabla = lector.tabla(columnas)
+        self.textos = {c: np.asarray(tabla.column(c).to_pylist(), dtype=object) for c in columnas}
+
+    def __len__(self):
+        return len(self.doc_tipo)
+
+    @classmethod
+    def construir(cls, file_path, file_hash=None, lector=None):
+        """Recorre actividades y observaciones del workbook y arma el índice."""
+        file_hash = file_hash or hash_archivo(file_path)
+        lector = lector or LectorActividades(file_path, file_hash)
+        actividades = lector.tabla(['Carrera', 'Estado', 'año'] + COLUMNAS_TEXTO)
+
+        claves = {}
+        postings = {}
+        doc_carrera, doc_tipo, doc_estado, doc_anio, doc_fila = [], [], [], [], []
+
+        def agregar(carrera, tipo, estado, anio, fila, textos):
+            documento = len(doc_tipo)
+            doc_carrera.append(claves.setdefault(clave_carrera(carrera), len(claves)))
+            doc_tipo.append(tipo)
+            doc_estado.append(estado)
+            doc_anio.append(anio)
+            doc_fila.append(fila)
+            for termino in set(t for texto in textos for t in terminos(texto)):
+                postings.setdefault(termino, []).append(documento)
+
+        columnas = {c: actividades.column(c).to_pylist() for c in actividades.column_names}
+        for fila in range(actividades.num_rows):
+            agregar(columnas['Carrera'][fila], TIPO_ACTIVIDAD,
+                    ESTADOS['Completada'] if columnas['Estado'][fila] else ESTADOS['Pendiente'],
+                    _a_anio(columnas['año'][fila]), fila,
+                    [columnas[c][fila] for c in COLUMNAS_TEXTO])
+
+        # Una observación por carrera y año, con los nombres ya resueltos
+        df_resumen, all_sheets, mapa_gid = obtener_resumen(file_path, file_hash)
+        mapa_gid = {**mapa_gid, **leer_mapa_gid_config(file_path)}
+        observaciones = []
+        for anio in pd.to_numeric(df_resumen['año'], errors='coerce').dropna().unique():
+            tabla, _ = construir_tabla_carreras(df_resumen, all_sheets, mapa_gid, anio)
+            for carrera, observacion in tabla['observacion'].items():
+                if not isinstance(observacion, str) or not observacion.strip() or observacion == 'Sin datos':
+                    continue
+                agregar(carrera, TIPO_OBSERVACION, SIN_ESTADO, int(anio), len(observaciones), [observacion])
+                observaciones.append(observacion)
+
+        vocabulario = sorted(postings)
+        longitudes = np.fromiter((len(postings[t]) for t in vocabulario), dtype=np.int64, count=len(vocabulario))
+        arreglos = {
+            'terminos': np.asarray(vocabulario, dtype=str),
+            'inicio': np.concatenate([[0], np.cumsum(longitudes)]).astype(np.int64),
+            'documentos': np.fromiter((d for t in vocabulario for d in postings[t]), dtype=np.int32,
+                                      count=int(longitudes.sum())),
+            'doc_carrera': np.asarray(doc_carrera, dtype=np.int32),
+            'doc_tipo': np.asarray(doc_tipo, dtype=np.int8),
+            'doc_estado': np.asarray(doc_estado, dtype=np.int8),
+            'doc_anio': np.asarray(doc_anio, dtype=np.int32),
+            'doc_fila': np.asarray(doc_fila, dtype=np.int32),
+            'claves': np.asarray(list(claves), dtype=str),
+            'observaciones': np.asarray(observaciones, dtype=str),
+        }
+        return cls(arreglos, lector)
+
+    def guardar(self, ruta):
+        """Guarda los arreglos del índice (npz sin pickle)."""
+        def escribir(p):
+            with open(p, 'wb') as f:
+                np.savez(f, **{nombre: getattr(self, nombre) for nombre in self.ARREGLOS})
+        escribir_atomico(ruta, escribir)
+
+    @classmethod
+    def leer(cls, ruta, lector):
+        """Lee un índice guardado."""
+        with np.load(ruta, allow_pickle=False) as datos:
+            return cls({nombre: datos[nombre] for nombre in cls.ARREGLOS}, lector)
+
+    def documentos_prefijo(self, prefijo):
+        """Documentos (ordenados, sin repetir) con algún término que empieza con el prefijo."""
+        desde = bisect.bisect_left(self._vocabulario, prefijo)
+        hasta = bisect.bisect_left(self._vocabulario, prefijo + '\U0010ffff', desde)
+        if desde == hasta:
+            return np.empty(0, dtype=np.int32)
+        documentos = self.documentos[self.inicio[desde]:self.inicio[hasta]]
+        return documentos if hasta - desde == 1 else np.unique(documentos)
+
+    def buscar(self, consulta):
+        """Documentos que contienen todos los términos de la consulta (como prefijos)."""
+        encontrados = None
+        for termino in dict.fromkeys(terminos(consulta)):
+            documentos = self.documentos_prefijo(termino)
+            encontrados = documentos if encontrados is None else np.intersect1d(encontrados, documentos,
+                                                                                 assume_unique=True)
+            if not len(encontrados):
+                break
+        return encontrados if encontrados is not None else np.empty(0, dtype=np.int32)
+
+def ruta_indice_busqueda(file_path, file_hash):
+    """Ruta del índice de búsqueda de una versión del workbook."""
+    return ruta_cache(file_path, file_hash, f"busqueda.v{VERSION_BUSQUEDA}.npz")
+
+def leer_indice_busqueda(file_path, file_hash=None):
+    """
+    Índice de búsqueda del workbook, desde su archivo si corresponde al
+    hash; si no, lo construye y lo guarda.
+    """
+    file_hash = file_hash or hash_archivo(file_path)
+    ruta = ruta_indice_busqueda(file_path, file_hash)
+    lector = LectorActividades(file_path, file_hash)
+    try:
+        return IndiceBusqueda.leer(ruta, lector)
+    except (OSError, ValueError, KeyError):
+        pass
+    indice = IndiceBusqueda.construir(file_path, file_hash, lector)
+    try:
+        indice.guardar(ruta)
+    except OSError:
+        pass
+    return indice
+
+# =============================================================================
+# BÚSQUEDA SOBRE LAS CARRERAS DEL DASHBOARD
+# =============================================================================
+class BuscadorPOA:
+    """
+    Búsqueda sobre los índices de uno o varios workbooks (datos
+    consolidados), con los nombres de carrera que muestra el dashboard.
+    Las carreras que no están en la vista (por ejemplo, de otra sede) no
+    aparecen en los resultados.
+    """
+
+    def __init__(self, partes, version=None):
+        self.version = version
+        self.partes = []
+        for indice, nombres in partes:
+            # Código de carrera del índice → nombre en el dashboard (None si no está en la vista)
+            nombres_codigo = np.asarray([nombres.get(clave) for clave in indice.claves.tolist()], dtype=object)
+            self.partes.append((indice, nombres_codigo))
+
+    def buscar(self, consulta, carreras=None, estado=None, anio=None, limite=MAX_RESULTADOS):
+        """
+        Resultados de la consulta como (DataFrame con COLUMNAS_RESULTADO,
+        total de coincidencias). carreras restringe a esas carreras, estado
+        ('Pendiente' o 'Completada') deja solo actividades en ese estado y
+        anio descarta los documentos de otros años.
+        """
+        filas = []
+        total = 0
+        for indice, nombres_codigo in self.partes:
+            documentos = indice.buscar(consulta)
+            if not len(documentos):
+                continue
+            nombres = nombres_codigo[indice.doc_carrera[documentos]]
+            mascara = pd.notna(nombres)
+            if carreras:
+                mascara &= np.isin(nombres, list(carreras))
+            if estado is not None:
+                mascara &= indice.doc_estado[documentos] == ESTADOS[estado]
+            if anio is not None:
+                anios = indice.doc_anio[documentos]
+                mascara &= (anios == anio) | (anios == SIN_ANIO)
+            documentos, nombres = documentos[mascara], nombres[mascara]
+            total += len(documentos)
+            restantes = limite - sum(len(f) for f in filas)
+            if restantes > 0:
+                filas.append(self._resultados(indice, documentos[:restantes], nombres[:restantes]))
+        if not filas:
+            return pd.DataFrame(columns=COLUMNAS_RESULTADO), total
+        return pd.concat(filas, ignore_index=True), total
+
+    @staticmethod
+    def _resultados(indice, documentos, nombres):
+        """Filas de resultados de un índice para los documentos dados."""
+        tipos = indice.doc_tipo[documentos]
+        estados = indice.doc_estado[documentos]
+        filas_doc = indice.doc_fila[documentos]
+        es_actividad = tipos == TIPO_ACTIVIDAD
+        filas_actividad = np.where(es_actividad, filas_doc, 0)
+
+        def texto_actividad(columna):
+            if not len(indice.textos[columna]):
+                return np.full(len(documentos), None, dtype=object)
+            return np.where(es_actividad, indice.textos[columna][filas_actividad], None)
+
+        detalle = texto_actividad('Descripción')
+        if (~es_actividad).any():
+            detalle[~es_actividad] = indice.observaciones[filas_doc[~es_actividad]]
+        return pd.DataFrame({
+            'Carrera': nombres,
+            'Tipo': np.where(es_actividad, TIPOS[TIPO_ACTIVIDAD], TIPOS[TIPO_OBSERVACION]),
+            'Estado': np.select([estados == ESTADOS['Completada'], estados == ESTADOS['Pendiente']],
+                                ['Completada', 'Pendiente'], ''),
+            'Tarea': texto_actividad('Tarea'),
+            'Docente Responsable': texto_actividad('Docente Responsable'),
+            'Entregable': texto_actividad('Entregable'),
+            'Detalle': detalle,
+        })
+
+def construir_buscador(carreras_data, carreras_list, ruta_por_defecto, version=None):
+    """
+    Buscador de las carreras, con el índice de cada workbook (uno solo, o
+    el de cada sede si los datos están consolidados).
+    """
+    ubicacion = ubicaciones(carreras_data, carreras_list, ruta_por_defecto)
+    partes = []
+    for archivo, grupo in ubicacion.groupby('archivo', sort=False):
+        nombres = dict(zip(grupo[COLUMNA_CARRERA_FUENTE].map(clave_carrera), grupo.index))
+        partes.append((leer_indice_busqueda(archivo), nombres))
+    return BuscadorPOA(partes, version)
@@ -0,0 +1,208 @@
+"""
+Consolidación de matrices POA de varias sedes o departamentos
+=============================================================
+
+Une en una sola tabla de carreras las matrices de seguimiento de varias
+sedes o departamentos, todas con el formato de resumen_carreras. Las
+fuentes se indican con un directorio de workbooks (la sede es el nombre
+del archivo) o con un manifiesto JSON {"Sede": "ruta/al/archivo.xlsx"};
+en anios_poa.json un año puede apuntar a cualquiera de los dos.
+
+Cada fuente se cachea por separado: snapshot en disco por hash (datos_poa)
+y tabla en memoria por proceso. Las fuentes sin snapshot vigente se
+parsean en paralelo en un pool de procesos, de modo que la carga tarda lo
+que la fuente más lenta y no la suma de todas.
+"""
+
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from actividades_poa import COLUMNAS_ACTIVIDADES, LectorActividades
+from datos_poa import ANIO, VistaCarreras, cargar_tabla, hash_archivo, leer_snapshot
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+COLUMNA_FUENTE = 'fuente'
+COLUMNA_CARRERA_FUENTE = 'carrera_fuente'
+COLUMNA_ARCHIVO_FUENTE = 'archivo_fuente'
+TODAS_LAS_FUENTES = 'Todas las sedes'
+MAX_PROCESOS = os.cpu_count() or 1
+# El servidor de Streamlit tiene varios hilos: con fork un hijo podría heredar
+# un lock tomado por otro hilo (logging, imports, pyarrow) y quedarse colgado
+CONTEXTO_PROCESOS = multiprocessing.get_context('spawn')
+
+# Tablas ya cargadas por fuente: ruta → (hash, año, tabla, carreras)
+_TABLAS = {}
+_LOCK = threading.Lock()
+
+# =============================================================================
+# FUENTES
+# =============================================================================
+def es_consolidado(ruta):
+    """True si la ruta es un directorio de workbooks o un manifiesto JSON."""
+    return os.path.isdir(ruta) or ruta.lower().endswith('.json')
+
+def leer_fuentes(ruta):
+    """
+    Devuelve {fuente: ruta del workbook} desde un directorio (un workbook por
+    fuente, nombrada como el archivo) o desde un manifiesto JSON, cuyas rutas
+    relativas son relativas al manifiesto.
+    """
+    if os.path.isdir(ruta):
+        archivos = sorted(glob.glob(os.path.join(ruta, '*.xlsx')))
+        return {os.path.splitext(os.path.basename(a))[0]: a
+                for a in archivos if not os.path.basename(a).startswith('~$')}
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    with open(ruta, encoding="utf-8") as f:
+        manifiesto = json.load(f)
+    return {str(fuente): os.path.join(directorio, archivo) for fuente, archivo in manifiesto.items()}
+
+def _cargar_fuente(file_path, file_hash, anio):
+    """Carga la tabla de carreras de una fuente (se ejecuta en el pool)."""
+    return cargar_tabla(file_path, file_hash, anio)
+
+def cargar_fuentes(fuentes, anio, procesos=None):
+    """
+    Devuelve {fuente: (hash, tabla, carreras)} de cada fuente. Las que no
+    cambiaron se toman de memoria, las que tienen snapshot se leen en este
+    proceso y solo las que hay que parsear van al pool de procesos.
+    """
+    with ThreadPoolExecutor(max_workers=min(len(fuentes), 8) or 1) as hilos:
+        hashes = dict(zip(fuentes, hilos.map(hash_archivo, fuentes.values())))
+
+    resultados = {}
+    por_parsear = []
+    for fuente, ruta in fuentes.items():
+        with _LOCK:
+            previo = _TABLAS.get(ruta)
+        if previo is not None and previo[:2] == (hashes[fuente], anio):
+            resultados[fuente] = (hashes[fuente], previo[2], previo[3])
+        elif leer_snapshot(ruta, hashes[fuente]) is not None or len(fuentes) == 1:
+            resultados[fuente] = (hashes[fuente], *cargar_tabla(ruta, hashes[fuente], anio))
+        else:
+            por_parsear.append(fuente)
+
+    if len(por_parsear) == 1:
+        fuente = por_parsear[0]
+        resultados[fuente] = (hashes[fuente], *cargar_tabla(fuentes[fuente], hashes[fuente], anio))
+    elif por_parsear:
+        procesos = min(len(por_parsear), procesos or MAX_PROCESOS)
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=CONTEXTO_PROCESOS) as pool:
+            tablas = pool.map(_cargar_fuente, [fuentes[f] for f in por_parsear],
+                              [hashes[f] for f in por_parsear], [anio] * len(por_parsear))
+            for fuente, (tabla, carreras) in zip(por_parsear, tablas):
+                resultados[fuente] = (hashes[fuente], tabla, carreras)
+
+    with _LOCK:
+        for fuente, (file_hash, tabla, carreras) in resultados.items():
+            _TABLAS[fuentes[fuente]] = (file_hash, anio, tabla, carreras)
+    return {fuente: resultados[fuente] for fuente in fuentes}
+
+# =============================================================================
+# CONSOLIDACIÓN
+# =============================================================================
+def consolidar(fuentes, cargadas):
+    """
+    Une las tablas de las fuentes en una sola con las columnas fuente,
+    carrera_fuente y archivo_fuente. Las carreras que aparecen en más de una
+    fuente se renombran "Carrera (Fuente)". Devuelve (tabla, carreras).
+    """
+    partes = []
+    for fuente, (_, tabla, carreras) in cargadas.items():
+        parte = tabla.loc[[c for c in carreras if c in tabla.index]].copy()
+        parte[COLUMNA_FUENTE] = fuente
+        parte[COLUMNA_ARCHIVO_FUENTE] = fuentes[fuente]
+        parte[COLUMNA_CARRERA_FUENTE] = parte.index
+        partes.append(parte)
+    if not partes:
+        return pd.DataFrame(columns=[COLUMNA_FUENTE, COLUMNA_CARRERA_FUENTE, COLUMNA_ARCHIVO_FUENTE]), []
+
+    tabla = pd.concat(partes)
+    repetidas = tabla.index.duplicated(keep=False)
+    nombres = tabla.index.to_series()
+    nombres[repetidas] = nombres[repetidas] + ' (' + tabla.loc[repetidas, COLUMNA_FUENTE] + ')'
+    tabla.index = pd.Index(nombres.to_numpy(), name='carrera')
+    return tabla, tabla.index.tolist()
+
+def cargar_consolidado(ruta, anio=None, procesos=None):
+    """
+    Carga y consolida las fuentes de un directorio o manifiesto.
+    Devuelve (carreras_data, carreras_list) como datos_poa.cargar_datos; la
+    versión combina el año y los hashes de todas las fuentes.
+    """
+    anio = anio if anio is not None else ANIO
+    fuentes = leer_fuentes(ruta)
+    cargadas = cargar_fuentes(fuentes, anio, procesos)
+    tabla, carreras_list = consolidar(fuentes, cargadas)
+    huella = hashlib.sha256('|'.join(f"{f}:{h}" for f, (h, _, _) in cargadas.items()).encode()).hexdigest()
+    return VistaCarreras(tabla, version=f"{anio}-{huella[:16]}"), carreras_list
+
+# =============================================================================
+# CONSULTAS SOBRE LA TABLA CONSOLIDADA
+# =============================================================================
+def fuentes_de(carreras_data):
+    """Fuentes presentes en los datos (lista vacía si no están consolidados)."""
+    tabla = getattr(carreras_data, 'tabla', None)
+    if tabla is None or COLUMNA_FUENTE not in tabla.columns:
+        return []
+    return list(dict.fromkeys(tabla[COLUMNA_FUENTE]))
+
+def filtrar_fuente(carreras_data, carreras_list, fuente):
+    """Vista y lista de carreras de una sola fuente; la versión incluye la fuente."""
+    tabla = carreras_data.tabla[carreras_data.tabla[COLUMNA_FUENTE] == fuente]
+    return (VistaCarreras(tabla, version=f"{carreras_data.version}|{fuente}"),
+            [c for c in carreras_list if c in tabla.index])
+
+def ubicar_carrera(carreras_data, carrera, ruta_por_defecto):
+    """(workbook, nombre en ese workbook) donde están las actividades de una carrera."""
+    tabla = carreras_data.tabla
+    if COLUMNA_ARCHIVO_FUENTE in tabla.columns and carrera in tabla.index:
+        fila = tabla.loc[carrera]
+        return fila[COLUMNA_ARCHIVO_FUENTE], fila[COLUMNA_CARRERA_FUENTE]
+    return ruta_por_defecto, carrera
+
+def ubicaciones(carreras_data, carreras_list, ruta_por_defecto):
+    """
+    DataFrame con el workbook (archivo) y el nombre en ese workbook
+    (carrera_fuente) de cada carrera de la lista, indexado por carrera.
+    """
+    tabla = carreras_data.tabla
+    carreras = [c for c in carreras_list if c in tabla.index]
+    if COLUMNA_ARCHIVO_FUENTE in tabla.columns:
+        df = tabla.loc[carreras, [COLUMNA_ARCHIVO_FUENTE, COLUMNA_CARRERA_FUENTE]]
+        return df.rename(columns={COLUMNA_ARCHIVO_FUENTE: 'archivo'})
+    return pd.DataFrame({'archivo': ruta_por_defecto, COLUMNA_CARRERA_FUENTE: carreras},
+                        index=pd.Index(carreras, name='carrera'))
+
+class LectorConsolidado:
+    """
+    Lector de actividades sobre datos consolidados: delega cada carrera en
+    el LectorActividades del workbook de su fuente.
+    """
+
+    def __init__(self, carreras_data):
+        self.carreras_data = carreras_data
+        self._lectores = {}
+
+    def actividades(self, carrera):
+        """Actividades de una carrera, leídas del workbook de su fuente."""
+        ruta, nombre = ubicar_carrera(self.carreras_data, carrera, None)
+        if ruta is None:
+            return pd.DataFrame(columns=COLUMNAS_ACTIVIDADES)
+        if ruta not in self._lectores:
+            self._lectores[ruta] = LectorActividades(ruta)
+        return self._lectores[ruta].actividades(nombre)
+
+def abrir_lector(ruta, carreras_data, file_hash=None):
+    """LectorActividades del workbook, o LectorConsolidado si la ruta es consolidada."""
+    if es_consolidado(ruta):
+        return LectorConsolidado(carreras_data)
+    return LectorActividades(ruta, file_hash)
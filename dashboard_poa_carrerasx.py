@@ -5,420 +5,622 @@ Dashboard de Seguimiento POA por Carreras 2025
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime
 import os
-import base64
 
-def get_base64_image(image_path):
-    """Convierte una imagen a base64."""
-    try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except:
-        return None
-
-# Codificar el logo a base64
-logo_base64 = get_base64_image("LOGO-RECTANGULAR_SIN-FONDO.png")
-logo_data_url = f"data:image/png;base64,{logo_base64}" if logo_base64 else None
+from anios_poa import MAX_ANIOS_EN_MEMORIA, AlmacenAnios, comparar_anios
+from consolidacion_poa import TODAS_LAS_FUENTES, filtrar_fuente, fuentes_de, ubicar_carrera
+from actividades_poa import LectorActividades, detalle_estado, resumen_actividades
+from kpis_poa import ResumenKPI
+from graficos_poa import COLORES_SEMAFORO, COLORS, CacheFiguras
+from indicadores_poa import MAX_FILAS_MAPA, construir_cubo
+from busqueda_poa import ESTADOS, construir_buscador
+from ingesta_poa import INTERVALO_VIGILANCIA, VigilanteWorkbooks
+from ranking_poa import MODO_EXTREMOS, MODO_PAGINAS, UMBRAL_INSTITUCION_GRANDE, IndiceCarreras, clave_vista
+from recursos_poa import bloque_estilos, preparar_recursos, url_logo
+from metricas_poa import METRICAS, PANEL_METRICAS
 
 # =============================================================================
 # CONFIGURACIÓN DE PÁGINA - FONDO OSCURO
 # =============================================================================
 st.set_page_config(
-    page_title="Dashboard POA Carreras 2025",
+    page_title="Dashboard POA Carreras",
     page_icon="📊",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
+# Métricas de esta ejecución (sin efecto si POA_METRICAS no está activo)
+METRICAS.iniciar_ejecucion()
+
 # =============================================================================
-# CSS PERSONALIZADO - FONDO NEGRO
+# RECURSOS ESTÁTICOS: CSS Y LOGO
 # =============================================================================
-st.markdown("""
-<style>
-    .stApp { background-color: #0d1117; color: #e6edf3; }
-    .main .block-container { padding: 1rem 2rem; max-width: 100%; }
-    .header-container {
-        background-color: #1F3A5E;
-        padding: 1rem 1.5rem;
-        border-radius: 8px;
-        margin-bottom: 1.5rem;
-    }
-    .header-title { color: white; font-family: 'Times New Roman', serif; font-size: 1.4rem; font-weight: bold; margin: 0; }
-    .header-subtitle { color: #c9d1d9; font-family: 'Arial', sans-serif; font-size: 0.85rem; margin: 0; }
-    .section-title {
-        color: #58a6ff; font-family: 'Arial', sans-serif; font-size: 1.1rem;
-        font-weight: bold; margin: 1rem 0 0.75rem 0; padding-bottom: 0.5rem; border-bottom: 2px solid #238636;
-    }
-    .stSelectbox > div > div { background-color: #161b22 !important; border: 1px solid #30363d !important; color: #e6edf3 !important; }
-    .stSelectbox label { color: #8b949e !important; }
-    .kpi-card {
-        background-color: #161b22; border: 1px solid #30363d; border-radius: 8px; padding: 1rem; margin: 0.5rem 0; text-align: center;
-    }
-    .kpi-label { color: #8b949e; font-family: 'Arial', sans-serif; font-size: 0.75rem; text-transform: uppercase; margin-bottom: 0.5rem; }
-    .kpi-value { color: #58a6ff; font-family: 'Arial', sans-serif; font-size: 1rem; font-weight: bold; }
-    .kpi-main {
-        background: linear-gradient(135deg, #FFD700 0%, #FFC107 100%); border: none; border-radius: 10px; padding: 1.25rem; margin: 0.5rem 0; text-align: center;
-    }
-    .kpi-main-label { color: #1a1a1a; font-family: 'Arial', sans-serif; font-size: 0.85rem; text-transform: uppercase; font-weight: bold; margin-bottom: 0.5rem; }
-    .kpi-main-value { color: #000000; font-family: 'Arial Black', sans-serif; font-size: 2.2rem; font-weight: bold; }
-    div[data-testid="stPlotlyChart"] { background-color: transparent; }
-    div[data-testid="stDataFrame"] { background-color: #161b22; border-radius: 8px; }
-    .streamlit-expanderHeader { background-color: #161b22 !important; color: #e6edf3 !important; border: 1px solid #30363d; border-radius: 8px; }
-    hr { border-color: #30363d; margin: 1.5rem 0; }
-    .footer { background-color: #161b22; padding: 1rem; border-radius: 8px; margin-top: 2rem; text-align: center; color: #8b949e; font-size: 0.8rem; }
-    div[data-testid="stMetric"] { background-color: #161b22; border: 1px solid #30363d; border-radius: 8px; padding: 0.75rem; }
-    div[data-testid="stMetricLabel"] { color: #8b949e; font-size: 0.75rem; }
-    div[data-testid="stMetricValue"] { color: #58a6ff; font-size: 1.1rem; }
-    ::-webkit-scrollbar { width: 8px; height: 8px; }
-    ::-webkit-scrollbar-track { background: #0d1117; }
-    ::-webkit-scrollbar-thumb { background: #30363d; border-radius: 4px; }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def obtener_recursos():
+    """
+    Prepara el logo optimizado y devuelve (bloque de estilos, URL del logo).
+    Se calcula una sola vez por proceso.
+    """
+    servir_estaticos = st.get_option('server.enableStaticServing')
+    try:
+        preparar_recursos()
+    except OSError:
+        pass
+    return bloque_estilos(servir_estaticos), url_logo(servir_estaticos)
+
+with METRICAS.tramo('recursos'):
+    ESTILOS_HTML, LOGO_URL = obtener_recursos()
+    
+    # CSS personalizado - fondo negro (static/estilos.css)
+    st.markdown(ESTILOS_HTML, unsafe_allow_html=True)
 
 # =============================================================================
 # CARGA DE DATOS SIMPLIFICADA
 # =============================================================================
-@st.cache_data
-def load_data():
+@st.cache_resource
+def obtener_almacen():
     """
-    Carga los datos desde el archivo Excel.
+    Registro de workbooks por año. Cada año se carga solo al seleccionarlo.
+    """
+    return AlmacenAnios()
+
+# Recarga en caliente: el vigilante reingiere los workbooks modificados
+RECARGA_ACTIVA = os.environ.get('POA_RECARGA', '1') == '1'
+
+@st.cache_resource
+def obtener_vigilante():
     """
+    Vigilante de los workbooks de todos los años, compartido por el proceso.
+    Al cambiar un año lo recarga en el almacén y aumenta su revisión.
+    """
+    almacen = obtener_almacen()
+    vigilante = VigilanteWorkbooks(almacen.archivos, al_cambiar=almacen.recargar)
+    if RECARGA_ACTIVA:
+        vigilante.iniciar()
+    return vigilante
+
+# Objetos derivados (KPIs, índice, cubo) por versión de datos y sede
+MAX_VERSIONES_EN_MEMORIA = 4 * MAX_ANIOS_EN_MEMORIA
+
+@METRICAS.cacheada('load_data')
+def load_data(anio):
+    """
+    Datos de un año desde el almacén compartido: todas las sesiones leen la
+    misma VistaCarreras inmutable, sin copiarla en cada ejecución. El Excel
+    solo se vuelve a parsear cuando cambia su hash, y el vigilante
+    reemplaza el año en el almacén cuando el workbook se modifica.
+    """
+    almacen = obtener_almacen()
+    if anio not in almacen.cargados():
+        METRICAS.fallo_cache('load_data')
     try:
-        file_path = r'Matriz Seguimiento Carreras 2025.xlsx'
-        
-        # Obtener nombres de todas las hojas
-        xlsx = pd.ExcelFile(file_path)
-        all_sheets = xlsx.sheet_names
-        
-        # Hojas administrativas a excluir
-        excluded = ['resumen', 'Resumen', 'resumen_carreras', 'indicadores_carreras', 
-                    'actividades_carreras', 'Hoja 1', 'Dashboard', 'Data', 'Config',
-                    'Summary', 'summary', 'Índice', 'Indice']
-        
-        # Las carreras son los nombres de las hojas
-        carreras_names = [s for s in all_sheets if s not in excluded]
-        
-        # Cargar hoja resumen_carreras
-        df_resumen = pd.read_excel(file_path, sheet_name='resumen_carreras')
-        df_resumen['CARRERA'] = df_resumen['CARRERA'].astype(str).str.strip()
-        
-        # Filtrar solo 2025
-        df_resumen = df_resumen[df_resumen['año'] == 2025]
-        
-        # Crear diccionario: cada carrera tiene su fila en resumen_carreras
-        # Vamos a asumir que las filas de resumen_carreras corresponden a las hojas de carreras
-        # El orden debería ser el mismo
-        
-        # Crear un diccionario con los datos de cada carrera
-        carreras_data = {}
-        
-        for idx, row in df_resumen.iterrows():
-            carrera_id = str(row.get('CARRERA', ''))
-            
-            if carrera_id.startswith('gid='):
-                # Usar el índice de la fila para encontrar la carrera correspondiente
-                row_position = list(df_resumen.index).index(idx)
-                if row_position < len(carreras_names):
-                    nombre = carreras_names[row_position]
-                else:
-                    nombre = carrera_id
-            else:
-                # Si ya es un nombre, usarlo directamente
-                nombre = carrera_id
-            
-            carreras_data[nombre] = {
-                'director': row.get('DIRECTOR/A', 'N/A'),
-                'poa': row.get('POA', 'N/A'),
-                'informe_semestral': row.get('INFORME SEMESTRAL', 'N/A'),
-                'matriz_semestral': row.get('MATRIZ SEMESTRAL', 'N/A'),
-                'informe_final': row.get('INFORME FINAL', 'N/A'),
-                'matriz_final': row.get('MATRIZ FINAL', 'N/A'),
-                'observacion': row.get('Observación', 'N/A'),
-                'avance_poa': (row.get('%Avance poa', 0) or 0) * 100,
-            }
-        
-        # Si algunas carreras no tienen datos, agregarlas con valores por defecto
-        for carrera in carreras_names:
-            if carrera not in carreras_data:
-                carreras_data[carrera] = {
-                    'director': 'N/A',
-                    'poa': 'N/A',
-                    'informe_semestral': 'N/A',
-                    'matriz_semestral': 'N/A',
-                    'informe_final': 'N/A',
-                    'matriz_final': 'N/A',
-                    'observacion': 'Sin datos',
-                    'avance_poa': 0,
-                }
-        
-        return carreras_data, carreras_names
+        return almacen.obtener(anio)
         
     except Exception as e:
         st.error(f"Error: {e}")
         return {}, []
 
-CARRERAS_DATA, CARRERAS_LIST = load_data()
-
 # =============================================================================
-# PALETA DE COLORES
+# ENLACES DIRECTOS (?anio=2025&carrera=Software)
 # =============================================================================
-COLORS = {
-    'background': '#0d1117', 'card_bg': '#161b22', 'header': '#1F3A5E',
-    'yellow': '#FFD700', 'orange': '#FFA500', 'orange_dark': '#CC8400',
-    'text': '#e6edf3', 'text_secondary': '#8b949e', 'border': '#30363d',
-    'accent': '#58a6ff', 'success': '#3fb950',
-}
+OPCION_TODAS = 'Todas las Carreras'
 
-# =============================================================================
-# GRÁFICOS
-# =============================================================================
-def grafico_barras(carreras_data, carreras_list):
-    """Crea gráfico de barras horizontales."""
-    if not carreras_data or not carreras_list:
+def anio_del_enlace(anios):
+    """Año indicado en la URL, si está registrado."""
+    try:
+        anio = int(st.query_params.get('anio'))
+    except (TypeError, ValueError):
         return None
-    
-    # Crear lista de datos
-    datos = []
-    for carrera in carreras_list:
-        if carrera in carreras_data:
-            datos.append({
-                'Carrera': carrera,
-                'Avance POA': carreras_data[carrera]['avance_poa']
-            })
-    
-    if not datos:
+    return anio if anio in anios else None
+
+def carrera_del_enlace(opciones):
+    """
+    Carrera indicada en la URL, o la vista general si no es una opción del
+    selector (los datos pueden tener filas sin hoja de carrera, como un gid
+    sin resolver).
+    """
+    carrera = st.query_params.get('carrera')
+    return carrera if carrera in opciones else OPCION_TODAS
+
+def sincronizar_enlace(**parametros):
+    """Refleja la vista actual en la URL; un valor None quita el parámetro."""
+    for nombre, valor in parametros.items():
+        if valor is None:
+            st.query_params.pop(nombre, None)
+        elif st.query_params.get(nombre) != str(valor):
+            st.query_params[nombre] = str(valor)
+
+# El año seleccionado llega por session_state desde el selector de main(),
+# o por la URL al abrir un enlace directo
+ALMACEN = obtener_almacen()
+VIGILANTE = obtener_vigilante()
+ANIOS = ALMACEN.anios()
+ANIO_SELECCIONADO = st.session_state.get('anio', anio_del_enlace(ANIOS) or ALMACEN.anio_actual())
+if ANIO_SELECCIONADO not in ANIOS:
+    ANIO_SELECCIONADO = ALMACEN.anio_actual()
+ETIQUETA_ANIO = str(ANIO_SELECCIONADO) if ANIO_SELECCIONADO is not None else ''
+METRICAS.anotar(anio=ANIO_SELECCIONADO)
+
+REVISION = VIGILANTE.revision(ANIO_SELECCIONADO)
+CARRERAS_DATA, CARRERAS_LIST = load_data(ANIO_SELECCIONADO)
+
+@st.cache_resource(max_entries=MAX_VERSIONES_EN_MEMORIA)
+def load_fuente(_carreras_data, _carreras_list, version, fuente):
+    """Vista de una sola sede, compartida por todas las sesiones que la seleccionan."""
+    return filtrar_fuente(_carreras_data, _carreras_list, fuente)
+
+# Con varias sedes consolidadas, la sede seleccionada llega igual por session_state
+FUENTES = fuentes_de(CARRERAS_DATA)
+FUENTE_SELECCIONADA = st.session_state.get('fuente', TODAS_LAS_FUENTES)
+if FUENTE_SELECCIONADA not in FUENTES:
+    FUENTE_SELECCIONADA = TODAS_LAS_FUENTES
+if FUENTE_SELECCIONADA != TODAS_LAS_FUENTES:
+    CARRERAS_DATA, CARRERAS_LIST = load_fuente(CARRERAS_DATA, CARRERAS_LIST, CARRERAS_DATA.version, FUENTE_SELECCIONADA)
+
+@METRICAS.cacheada('load_kpis')
+@st.cache_resource(max_entries=MAX_VERSIONES_EN_MEMORIA)
+def load_kpis(_carreras_data, _carreras_list, version):
+    """
+    Calcula los KPIs de la vista general una sola vez por versión de datos.
+    """
+    METRICAS.fallo_cache('load_kpis')
+    return ResumenKPI(_carreras_data.tabla, _carreras_list, version=version)
+
+@METRICAS.cacheada('load_indice')
+@st.cache_resource(max_entries=MAX_VERSIONES_EN_MEMORIA)
+def load_indice(_carreras_data, _carreras_list, version):
+    """
+    Índice de carreras ordenado por avance POA, una sola vez por versión de datos.
+    """
+    METRICAS.fallo_cache('load_indice')
+    return IndiceCarreras(_carreras_data.tabla, _carreras_list, version=version)
+
+# Con muchas carreras la vista general muestra un ranking acotado
+INSTITUCION_GRANDE = len(CARRERAS_LIST) > UMBRAL_INSTITUCION_GRANDE
+
+@st.cache_resource
+def obtener_cache_figuras():
+    """Caché de figuras compartida por todas las sesiones del proceso."""
+    return CacheFiguras()
+
+# Precalentar las figuras de la vista general y de todas las carreras
+PRECALENTAR_FIGURAS = os.environ.get('POA_PRECALENTAR_FIGURAS', '1') == '1'
+FIGURAS = obtener_cache_figuras()
+if PRECALENTAR_FIGURAS and CARRERAS_LIST:
+    FIGURAS.precalentar_en_segundo_plano(
+        CARRERAS_DATA.version, CARRERAS_DATA, CARRERAS_LIST,
+        load_kpis(CARRERAS_DATA, CARRERAS_LIST, CARRERAS_DATA.version).avance_promedio,
+        load_indice(CARRERAS_DATA, CARRERAS_LIST, CARRERAS_DATA.version).vista_inicial() if INSTITUCION_GRANDE else None
+    )
+
+@METRICAS.cacheada('load_indicadores')
+@st.cache_resource(max_entries=MAX_VERSIONES_EN_MEMORIA)
+def load_indicadores(_carreras_data, _carreras_list, version, file_path, anio):
+    """
+    Cubo carreras × semáforo de indicadores_carreras, una sola vez por versión de datos.
+    """
+    METRICAS.fallo_cache('load_indicadores')
+    return construir_cubo(_carreras_data, _carreras_list, file_path, anio, version=version)
+
+@st.cache_resource(max_entries=8)
+def obtener_lector_actividades(file_path, version):
+    """
+    Lector indexado de actividades_carreras.
+    El índice carrera → filas se construye una sola vez por proceso y versión del workbook.
+    """
+    return LectorActividades(file_path)
+
+@METRICAS.cacheada('load_actividades')
+@st.cache_data(max_entries=32)
+def load_actividades(carrera, file_path, version):
+    """Carga solo las filas de actividades de la carrera indicada del workbook."""
+    METRICAS.fallo_cache('load_actividades')
+    return obtener_lector_actividades(file_path, version).actividades(carrera)
+
+@METRICAS.cacheada('load_buscador')
+@st.cache_resource(max_entries=MAX_VERSIONES_EN_MEMORIA)
+def load_buscador(_carreras_data, _carreras_list, version, file_path):
+    """
+    Índice de búsqueda de actividades y observaciones, una sola vez por versión de datos.
+    """
+    METRICAS.fallo_cache('load_buscador')
+    return construir_buscador(_carreras_data, _carreras_list, file_path, version=version)
+
+def consultar(cargador, mensaje, *args):
+    """
+    Llama a una función cacheada y, si falla, muestra el error y devuelve
+    None. Streamlit no guarda las excepciones en caché, así que el fallo
+    (por ejemplo, un archivo de caché borrado durante una recarga) se
+    reintenta en la siguiente ejecución en lugar de quedar fijo.
+    """
+    try:
+        return cargador(*args)
+    except Exception as e:
+        st.error(f"{mensaje}: {e}")
         return None
+
+# =============================================================================
+# RANKING PARA INSTITUCIONES GRANDES
+# =============================================================================
+MODOS_RANKING = {MODO_EXTREMOS: 'Mejores y peores', MODO_PAGINAS: 'Todas (por páginas)'}
+
+def mostrar_ranking(etiquetas_niveles):
+    """
+    Vista general con muchas carreras: búsqueda y filtros sobre el índice
+    ordenado, y un gráfico con un número acotado de barras.
+    """
+    indice = load_indice(CARRERAS_DATA, CARRERAS_LIST, CARRERAS_DATA.version)
     
-    df = pd.DataFrame(datos)
-    df = df.sort_values('Avance POA', ascending=True)
+    texto = st.text_input("Buscar carrera:", placeholder="Nombre de la carrera")
+    col_nivel, col_director = st.columns(2)
+    with col_nivel:
+        niveles = st.multiselect("Nivel de avance:", options=list(etiquetas_niveles), format_func=etiquetas_niveles.get)
+    with col_director:
+        directores = st.multiselect("Director/a:", options=indice.directores())
     
-    colores = []
-    for avance in df['Avance POA']:
-        if avance >= 80:
-            colores.append(COLORS['yellow'])
-        elif avance >= 60:
-            colores.append(COLORS['orange'])
-        else:
-            colores.append(COLORS['orange_dark'])
-    
-    fig = go.Figure(data=[go.Bar(
-        y=df['Carrera'], x=df['Avance POA'], orientation='h',
-        marker_color=colores,
-        text=[f'{v:.1f}%' for v in df['Avance POA']],
-        textposition='inside',
-        textfont=dict(color='#000000', size=11, family='Arial Black'),
-        hovertemplate='<b>%{y}</b><br>Avance: %{x:.1f}%<extra></extra>'
-    )])
-    
-    fig.update_layout(
-        title=dict(text='<b>AVANCE POA POR CARRERA</b>', font=dict(size=16, color=COLORS['accent'], family='Arial'), x=0.5),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(
-            title=dict(text='Porcentaje de Avance (%)', font=dict(size=12, color=COLORS['text_secondary'])),
-            tickfont=dict(size=10, color=COLORS['text_secondary']),
-            range=[0, 100], gridcolor=COLORS['border'], showgrid=True, gridwidth=1
-        ),
-        yaxis=dict(title='', tickfont=dict(size=10, color=COLORS['text']), automargin=True),
-        margin=dict(l=20, r=20, t=60, b=50),
-        height=max(400, len(df) * 40),
-        showlegend=False
-    )
+    posiciones = indice.filtrar(texto, niveles, directores)
+    if not len(posiciones):
+        st.info("Ninguna carrera coincide con la búsqueda.")
+        return
     
-    return fig
-
-def grafico_barras_unica(carrera_seleccionada, avance):
-    """Crea gráfico de barras para una sola carrera."""
-    
-    fig = go.Figure(data=[go.Bar(
-        y=[carrera_seleccionada],
-        x=[avance],
-        orientation='h',
-        marker_color=COLORS['yellow'],
-        text=f'{avance:.1f}%',
-        textposition='inside',
-        textfont=dict(color='#000000', size=14, family='Arial Black'),
-        hovertemplate=f'<b>{carrera_seleccionada}</b><br>Avance: {avance:.1f}%<extra></extra>'
-    )])
-    
-    fig.update_layout(
-        title=dict(text=f'<b>{carrera_seleccionada.upper()}</b>', font=dict(size=16, color=COLORS['accent'], family='Arial'), x=0.5),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(
-            title=dict(text='Porcentaje de Avance (%)', font=dict(size=12, color=COLORS['text_secondary'])),
-            tickfont=dict(size=10, color=COLORS['text_secondary']),
-            range=[0, 100], gridcolor=COLORS['border'], showgrid=True, gridwidth=1
-        ),
-        yaxis=dict(title='', tickfont=dict(size=12, color=COLORS['text']), automargin=True),
-        margin=dict(l=20, r=20, t=60, b=50),
-        height=150,
-        showlegend=False
-    )
+    modo = st.radio("Mostrar:", options=list(MODOS_RANKING), format_func=MODOS_RANKING.get, horizontal=True)
+    pagina = 1
+    if modo == MODO_PAGINAS:
+        total_paginas = indice.total_paginas(posiciones)
+        pagina = st.number_input(f"Página (de {total_paginas}):", min_value=1, max_value=total_paginas, value=1)
+        vista = indice.pagina(posiciones, pagina)
+    else:
+        vista = indice.extremos(posiciones)
     
-    return fig
-
-def grafico_donut(avance):
-    """Crea gráfico donut."""
-    fig = go.Figure(data=[go.Pie(
-        labels=['Completado', 'Pendiente'],
-        values=[avance, 100 - avance],
-        hole=0.7,
-        marker=dict(colors=[COLORS['yellow'], COLORS['border']]),
-        textinfo='none',
-        hoverinfo='label+percent'
-    )])
-    
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)', showlegend=False,
-        margin=dict(l=10, r=10, t=10, b=10),
-        annotations=[dict(text=f'<b>{avance:.1f}%</b>', font=dict(size=24, color=COLORS['accent']), showarrow=False, x=0.5, y=0.5)]
-    )
-    return fig
+    st.caption(f"{len(posiciones)} de {len(indice)} carreras")
+    fig = FIGURAS.figura_ranking(CARRERAS_DATA.version, clave_vista(texto, niveles, directores, modo, pagina), vista)
+    if fig:
+        st.plotly_chart(fig, use_container_width=True)
+
+# =============================================================================
+# PANEL DE MÉTRICAS (ADMINISTRACIÓN)
+# =============================================================================
+def mostrar_panel_metricas(ejecucion):
+    """Panel en la barra lateral con la última ejecución y los tramos recientes."""
+    with st.sidebar:
+        st.markdown('<p class="section-title">RENDIMIENTO</p>', unsafe_allow_html=True)
+        if ejecucion is None:
+            st.info("Sin mediciones en esta ejecución.")
+            return
+        col_tiempo, col_payload = st.columns(2)
+        col_tiempo.metric("Ejecución", f"{ejecucion['total_ms']:.0f} ms")
+        col_payload.metric("Enviado", f"{ejecucion['payload_bytes'] / 1024:.1f} KB")
+        
+        st.caption("Última ejecución")
+        st.dataframe(
+            pd.DataFrame([{'tramo': nombre, 'ms': tramo['ms'], 'veces': tramo['veces']}
+                          for nombre, tramo in ejecucion['tramos'].items()]),
+            use_container_width=True, hide_index=True,
+            column_config={'ms': st.column_config.NumberColumn(format="%.1f")}
+        )
+        if ejecucion['cache']:
+            st.caption("Cachés (aciertos y fallos)")
+            st.dataframe(
+                pd.DataFrame.from_dict(ejecucion['cache'], orient='index')[['llamadas', 'aciertos', 'fallos']],
+                use_container_width=True
+            )
+        
+        st.caption(f"Caché de figuras: {len(FIGURAS)} de {FIGURAS.max_entradas} · "
+                   f"{FIGURAS.aciertos} aciertos · {FIGURAS.fallos} fallos")
+        
+        st.caption(f"Últimas {len(METRICAS.ejecuciones())} ejecuciones")
+        st.dataframe(
+            METRICAS.resumen_tramos(), use_container_width=True, hide_index=True,
+            column_config={columna: st.column_config.NumberColumn(format="%.1f")
+                           for columna in ('mediana_ms', 'max_ms', 'total_ms')}
+        )
 
 # =============================================================================
 # INTERFAZ PRINCIPAL
 # =============================================================================
-def main():
-    """Función principal."""
+@st.fragment(run_every=INTERVALO_VIGILANCIA)
+def vigilar_datos():
+    """Vuelve a ejecutar la página cuando el vigilante publica una nueva versión de los datos."""
+    if VIGILANTE.revision(ANIO_SELECCIONADO) != REVISION:
+        st.rerun()
+
+def mostrar_vista_general():
+    """Vista general: resumen, avance por carrera, comparación y semáforo."""
+    # Métricas precalculadas para esta versión de datos
+    kpis = load_kpis(CARRERAS_DATA, CARRERAS_LIST, CARRERAS_DATA.version)
+    total_carreras = kpis.total_carreras
+    avance_promedio = kpis.avance_promedio
     
-    # Encabezado con logo dentro del cuadro azul
-    st.markdown(f"""
-    <div class="header-container" style="display: flex; justify-content: space-between; align-items: center; padding: 0.8rem 1.5rem;">
-        <div>
-            <h1 class="header-title" style="margin: 0;">INSTITUTO TECNOLÓGICO SUPERIOR AZUAY</h1>
-            <p class="header-subtitle" style="margin: 0;">SEGUIMIENTO POA - CARRERAS 2025</p>
+    poa_entregados = kpis.entregados.get('poa', 0)
+    informes_entregados = kpis.entregados.get('informe_semestral', 0)
+    matrices_entregadas = kpis.entregados.get('matriz_semestral', 0)
+    
+    # Layout 3 columnas
+    col_izq, col_centro, col_der = st.columns([1, 2, 1])
+    
+    with col_izq, METRICAS.tramo('general.resumen'):
+        st.markdown('<p class="section-title">RESUMEN GENERAL</p>', unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="kpi-card"><p class="kpi-label">Total Carreras</p><p class="kpi-value">{total_carreras}</p></div>
+        <div class="kpi-card"><p class="kpi-label">POA Entregados</p><p class="kpi-value">{poa_entregados}/{total_carreras}</p></div>
+        <div class="kpi-card"><p class="kpi-label">Informes Semestrales</p><p class="kpi-value">{informes_entregados}/{total_carreras}</p></div>
+        <div class="kpi-card"><p class="kpi-label">Matrices Semestrales</p><p class="kpi-value">{matrices_entregadas}/{total_carreras}</p></div>
+        """, unsafe_allow_html=True)
+    
+    with col_centro, METRICAS.tramo('general.barras'):
+        st.markdown('<p class="section-title">AVANCE POA POR CARRERA</p>', unsafe_allow_html=True)
+        if INSTITUCION_GRANDE:
+            mostrar_ranking(kpis.etiquetas_niveles())
+        else:
+            fig = FIGURAS.figura_barras(CARRERAS_DATA.version, CARRERAS_DATA, CARRERAS_LIST)
+            if fig:
+                st.plotly_chart(fig, use_container_width=True)
+    
+    with col_der, METRICAS.tramo('general.avance'):
+        st.markdown('<p class="section-title">RESUMEN</p>', unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="kpi-main">
+            <p class="kpi-main-label">Avance POA General</p>
+            <p class="kpi-main-value">{avance_promedio:.1f}%</p>
         </div>
-        <img src="{logo_data_url}" style="height: 100px; max-width: 350px;">
-    </div>
-    """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
+        st.plotly_chart(FIGURAS.figura_donut(CARRERAS_DATA.version, None, avance_promedio), use_container_width=True)
     
-    # Selector de carrera
-    if not CARRERAS_LIST:
-        st.error("❌ No se encontraron carreras.")
-        return
+        etiquetas = kpis.etiquetas_niveles()
     
-    carrera_seleccionada = st.selectbox("SELECCIONAR CARRERA:", options=['Todas las Carreras'] + CARRERAS_LIST, index=0)
+        st.markdown(f"""
+        <div style="color: #e6edf3; font-size: 0.9rem; margin-top: 1rem;">
+            <p><span style="color: #FFD700;">●</span> {etiquetas['alto']}: <strong>{kpis.alto}</strong></p>
+            <p><span style="color: #FFA500;">●</span> {etiquetas['medio']}: <strong>{kpis.medio}</strong></p>
+            <p><span style="color: #CC8400;">●</span> {etiquetas['bajo']}: <strong>{kpis.bajo}</strong></p>
+        </div>
+        """, unsafe_allow_html=True)
+        if kpis.percentiles:
+            st.caption("Avance por carrera: " + " · ".join(
+                f"P{p} {valor:.1f}%" for p, valor in kpis.percentiles.items()))
     
-    st.markdown("<hr>", unsafe_allow_html=True)
+    # Comparación con el año anterior (el año anterior solo se carga si se pide)
+    anio_anterior = ALMACEN.anio_anterior(ANIO_SELECCIONADO)
+    if anio_anterior is not None and st.toggle(f"Comparar avance POA con {anio_anterior}"):
+        with METRICAS.tramo('general.comparacion'):
+            datos_anterior, _ = load_data(anio_anterior)
+            if datos_anterior:
+                st.markdown(f'<p class="section-title">COMPARACIÓN {anio_anterior} - {ANIO_SELECCIONADO}</p>', unsafe_allow_html=True)
+                comparacion = comparar_anios(CARRERAS_DATA, CARRERAS_LIST, datos_anterior)
+                fig = FIGURAS.figura_comparacion(CARRERAS_DATA.version, datos_anterior.version, comparacion,
+                                                 ANIO_SELECCIONADO, anio_anterior)
+                if fig:
+                    st.plotly_chart(fig, use_container_width=True)
     
-    # VISTA GENERAL
-    if carrera_seleccionada == 'Todas las Carreras':
-        # Calcular métricas
-        total_carreras = len([c for c in CARRERAS_LIST if c in CARRERAS_DATA])
-        avances = [CARRERAS_DATA[c]['avance_poa'] for c in CARRERAS_LIST if c in CARRERAS_DATA]
-        avance_promedio = sum(avances) / len(avances) if avances else 0
-        
-        poa_entregados = len([c for c in CARRERAS_LIST if c in CARRERAS_DATA and CARRERAS_DATA[c]['poa'] == 'ENTREGADO'])
-        informes_entregados = len([c for c in CARRERAS_LIST if c in CARRERAS_DATA and CARRERAS_DATA[c]['informe_semestral'] == 'ENTREGADO'])
-        matrices_entregadas = len([c for c in CARRERAS_LIST if c in CARRERAS_DATA and CARRERAS_DATA[c]['matriz_semestral'] == 'ENTREGADO'])
-        
-        # Layout 3 columnas
-        col_izq, col_centro, col_der = st.columns([1, 2, 1])
-        
-        with col_izq:
-            st.markdown('<p class="section-title">RESUMEN GENERAL</p>', unsafe_allow_html=True)
-            st.markdown(f"""
-            <div class="kpi-card"><p class="kpi-label">Total Carreras</p><p class="kpi-value">{total_carreras}</p></div>
-            <div class="kpi-card"><p class="kpi-label">POA Entregados</p><p class="kpi-value">{poa_entregados}/{total_carreras}</p></div>
-            <div class="kpi-card"><p class="kpi-label">Informes Semestrales</p><p class="kpi-value">{informes_entregados}/{total_carreras}</p></div>
-            <div class="kpi-card"><p class="kpi-label">Matrices Semestrales</p><p class="kpi-value">{matrices_entregadas}/{total_carreras}</p></div>
-            """, unsafe_allow_html=True)
-        
-        with col_centro:
-            st.markdown('<p class="section-title">AVANCE POA POR CARRERA</p>', unsafe_allow_html=True)
-            fig = grafico_barras(CARRERAS_DATA, CARRERAS_LIST)
+    # Semáforo de indicadores de todas las carreras (ordenar solo reindexa el cubo)
+    with METRICAS.tramo('general.semaforo'):
+        cubo = consultar(load_indicadores, "Error al leer indicadores", CARRERAS_DATA, CARRERAS_LIST,
+                         CARRERAS_DATA.version, ALMACEN.ruta(ANIO_SELECCIONADO), ANIO_SELECCIONADO)
+        if cubo is not None and len(cubo):
+            st.markdown('<p class="section-title">SEMÁFORO DE INDICADORES</p>', unsafe_allow_html=True)
+            col_orden, _ = st.columns([1, 3])
+            with col_orden:
+                orden = st.selectbox("Ordenar por:", options=cubo.semaforos)
+            if len(cubo) > MAX_FILAS_MAPA:
+                st.caption(f"Se muestran las {MAX_FILAS_MAPA} carreras con mayor porcentaje en {orden} de {len(cubo)}")
+            fig = FIGURAS.figura_semaforo(CARRERAS_DATA.version, orden, cubo, MAX_FILAS_MAPA)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
-        
-        with col_der:
-            st.markdown('<p class="section-title">RESUMEN</p>', unsafe_allow_html=True)
-            st.markdown(f"""
-            <div class="kpi-main">
-                <p class="kpi-main-label">Avance POA General</p>
-                <p class="kpi-main-value">{avance_promedio:.1f}%</p>
-            </div>
-            """, unsafe_allow_html=True)
-            st.plotly_chart(grafico_donut(avance_promedio), use_container_width=True)
-            
-            alto = len([a for a in avances if a >= 80])
-            medio = len([a for a in avances if 60 <= a < 80])
-            bajo = len([a for a in avances if a < 60])
-            
+
+def mostrar_carrera(carrera_seleccionada):
+    """Vista de una carrera: información, avance, semáforo y actividades."""
+    if carrera_seleccionada not in CARRERAS_DATA:
+        st.error(f"No hay datos para: {carrera_seleccionada}")
+        return
+    
+    datos = CARRERAS_DATA[carrera_seleccionada]
+    
+    col_izq, col_centro, col_der = st.columns([1, 2, 1])
+    
+    with col_izq, METRICAS.tramo('carrera.informacion'):
+        st.markdown('<p class="section-title">INFORMACIÓN</p>', unsafe_allow_html=True)
+    
+        poa_color = COLORS['success'] if datos['poa'] == 'ENTREGADO' else COLORS['orange']
+        informe_color = COLORS['success'] if datos['informe_semestral'] == 'ENTREGADO' else COLORS['orange']
+        matriz_color = COLORS['success'] if datos['matriz_semestral'] == 'ENTREGADO' else COLORS['orange']
+    
+        st.markdown(f"""
+        <div class="kpi-card"><p class="kpi-label">Responsable</p><p class="kpi-value" style="font-size: 0.9rem;">{datos['director']}</p></div>
+        <div class="kpi-card"><p class="kpi-label">POA</p><p class="kpi-value" style="color: {poa_color};">{datos['poa']}</p></div>
+        <div class="kpi-card"><p class="kpi-label">Informe Semestral</p><p class="kpi-value" style="color: {informe_color};">{datos['informe_semestral']}</p></div>
+        <div class="kpi-card"><p class="kpi-label">Matriz Semestral</p><p class="kpi-value" style="color: {matriz_color};">{datos['matriz_semestral']}</p></div>
+        <div class="kpi-card"><p class="kpi-label">Informe Final</p><p class="kpi-value">{datos['informe_final']}</p></div>
+        <div class="kpi-card"><p class="kpi-label">Matriz Final</p><p class="kpi-value">{datos['matriz_final']}</p></div>
+        """, unsafe_allow_html=True)
+    
+    with col_centro, METRICAS.tramo('carrera.barras'):
+        st.markdown(f'<p class="section-title">AVANCE DE {carrera_seleccionada.upper()}</p>', unsafe_allow_html=True)
+    
+        # CORRECCIÓN: Usar la función para gráfica individual
+        fig = FIGURAS.figura_barras_unica(CARRERAS_DATA.version, carrera_seleccionada, datos['avance_poa'])
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+    
+        st.markdown(f"""
+        <div style="background-color: #161b22; border: 2px solid #58a6ff; border-radius: 8px; padding: 1rem; margin-top: 1rem; text-align: center;">
+            <p style="color: #8b949e; margin: 0; font-size: 0.9rem;">CARRERA SELECCIONADA</p>
+            <p style="color: #58a6ff; margin: 0.5rem 0 0 0; font-size: 1.2rem; font-weight: bold;">
+                {carrera_seleccionada} - {datos['avance_poa']:.1f}%
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col_der, METRICAS.tramo('carrera.avance'):
+        st.markdown('<p class="section-title">AVANCE</p>', unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="kpi-main">
+            <p class="kpi-main-label">Avance POA</p>
+            <p class="kpi-main-value">{datos['avance_poa']:.1f}%</p>
+        </div>
+        """, unsafe_allow_html=True)
+        st.plotly_chart(FIGURAS.figura_donut(CARRERAS_DATA.version, carrera_seleccionada, datos['avance_poa']), use_container_width=True)
+    
+        if datos['observacion'] and datos['observacion'] != 'Sin datos':
             st.markdown(f"""
-            <div style="color: #e6edf3; font-size: 0.9rem; margin-top: 1rem;">
-                <p><span style="color: #FFD700;">●</span> Alto (>80%): <strong>{alto}</strong></p>
-                <p><span style="color: #FFA500;">●</span> Medio (60-79%): <strong>{medio}</strong></p>
-                <p><span style="color: #CC8400;">●</span> Bajo (<60%): <strong>{bajo}</strong></p>
+            <div style="background-color: #161b22; border-left: 4px solid #FFD700; padding: 0.75rem; border-radius: 4px; margin-top: 1rem; font-size: 0.8rem;">
+                <p style="color: #e6edf3; margin: 0;"><strong>Observación:</strong></p>
+                <p style="color: #8b949e; margin: 0.5rem 0 0 0;">{datos['observacion']}</p>
             </div>
             """, unsafe_allow_html=True)
     
-    # VISTA POR CARRERA - CORREGIDO: muestra solo la carrera seleccionada
-    else:
-        if carrera_seleccionada not in CARRERAS_DATA:
-            st.error(f"No hay datos para: {carrera_seleccionada}")
-            return
-        
-        datos = CARRERAS_DATA[carrera_seleccionada]
-        
-        col_izq, col_centro, col_der = st.columns([1, 2, 1])
+    # Semáforo de indicadores de la carrera
+    with METRICAS.tramo('carrera.semaforo'):
+        cubo = consultar(load_indicadores, "Error al leer indicadores", CARRERAS_DATA, CARRERAS_LIST,
+                         CARRERAS_DATA.version, ALMACEN.ruta(ANIO_SELECCIONADO), ANIO_SELECCIONADO)
+        desglose = cubo.desglose(carrera_seleccionada) if cubo is not None else []
+        if desglose:
+            st.markdown('<p class="section-title">SEMÁFORO DE INDICADORES</p>', unsafe_allow_html=True)
+            for col, semaforo in zip(st.columns(len(desglose)), desglose):
+                col.markdown(f"""
+                <div class="kpi-card">
+                    <p class="kpi-label"><span style="color: {COLORES_SEMAFORO[semaforo['semaforo']]};">●</span> {semaforo['semaforo']}</p>
+                    <p class="kpi-value">{semaforo['conteo']}</p>
+                    <p class="kpi-label">{semaforo['porcentaje']:.1f}% de {cubo.total(carrera_seleccionada)}</p>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    # Actividades de la carrera
+    with METRICAS.tramo('carrera.actividades'):
+        st.markdown('<p class="section-title">ACTIVIDADES DE LA CARRERA</p>', unsafe_allow_html=True)
+        ruta_actividades, carrera_actividades = ubicar_carrera(CARRERAS_DATA, carrera_seleccionada,
+                                                               ALMACEN.ruta(ANIO_SELECCIONADO))
+        df_actividades = consultar(load_actividades, "Error al leer actividades",
+                                   carrera_actividades, ruta_actividades, CARRERAS_DATA.version)
+    
+        if df_actividades is None or df_actividades.empty:
+            st.info(f"No hay actividades registradas para {carrera_seleccionada}.")
+        else:
+            resumen = resumen_actividades(df_actividades)
+            m1, m2, m3, m4, m5 = st.columns(5)
+            m1.metric("Actividades", resumen['total'])
+            m2.metric("Completadas", f"{resumen['completadas']}/{resumen['total']}")
+            m3.metric("% Ejecutado", f"{resumen['ejecutado_promedio']:.1f}%")
+            m4.metric("Horas estimadas", f"{resumen['horas_estimadas']:.0f}")
+            m5.metric("Horas actuales", f"{resumen['horas_actuales']:.0f}")
+            st.caption(detalle_estado(resumen))
+    
+            with st.expander(f"Ver {resumen['total']} actividades", expanded=False):
+                tabla = df_actividades[['Estado', 'Prioridad', 'Fecha de entrega', 'Tarea',
+                                        'Docente Responsable', '% Ejecutado',
+                                        'Horas estimadas', 'Horas actuales']].copy()
+                tabla['Estado'] = tabla['Estado'].map({True: 'Completada', False: 'Pendiente'})
+                tabla['% Ejecutado'] = tabla['% Ejecutado'] * 100
+                st.dataframe(
+                    tabla, use_container_width=True, hide_index=True,
+                    column_config={'% Ejecutado': st.column_config.NumberColumn(format="%.0f%%")}
+                )
+
+@st.fragment
+def panel_carreras():
+    """
+    Selector de carrera y vista seleccionada. Cambiar de carrera (o usar
+    los filtros del ranking y del semáforo) solo vuelve a ejecutar este
+    fragmento: estilos, encabezado y pie no se reenvían.
+    """
+    with METRICAS.ejecucion_parcial('panel_carreras'):
+        opciones = [OPCION_TODAS] + CARRERAS_LIST
+        carrera_seleccionada = st.selectbox("SELECCIONAR CARRERA:", options=opciones,
+                                            index=opciones.index(carrera_del_enlace(opciones)), key='carrera')
+        sincronizar_enlace(carrera=None if carrera_seleccionada == OPCION_TODAS else carrera_seleccionada)
+        METRICAS.anotar(carrera=carrera_seleccionada)
         
-        with col_izq:
-            st.markdown('<p class="section-title">INFORMACIÓN</p>', unsafe_allow_html=True)
-            
-            poa_color = COLORS['success'] if datos['poa'] == 'ENTREGADO' else COLORS['orange']
-            informe_color = COLORS['success'] if datos['informe_semestral'] == 'ENTREGADO' else COLORS['orange']
-            matriz_color = COLORS['success'] if datos['matriz_semestral'] == 'ENTREGADO' else COLORS['orange']
-            
-            st.markdown(f"""
-            <div class="kpi-card"><p class="kpi-label">Responsable</p><p class="kpi-value" style="font-size: 0.9rem;">{datos['director']}</p></div>
-            <div class="kpi-card"><p class="kpi-label">POA</p><p class="kpi-value" style="color: {poa_color};">{datos['poa']}</p></div>
-            <div class="kpi-card"><p class="kpi-label">Informe Semestral</p><p class="kpi-value" style="color: {informe_color};">{datos['informe_semestral']}</p></div>
-            <div class="kpi-card"><p class="kpi-label">Matriz Semestral</p><p class="kpi-value" style="color: {matriz_color};">{datos['matriz_semestral']}</p></div>
-            <div class="kpi-card"><p class="kpi-label">Informe Final</p><p class="kpi-value">{datos['informe_final']}</p></div>
-            <div class="kpi-card"><p class="kpi-label">Matriz Final</p><p class="kpi-value">{datos['matriz_final']}</p></div>
-            """, unsafe_allow_html=True)
+        st.markdown("<hr>", unsafe_allow_html=True)
         
-        with col_centro:
-            st.markdown(f'<p class="section-title">AVANCE DE {carrera_seleccionada.upper()}</p>', unsafe_allow_html=True)
-            
-            # CORRECCIÓN: Usar la función para gráfica individual
-            fig = grafico_barras_unica(carrera_seleccionada, datos['avance_poa'])
-            if fig:
-                st.plotly_chart(fig, use_container_width=True)
+        if carrera_seleccionada == OPCION_TODAS:
+            mostrar_vista_general()
+        else:
+            mostrar_carrera(carrera_seleccionada)
+
+OPCION_TODOS_ESTADOS = 'Todos'
+
+@st.fragment
+def panel_busqueda():
+    """
+    Búsqueda en actividades (tarea, descripción, entregable, responsable)
+    y observaciones de todas las carreras. Escribir o cambiar un filtro
+    solo vuelve a ejecutar este fragmento.
+    """
+    with METRICAS.ejecucion_parcial('panel_busqueda'):
+        with st.expander("🔎 BUSCAR EN ACTIVIDADES Y OBSERVACIONES"):
+            col_texto, col_carreras, col_estado = st.columns([2, 2, 1])
+            with col_texto:
+                consulta = st.text_input("Buscar:", key='busqueda',
+                                         placeholder="Palabras o inicios de palabra: entregable, docente, evaluac…")
+            with col_carreras:
+                carreras = st.multiselect("Carreras:", options=CARRERAS_LIST, key='busqueda_carreras')
+            with col_estado:
+                estado = st.selectbox("Estado:", options=[OPCION_TODOS_ESTADOS] + list(ESTADOS), key='busqueda_estado')
+            if not consulta.strip():
+                return
             
-            st.markdown(f"""
-            <div style="background-color: #161b22; border: 2px solid #58a6ff; border-radius: 8px; padding: 1rem; margin-top: 1rem; text-align: center;">
-                <p style="color: #8b949e; margin: 0; font-size: 0.9rem;">CARRERA SELECCIONADA</p>
-                <p style="color: #58a6ff; margin: 0.5rem 0 0 0; font-size: 1.2rem; font-weight: bold;">
-                    {carrera_seleccionada} - {datos['avance_poa']:.1f}%
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col_der:
-            st.markdown('<p class="section-title">AVANCE</p>', unsafe_allow_html=True)
-            st.markdown(f"""
-            <div class="kpi-main">
-                <p class="kpi-main-label">Avance POA</p>
-                <p class="kpi-main-value">{datos['avance_poa']:.1f}%</p>
+            buscador = consultar(load_buscador, "Error al construir el índice de búsqueda",
+                                 CARRERAS_DATA, CARRERAS_LIST, CARRERAS_DATA.version, ALMACEN.ruta(ANIO_SELECCIONADO))
+            if buscador is None:
+                return
+            with METRICAS.tramo('busqueda.consulta'):
+                resultados, total = buscador.buscar(consulta, carreras,
+                                                    None if estado == OPCION_TODOS_ESTADOS else estado,
+                                                    ANIO_SELECCIONADO)
+            if not total:
+                st.info(f"Sin resultados para «{consulta}».")
+                return
+            if total > len(resultados):
+                st.caption(f"{total} resultados; se muestran los primeros {len(resultados)}")
+            else:
+                st.caption(f"{total} resultados")
+            st.dataframe(resultados, use_container_width=True, hide_index=True)
+
+def main():
+    """Función principal."""
+    
+    if RECARGA_ACTIVA:
+        vigilar_datos()
+    
+    # Encabezado con logo dentro del cuadro azul
+    with METRICAS.tramo('encabezado'):
+        st.markdown(f"""
+        <div class="header-container" style="display: flex; justify-content: space-between; align-items: center; padding: 0.8rem 1.5rem;">
+            <div>
+                <h1 class="header-title" style="margin: 0;">INSTITUTO TECNOLÓGICO SUPERIOR AZUAY</h1>
+                <p class="header-subtitle" style="margin: 0;">SEGUIMIENTO POA - CARRERAS {ETIQUETA_ANIO}</p>
             </div>
-            """, unsafe_allow_html=True)
-            st.plotly_chart(grafico_donut(datos['avance_poa']), use_container_width=True)
-            
-            if datos['observacion'] and datos['observacion'] != 'Sin datos':
-                st.markdown(f"""
-                <div style="background-color: #161b22; border-left: 4px solid #FFD700; padding: 0.75rem; border-radius: 4px; margin-top: 1rem; font-size: 0.8rem;">
-                    <p style="color: #e6edf3; margin: 0;"><strong>Observación:</strong></p>
-                    <p style="color: #8b949e; margin: 0.5rem 0 0 0;">{datos['observacion']}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            <img src="{LOGO_URL}" style="height: 100px; max-width: 350px;">
+        </div>
+        """, unsafe_allow_html=True)
+    
+    if not CARRERAS_LIST:
+        st.error("❌ No se encontraron carreras.")
+        return
+    
+    # Año y sede cambian los datos: recargan toda la página
+    mostrar_anio = len(ANIOS) > 1
+    mostrar_fuente = len(FUENTES) > 1
+    if mostrar_anio or mostrar_fuente:
+        columnas = st.columns([1] * (mostrar_anio + mostrar_fuente) + [4])
+        if mostrar_anio:
+            with columnas[0]:
+                st.selectbox("AÑO:", options=ANIOS, index=ANIOS.index(ANIO_SELECCIONADO), key='anio')
+        if mostrar_fuente:
+            with columnas[int(mostrar_anio)]:
+                opciones_fuente = [TODAS_LAS_FUENTES] + FUENTES
+                st.selectbox("SEDE:", options=opciones_fuente, index=opciones_fuente.index(FUENTE_SELECCIONADA), key='fuente')
+    sincronizar_enlace(anio=ANIO_SELECCIONADO if mostrar_anio else None)
+    
+    # Búsqueda, selector de carrera y vista: cada fragmento se vuelve a ejecutar por separado
+    panel_busqueda()
+    panel_carreras()
     
     # Footer
     st.markdown("<hr>", unsafe_allow_html=True)
     st.markdown(f"""
     <div class="footer">
-        <p>Dashboard POA Carreras 2025 | Generado: {datetime.now().strftime('%Y-%m-%d')} | Total: {len(CARRERAS_LIST)} carreras</p>
+        <p>Dashboard POA Carreras {ETIQUETA_ANIO} | Generado: {datetime.now().strftime('%Y-%m-%d')} | Total: {len(CARRERAS_LIST)} carreras</p>
     </div>
     """, unsafe_allow_html=True)
     
@@ -437,4 +639,11 @@ def main():
     """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        # También si la ejecución se interrumpe (rerun o error): una ejecución
+        # abierta haría que los fragmentos posteriores no se midieran
+        ejecucion = METRICAS.finalizar_ejecucion()
+    if PANEL_METRICAS:
+        mostrar_panel_metricas(ejecucion)
@@ -0,0 +1,430 @@
+"""
+Capa de datos del Dashboard POA Carreras
+========================================
+
+Lee la matriz de seguimiento (xlsx) y mantiene un snapshot columnar
+(Parquet) junto al archivo, indexado por el hash del workbook, para que
+el arranque no tenga que pasar por openpyxl mientras el Excel no cambie.
+
+Uso por línea de comandos:
+    python datos_poa.py construir            # genera/actualiza el snapshot
+    python datos_poa.py servir [args...]     # prepara las cachés de todos los años y lanza streamlit
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+from collections.abc import Mapping
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+ARCHIVO_EXCEL = r'Matriz Seguimiento Carreras 2025.xlsx'
+APP_STREAMLIT = 'dashboard_poa_carrerasx.py'
+DIRECTORIO_CACHE = '.poa_cache'
+ARCHIVO_MAPA_GID = 'carreras_gid.json'
+HOJA_METADATOS = 'Resumen'
+VERSION_SNAPSHOT = 3
+# Versiones anteriores del workbook cuya caché se conserva tras un cambio
+VERSIONES_ANTERIORES_EN_CACHE = 1
+ANIO = 2025
+
+# Hojas administrativas a excluir
+HOJAS_EXCLUIDAS = ['resumen', 'Resumen', 'resumen_carreras', 'indicadores_carreras',
+                   'actividades_carreras', 'Hoja 1', 'Dashboard', 'Data', 'Config',
+                   'Summary', 'summary', 'Índice', 'Indice']
+
+# Columnas de resumen_carreras que se comparan como números (clave de año incluida)
+COLUMNAS_NUMERICAS = ['Nro.', '%Avance poa', 'año']
+
+# =============================================================================
+# SNAPSHOT COLUMNAR
+# =============================================================================
+def hash_archivo(file_path):
+    """Calcula el hash SHA-256 del contenido del archivo."""
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+def ruta_cache(file_path, file_hash, sufijo):
+    """Devuelve la ruta de un archivo de caché asociado a una versión del workbook."""
+    directorio = os.path.join(os.path.dirname(os.path.abspath(file_path)), DIRECTORIO_CACHE)
+    base = f"{os.path.splitext(os.path.basename(file_path))[0]}.{file_hash[:16]}"
+    return os.path.join(directorio, f"{base}.{sufijo}")
+
+def rutas_snapshot(file_path, file_hash):
+    """Devuelve las rutas (parquet, manifiesto) del snapshot de un workbook."""
+    return (ruta_cache(file_path, file_hash, "resumen.parquet"),
+            ruta_cache(file_path, file_hash, "json"))
+
+def limpiar_cache(file_path, file_hash, conservar=VERSIONES_ANTERIORES_EN_CACHE):
+    """
+    Elimina los archivos de caché de versiones anteriores del workbook,
+    salvo los de las `conservar` más recientes: las sesiones que todavía
+    muestran la versión previa pueden seguir leyéndolos hasta el próximo
+    cambio, cuando se borran.
+    """
+    directorio = os.path.dirname(ruta_cache(file_path, file_hash, ""))
+    prefijo = os.path.splitext(os.path.basename(file_path))[0] + "."
+    anteriores = {}
+    for nombre in os.listdir(directorio):
+        if not nombre.startswith(prefijo):
+            continue
+        version = nombre[len(prefijo):].split(".", 1)[0]
+        if version == file_hash[:16] or not re.fullmatch(r'[0-9a-f]{16}', version):
+            continue
+        ruta = os.path.join(directorio, nombre)
+        try:
+            anteriores.setdefault(version, []).append((os.path.getmtime(ruta), ruta))
+        except OSError:
+            pass
+    # Versiones anteriores de la más reciente a la más antigua
+    orden = sorted(anteriores, key=lambda v: max(m for m, _ in anteriores[v]), reverse=True)
+    for version in orden[conservar:]:
+        for _, ruta in anteriores[version]:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+def escribir_atomico(ruta, escribir):
+    """Escribe en un temporal y lo renombra para no dejar archivos a medias."""
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    # Temporal único por proceso e hilo (el vigilante de ingesta escribe en segundo plano)
+    temporal = f"{ruta}.tmp{os.getpid()}.{threading.get_ident()}"
+    try:
+        escribir(temporal)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+# Referencia a otra hoja dentro de una fórmula: ='Hoja'!$I$59 o =Hoja!I59
+_REF_HOJA = re.compile(r"^=\s*(?:'((?:[^']|'')+)'|([^'!\s]+))!\$?[A-Z]+\$?\d+$")
+
+def leer_mapa_gid_workbook(file_path):
+    """
+    Obtiene el mapa gid → hoja desde los metadatos del workbook: en la hoja
+    Resumen cada fila 'gid=...' tiene fórmulas que apuntan a la hoja de su carrera.
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=False)
+    try:
+        if HOJA_METADATOS not in wb.sheetnames:
+            return {}
+        mapa = {}
+        for fila in wb[HOJA_METADATOS].iter_rows(values_only=True):
+            textos = [v.strip() for v in fila if isinstance(v, str)]
+            gid = next((t for t in textos if t.startswith('gid=')), None)
+            if gid is None or gid in mapa:
+                continue
+            for texto in textos:
+                ref = _REF_HOJA.match(texto)
+                if ref:
+                    mapa[gid] = ref.group(1).replace("''", "'") if ref.group(1) else ref.group(2)
+                    break
+        return mapa
+    finally:
+        wb.close()
+
+def leer_mapa_gid_config(file_path):
+    """Lee el archivo de configuración gid → hoja ubicado junto al workbook."""
+    ruta = os.path.join(os.path.dirname(os.path.abspath(file_path)), ARCHIVO_MAPA_GID)
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return {str(k).strip(): v for k, v in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+def leer_workbook(file_path):
+    """Lee del Excel los nombres de hojas, la hoja resumen_carreras y el mapa gid → hoja."""
+    xlsx = pd.ExcelFile(file_path)
+    all_sheets = xlsx.sheet_names
+    df_resumen = xlsx.parse('resumen_carreras')
+    return df_resumen, all_sheets, leer_mapa_gid_workbook(file_path)
+
+def _columnas_texto(df):
+    """
+    Normaliza las columnas object a texto para que Parquet las acepte. Las
+    columnas numéricas se convierten a número (lo no numérico queda NaN)
+    para que los filtros por año sigan funcionando al leer el snapshot.
+    """
+    df = df.copy()
+    for columna in df.columns:
+        if columna in COLUMNAS_NUMERICAS:
+            df[columna] = pd.to_numeric(df[columna], errors='coerce')
+        elif df[columna].dtype == object:
+            df[columna] = df[columna].where(df[columna].isna(), df[columna].astype(str))
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+def _resumen_parquet(df_resumen):
+    """
+    Resumen normalizado en bytes Parquet y el DataFrame leído de ellos, con
+    los mismos tipos de columna que al leer el snapshot desde disco.
+    """
+    buffer = io.BytesIO()
+    _columnas_texto(df_resumen).to_parquet(buffer, index=False)
+    datos = buffer.getvalue()
+    return datos, pd.read_parquet(io.BytesIO(datos))
+
+def construir_snapshot(file_path=ARCHIVO_EXCEL, file_hash=None):
+    """
+    Parsea el workbook y escribe el snapshot columnar asociado a su hash.
+    Devuelve (df_resumen, all_sheets, mapa_gid).
+    """
+    file_hash = file_hash or hash_archivo(file_path)
+    df_resumen, all_sheets, mapa_gid = leer_workbook(file_path)
+    ruta_parquet, ruta_manifiesto = rutas_snapshot(file_path, file_hash)
+
+    datos, df_snapshot = _resumen_parquet(df_resumen)
+    def escribir_parquet(p):
+        with open(p, "wb") as f:
+            f.write(datos)
+    escribir_atomico(ruta_parquet, escribir_parquet)
+    manifiesto = {
+        'version': VERSION_SNAPSHOT,
+        'archivo': os.path.basename(file_path),
+        'hash': file_hash,
+        'hojas': all_sheets,
+        'mapa_gid': mapa_gid,
+    }
+    def escribir_manifiesto(p):
+        with open(p, "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    escribir_atomico(ruta_manifiesto, escribir_manifiesto)
+
+    # Eliminar snapshots de versiones anteriores del mismo workbook
+    limpiar_cache(file_path, file_hash)
+
+    return df_snapshot, all_sheets, mapa_gid
+
+def leer_snapshot(file_path, file_hash):
+    """Lee el snapshot si existe y corresponde al hash; si no, devuelve None."""
+    ruta_parquet, ruta_manifiesto = rutas_snapshot(file_path, file_hash)
+    try:
+        with open(ruta_manifiesto, encoding="utf-8") as f:
+            manifiesto = json.load(f)
+        if manifiesto.get('version') != VERSION_SNAPSHOT or manifiesto.get('hash') != file_hash:
+            return None
+        return pd.read_parquet(ruta_parquet), manifiesto['hojas'], manifiesto['mapa_gid']
+    except (OSError, ValueError, KeyError):
+        return None
+
+def obtener_resumen(file_path=ARCHIVO_EXCEL, file_hash=None):
+    """
+    Devuelve (df_resumen, all_sheets, mapa_gid) desde el snapshot; solo abre el Excel
+    cuando el hash del archivo cambió o el snapshot no existe.
+    """
+    file_hash = file_hash or hash_archivo(file_path)
+    snapshot = leer_snapshot(file_path, file_hash)
+    if snapshot is not None:
+        return snapshot
+    try:
+        return construir_snapshot(file_path, file_hash)
+    except OSError:
+        # Sin permisos de escritura: se trabaja directamente con el Excel,
+        # con los mismos tipos de columna que el snapshot
+        df_resumen, all_sheets, mapa_gid = leer_workbook(file_path)
+        return _resumen_parquet(df_resumen)[1], all_sheets, mapa_gid
+
+# =============================================================================
+# CARGA DE DATOS
+# =============================================================================
+# Columnas de resumen_carreras → campos de cada carrera
+COLUMNAS_CARRERA = {
+    'DIRECTOR/A': 'director',
+    'POA': 'poa',
+    'INFORME SEMESTRAL': 'informe_semestral',
+    'MATRIZ SEMESTRAL': 'matriz_semestral',
+    'INFORME FINAL': 'informe_final',
+    'MATRIZ FINAL': 'matriz_final',
+    'Observación': 'observacion',
+    '%Avance poa': 'avance_poa',
+}
+
+# Valores para carreras con hoja pero sin fila en resumen_carreras
+VALORES_SIN_DATOS = {
+    'director': 'N/A',
+    'poa': 'N/A',
+    'informe_semestral': 'N/A',
+    'matriz_semestral': 'N/A',
+    'informe_final': 'N/A',
+    'matriz_final': 'N/A',
+    'observacion': 'Sin datos',
+    'avance_poa': 0.0,
+}
+
+def construir_tabla_carreras(df_resumen, all_sheets, mapa_gid, anio=ANIO):
+    """
+    Construye en una pasada vectorizada la tabla de carreras (una fila por
+    carrera, indexada por nombre) y la lista de carreras en orden de hojas.
+    """
+    # Las carreras son los nombres de las hojas
+    carreras_names = [s for s in all_sheets if s not in HOJAS_EXCLUIDAS]
+
+    df = df_resumen[pd.to_numeric(df_resumen['año'], errors='coerce') == anio]
+
+    # Resolver 'gid=...' mediante el mapa explícito; los nombres se usan tal cual
+    carrera = df['CARRERA'].astype(str).str.strip()
+    nombre = carrera.map(mapa_gid).fillna(carrera)
+
+    tabla = pd.DataFrame({'carrera': nombre.to_numpy()})
+    for columna, campo in COLUMNAS_CARRERA.items():
+        tabla[campo] = df[columna].to_numpy() if columna in df.columns else VALORES_SIN_DATOS[campo]
+    tabla['avance_poa'] = pd.to_numeric(tabla['avance_poa'], errors='coerce').fillna(0) * 100
+
+    # Una fila por carrera (resumen_carreras repite la carrera por cada objetivo)
+    tabla = tabla.drop_duplicates('carrera', keep='first').set_index('carrera')
+
+    # Carreras con hoja pero sin datos en resumen_carreras
+    faltantes = [c for c in carreras_names if c not in tabla.index]
+    if faltantes:
+        sin_datos = pd.DataFrame([VALORES_SIN_DATOS] * len(faltantes), index=pd.Index(faltantes, name='carrera'))
+        tabla = pd.concat([tabla, sin_datos])
+
+    return tabla, carreras_names
+
+class RegistroCarrera(Mapping):
+    """
+    Fila de una carrera con la interfaz del antiguo diccionario
+    (registro['avance_poa']); lee de las columnas compartidas de la vista.
+    """
+
+    __slots__ = ('_columnas', '_posicion')
+
+    def __init__(self, columnas, posicion):
+        self._columnas = columnas
+        self._posicion = posicion
+
+    def __getitem__(self, campo):
+        return self._columnas[campo][self._posicion]
+
+    def __iter__(self):
+        return iter(self._columnas)
+
+    def __len__(self):
+        return len(self._columnas)
+
+    def __repr__(self):
+        return f"RegistroCarrera({dict(self)!r})"
+
+class VistaCarreras(Mapping):
+    """
+    Vista inmutable con la interfaz del antiguo diccionario carreras_data:
+    vista[carrera] → registro {'director': ..., 'avance_poa': ...}.
+    Las columnas se guardan una sola vez como tuplas y los registros se
+    crean al construirla, de modo que una misma vista puede compartirse
+    entre sesiones sin copiarla. La tabla no debe modificarse.
+    """
+
+    __slots__ = ('tabla', 'version', '_columnas', '_registros')
+
+    def __init__(self, tabla, version=None):
+        columnas = {campo: tuple(tabla[campo].tolist()) for campo in tabla.columns}
+        # Con índices repetidos se conserva la primera fila, como tabla.loc
+        posiciones = {}
+        for posicion, carrera in enumerate(tabla.index):
+            posiciones.setdefault(carrera, posicion)
+        object.__setattr__(self, 'tabla', tabla)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_columnas', columnas)
+        object.__setattr__(self, '_registros',
+                           {carrera: RegistroCarrera(columnas, posicion) for carrera, posicion in posiciones.items()})
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("VistaCarreras es de solo lectura")
+
+    def __reduce__(self):
+        return (VistaCarreras, (self.tabla, self.version))
+
+    def __getitem__(self, carrera):
+        return self._registros[carrera]
+
+    def __contains__(self, carrera):
+        return carrera in self._registros
+
+    def __iter__(self):
+        return iter(self._registros)
+
+    def __len__(self):
+        return len(self._registros)
+
+def anio_de_archivo(file_path):
+    """Año indicado en el nombre del workbook, o ANIO si no lo tiene."""
+    coincidencia = re.search(r'(\d{4})\.xlsx$', os.path.basename(file_path))
+    return int(coincidencia.group(1)) if coincidencia else ANIO
+
+def cargar_tabla(file_path=ARCHIVO_EXCEL, file_hash=None, anio=None):
+    """Devuelve (tabla de carreras, lista de carreras) del workbook."""
+    df_resumen, all_sheets, mapa_gid = obtener_resumen(file_path, file_hash)
+    # El archivo de configuración tiene prioridad sobre los metadatos del workbook
+    mapa_gid = {**mapa_gid, **leer_mapa_gid_config(file_path)}
+    anio = anio if anio is not None else anio_de_archivo(file_path)
+    return construir_tabla_carreras(df_resumen, all_sheets, mapa_gid, anio)
+
+def cargar_datos(file_path=ARCHIVO_EXCEL, anio=None):
+    """
+    Construye el diccionario de carreras y la lista de nombres de carreras.
+    La versión de los datos (año y hash del workbook) queda en carreras_data.version.
+    """
+    file_hash = hash_archivo(file_path)
+    anio = anio if anio is not None else anio_de_archivo(file_path)
+    tabla, carreras_names = cargar_tabla(file_path, file_hash, anio)
+    return VistaCarreras(tabla, version=f"{anio}-{file_hash[:16]}"), carreras_names
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Snapshot de la matriz POA de carreras.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    p_construir = subparsers.add_parser('construir', help="Genera el snapshot si el Excel cambió.")
+    p_construir.add_argument('--archivo', default=ARCHIVO_EXCEL)
+    p_construir.add_argument('--forzar', action='store_true', help="Regenera aunque el hash coincida.")
+
+    p_servir = subparsers.add_parser(
+        'servir', help="Prepara las cachés de todos los años registrados (y sus sedes) y lanza streamlit.")
+    p_servir.add_argument('streamlit_args', nargs=argparse.REMAINDER)
+
+    args = parser.parse_args(argv)
+
+    if args.comando == 'construir':
+        file_hash = hash_archivo(args.archivo)
+        if args.forzar or leer_snapshot(args.archivo, file_hash) is None:
+            construir_snapshot(args.archivo, file_hash)
+            print(f"Snapshot generado: {rutas_snapshot(args.archivo, file_hash)[0]}")
+        else:
+            print(f"Snapshot vigente: {rutas_snapshot(args.archivo, file_hash)[0]}")
+        return 0
+
+    # Las cachés de cada workbook quedan listas antes de que llegue el primer visitante
+    from anios_poa import AlmacenAnios
+    from ingesta_poa import ingerir
+    for anio, archivos in AlmacenAnios().archivos().items():
+        for ruta in archivos:
+            try:
+                resultado = ingerir(ruta)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"{anio}: no se pudo preparar {ruta}: {e}")
+                continue
+            print(f"{anio}: {os.path.basename(ruta)} | reconstruidos: {', '.join(resultado['reconstruidos']) or '-'}")
+
+    # 'servir -- --server.port 8502': el separador no se pasa a streamlit
+    streamlit_args = args.streamlit_args[1:] if args.streamlit_args[:1] == ['--'] else args.streamlit_args
+    comando = [sys.executable, '-m', 'streamlit', 'run', APP_STREAMLIT] + streamlit_args
+    os.execv(sys.executable, comando)
+
+if __name__ == "__main__":
+    sys.exit(main())
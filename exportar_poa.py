@@ -0,0 +1,397 @@
+"""
+Exportación estática del Dashboard POA Carreras
+===============================================
+
+Genera sin servidor Streamlit la vista general y la página de cada carrera
+como HTML estático. Los datos se cargan una sola vez en el proceso principal
+y se comparten con un pool de procesos que renderiza las páginas en
+paralelo. En modo incremental solo se vuelven a generar las carreras cuyos
+datos cambiaron desde la última exportación (cada proceso lee las
+actividades de la carrera una vez, para la huella y para la página).
+
+Por defecto cada página incluye plotly.js y se puede abrir o enviar sola.
+Con --plotlyjs archivo las páginas comparten un plotly.min.js en el
+directorio de salida: la exportación ocupa mucho menos, pero una página
+copiada sin ese archivo no muestra los gráficos.
+
+Uso por línea de comandos:
+    python exportar_poa.py [--salida reportes] [--anio 2025] [--procesos 4] [--incremental]
+                           [--plotlyjs inline|archivo]
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import plotly.offline
+
+from actividades_poa import detalle_estado, resumen_actividades
+from anios_poa import AlmacenAnios
+from consolidacion_poa import abrir_lector, es_consolidado
+from datos_poa import escribir_atomico, hash_archivo
+from graficos_poa import COLORS, grafico_barras, grafico_barras_unica, grafico_donut
+from kpis_poa import ResumenKPI
+from ranking_poa import normalizar_texto
+from recursos_poa import ARCHIVO_ESTILOS, DIRECTORIO_STATIC, url_logo
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+DIRECTORIO_SALIDA = 'reportes'
+ARCHIVO_MANIFIESTO = 'exportacion.json'
+ARCHIVO_PLOTLYJS = 'plotly.min.js'
+PAGINA_GENERAL = 'index.html'
+# Cambiar al modificar las plantillas para invalidar exportaciones previas
+VERSION_PLANTILLA = 1
+
+INSTITUCION = 'INSTITUTO TECNOLÓGICO SUPERIOR AZUAY'
+
+# Estado compartido por cada proceso del pool (se fija en _iniciar_trabajador)
+_CONTEXTO = {}
+
+# =============================================================================
+# UTILIDADES
+# =============================================================================
+def nombre_archivo(carrera):
+    """Nombre del archivo HTML de una carrera (sin tildes ni signos, sin recortar)."""
+    return re.sub(r'[^a-z0-9]+', '-', normalizar_texto(carrera)).strip('-') + '.html'
+
+def nombres_archivo(carreras):
+    """
+    {carrera: archivo} sin repetidos: si dos carreras coinciden al normalizar
+    (mayúsculas, tildes, signos) o una coincide con la vista general, las
+    siguientes en el orden dado reciben un sufijo numérico.
+    """
+    usados = {PAGINA_GENERAL}
+    archivos = {}
+    for carrera in carreras:
+        base = nombre_archivo(carrera)[:-len('.html')] or 'carrera'
+        archivo, n = f"{base}.html", 2
+        while archivo in usados:
+            archivo, n = f"{base}-{n}.html", n + 1
+        usados.add(archivo)
+        archivos[carrera] = archivo
+    return archivos
+
+def _huella(*partes):
+    """Hash estable de los datos usados para renderizar una página."""
+    h = hashlib.sha256()
+    for parte in partes:
+        h.update(json.dumps(parte, sort_keys=True, default=str, ensure_ascii=False).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+def _leer_manifiesto(salida):
+    """Huellas de la exportación anterior: {página: huella}."""
+    try:
+        with open(os.path.join(salida, ARCHIVO_MANIFIESTO), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _escribir_texto(ruta, texto):
+    """Escribe un archivo de texto de forma atómica."""
+    def escribir(p):
+        with open(p, "w", encoding="utf-8") as f:
+            f.write(texto)
+    escribir_atomico(ruta, escribir)
+
+# =============================================================================
+# PLANTILLAS
+# =============================================================================
+def _figura_html(fig):
+    """Fragmento HTML de una figura (plotly.js se incluye una vez por página)."""
+    if fig is None:
+        return ''
+    return fig.to_html(full_html=False, include_plotlyjs=False, config={'displayModeBar': False})
+
+def _pagina(titulo, cuerpo, contexto):
+    """Documento HTML completo con estilos, logo y plotly.js."""
+    if contexto['plotlyjs'] == 'inline':
+        script = f"<script>{plotly.offline.get_plotlyjs()}</script>"
+    else:
+        script = f'<script src="{ARCHIVO_PLOTLYJS}"></script>'
+    logo = f'<img src="{contexto["logo"]}" style="height: 100px; max-width: 350px;">' if contexto['logo'] else ''
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(titulo)}</title>
+<style>
+body {{ margin: 0; background-color: {COLORS['background']}; color: {COLORS['text']}; font-family: 'Arial', sans-serif; }}
+.stApp {{ padding: 1rem 2rem; }}
+.columnas {{ display: grid; grid-template-columns: 1fr 2fr 1fr; gap: 1.5rem; }}
+.enlaces a {{ color: {COLORS['accent']}; text-decoration: none; }}
+table {{ width: 100%; border-collapse: collapse; font-size: 0.8rem; }}
+th, td {{ border: 1px solid {COLORS['border']}; padding: 0.4rem; text-align: left; vertical-align: top; }}
+th {{ background-color: {COLORS['card_bg']}; color: {COLORS['text_secondary']}; }}
+{contexto['css']}
+</style>
+{script}
+</head>
+<body>
+<div class="stApp">
+    <div class="header-container" style="display: flex; justify-content: space-between; align-items: center; padding: 0.8rem 1.5rem;">
+        <div>
+            <h1 class="header-title" style="margin: 0;">{INSTITUCION}</h1>
+            <p class="header-subtitle" style="margin: 0;">SEGUIMIENTO POA - CARRERAS {contexto['anio']}</p>
+        </div>
+        {logo}
+    </div>
+{cuerpo}
+    <div class="footer">
+        <p>Dashboard POA Carreras {contexto['anio']} | Generado: {contexto['fecha']} | Total: {len(contexto['carreras_list'])} carreras</p>
+    </div>
+</div>
+</body>
+</html>
+"""
+
+def render_general(contexto):
+    """HTML de la vista general con enlaces a cada carrera."""
+    carreras_data = contexto['carreras_data']
+    carreras_list = contexto['carreras_list']
+    kpis = contexto['kpis']
+    total = kpis.total_carreras
+    etiquetas = kpis.etiquetas_niveles()
+
+    enlaces = ''.join(
+        f'<li><a href="{contexto["archivos"][c]}">{html.escape(c)}</a> '
+        f'- {carreras_data[c]["avance_poa"]:.1f}%</li>'
+        for c in carreras_list if c in carreras_data
+    )
+    cuerpo = f"""
+    <div class="columnas">
+        <div>
+            <p class="section-title">RESUMEN GENERAL</p>
+            <div class="kpi-card"><p class="kpi-label">Total Carreras</p><p class="kpi-value">{total}</p></div>
+            <div class="kpi-card"><p class="kpi-label">POA Entregados</p><p class="kpi-value">{kpis.entregados.get('poa', 0)}/{total}</p></div>
+            <div class="kpi-card"><p class="kpi-label">Informes Semestrales</p><p class="kpi-value">{kpis.entregados.get('informe_semestral', 0)}/{total}</p></div>
+            <div class="kpi-card"><p class="kpi-label">Matrices Semestrales</p><p class="kpi-value">{kpis.entregados.get('matriz_semestral', 0)}/{total}</p></div>
+        </div>
+        <div>
+            <p class="section-title">AVANCE POA POR CARRERA</p>
+            {_figura_html(grafico_barras(carreras_data, carreras_list))}
+        </div>
+        <div>
+            <p class="section-title">RESUMEN</p>
+            <div class="kpi-main">
+                <p class="kpi-main-label">Avance POA General</p>
+                <p class="kpi-main-value">{kpis.avance_promedio:.1f}%</p>
+            </div>
+            {_figura_html(grafico_donut(kpis.avance_promedio))}
+            <div style="font-size: 0.9rem; margin-top: 1rem;">
+                <p><span style="color: {COLORS['yellow']};">●</span> {etiquetas['alto']}: <strong>{kpis.alto}</strong></p>
+                <p><span style="color: {COLORS['orange']};">●</span> {etiquetas['medio']}: <strong>{kpis.medio}</strong></p>
+                <p><span style="color: {COLORS['orange_dark']};">●</span> {etiquetas['bajo']}: <strong>{kpis.bajo}</strong></p>
+            </div>
+        </div>
+    </div>
+    <p class="section-title">CARRERAS</p>
+    <ul class="enlaces">{enlaces}</ul>
+"""
+    return _pagina(f"Dashboard POA Carreras {contexto['anio']}", cuerpo, contexto)
+
+def _tabla_actividades(df):
+    """Tabla HTML con las actividades de una carrera."""
+    filas = []
+    for estado, prioridad, tarea, docente, ejecutado in zip(
+            df['Estado'], df['Prioridad'], df['Tarea'], df['Docente Responsable'], df['% Ejecutado']):
+        ejecutado = 0 if ejecutado is None or ejecutado != ejecutado else ejecutado
+        filas.append(
+            "<tr>"
+            f"<td>{'Completada' if estado else 'Pendiente'}</td>"
+            f"<td>{html.escape(str(prioridad or ''))}</td>"
+            f"<td>{html.escape(str(tarea or ''))}</td>"
+            f"<td>{html.escape(str(docente or ''))}</td>"
+            f"<td>{ejecutado * 100:.0f}%</td>"
+            "</tr>"
+        )
+    return (
+        "<table><tr><th>Estado</th><th>Prioridad</th><th>Tarea</th>"
+        "<th>Docente Responsable</th><th>% Ejecutado</th></tr>"
+        + ''.join(filas) + "</table>"
+    )
+
+def render_carrera(carrera, datos, df_actividades, contexto):
+    """HTML de la página de una carrera."""
+    def color(estado):
+        return COLORS['success'] if estado == 'ENTREGADO' else COLORS['orange']
+
+    def texto(valor):
+        return html.escape(str(valor))
+
+    actividades = ''
+    if df_actividades is not None and not df_actividades.empty:
+        resumen = resumen_actividades(df_actividades)
+        actividades = f"""
+    <p class="section-title">ACTIVIDADES DE LA CARRERA</p>
+    <p>Actividades: <strong>{resumen['total']}</strong> | Completadas: <strong>{resumen['completadas']}/{resumen['total']}</strong>
+       | % Ejecutado: <strong>{resumen['ejecutado_promedio']:.1f}%</strong>
+       | Horas estimadas: <strong>{resumen['horas_estimadas']:.0f}</strong> | Horas actuales: <strong>{resumen['horas_actuales']:.0f}</strong></p>
+    <p style="color: {COLORS['text_secondary']};">{texto(detalle_estado(resumen))}</p>
+    {_tabla_actividades(df_actividades)}
+"""
+    observacion = ''
+    if datos['observacion'] and datos['observacion'] != 'Sin datos':
+        observacion = f"""
+            <div style="background-color: {COLORS['card_bg']}; border-left: 4px solid {COLORS['yellow']}; padding: 0.75rem; border-radius: 4px; margin-top: 1rem; font-size: 0.8rem;">
+                <p style="margin: 0;"><strong>Observación:</strong></p>
+                <p style="color: {COLORS['text_secondary']}; margin: 0.5rem 0 0 0;">{texto(datos['observacion'])}</p>
+            </div>"""
+
+    cuerpo = f"""
+    <p class="enlaces"><a href="index.html">← Todas las Carreras</a></p>
+    <div class="columnas">
+        <div>
+            <p class="section-title">INFORMACIÓN</p>
+            <div class="kpi-card"><p class="kpi-label">Responsable</p><p class="kpi-value" style="font-size: 0.9rem;">{texto(datos['director'])}</p></div>
+            <div class="kpi-card"><p class="kpi-label">POA</p><p class="kpi-value" style="color: {color(datos['poa'])};">{texto(datos['poa'])}</p></div>
+            <div class="kpi-card"><p class="kpi-label">Informe Semestral</p><p class="kpi-value" style="color: {color(datos['informe_semestral'])};">{texto(datos['informe_semestral'])}</p></div>
+            <div class="kpi-card"><p class="kpi-label">Matriz Semestral</p><p class="kpi-value" style="color: {color(datos['matriz_semestral'])};">{texto(datos['matriz_semestral'])}</p></div>
+            <div class="kpi-card"><p class="kpi-label">Informe Final</p><p class="kpi-value">{texto(datos['informe_final'])}</p></div>
+            <div class="kpi-card"><p class="kpi-label">Matriz Final</p><p class="kpi-value">{texto(datos['matriz_final'])}</p></div>
+        </div>
+        <div>
+            <p class="section-title">AVANCE DE {texto(carrera.upper())}</p>
+            {_figura_html(grafico_barras_unica(carrera, datos['avance_poa']))}
+        </div>
+        <div>
+            <p class="section-title">AVANCE</p>
+            <div class="kpi-main">
+                <p class="kpi-main-label">Avance POA</p>
+                <p class="kpi-main-value">{datos['avance_poa']:.1f}%</p>
+            </div>
+            {_figura_html(grafico_donut(datos['avance_poa']))}
+            {observacion}
+        </div>
+    </div>
+{actividades}
+"""
+    return _pagina(f"{carrera} - POA {contexto['anio']}", cuerpo, contexto)
+
+# =============================================================================
+# EXPORTACIÓN EN PARALELO
+# =============================================================================
+def _iniciar_trabajador(contexto):
+    """Recibe una sola vez por proceso los datos ya cargados."""
+    _CONTEXTO.clear()
+    _CONTEXTO.update(contexto)
+    _CONTEXTO['lector'] = abrir_lector(contexto['file_path'], contexto['carreras_data'], contexto['file_hash'])
+
+def _exportar_carrera(carrera):
+    """
+    Calcula la huella de la página de una carrera (datos, actividades y
+    plantilla) y, si no coincide con la de la exportación anterior, la
+    renderiza y la escribe (se ejecuta en el pool). Devuelve (carrera,
+    huella, generada).
+    """
+    contexto = _CONTEXTO
+    archivo = contexto['archivos'][carrera]
+    df_actividades = contexto['lector'].actividades(carrera)
+    huella = _huella(contexto['huellas_base'][carrera],
+                     pd.util.hash_pandas_object(df_actividades, index=False).tolist())
+    ruta = os.path.join(contexto['salida'], archivo)
+    if contexto['anteriores'].get(archivo) == huella and os.path.exists(ruta):
+        return carrera, huella, False
+    pagina = render_carrera(carrera, contexto['carreras_data'][carrera], df_actividades, contexto)
+    _escribir_texto(ruta, pagina)
+    return carrera, huella, True
+
+def exportar(salida=DIRECTORIO_SALIDA, anio=None, procesos=None, incremental=False, plotlyjs='inline'):
+    """
+    Exporta la vista general y todas las carreras de un año a HTML.
+    Devuelve un diccionario con las páginas generadas y omitidas.
+    """
+    almacen = AlmacenAnios()
+    anio = anio if anio is not None else almacen.anio_actual()
+    file_path = almacen.ruta(anio)
+    file_hash = None if es_consolidado(file_path) else hash_archivo(file_path)
+
+    # Una sola carga de datos, compartida por todos los procesos
+    carreras_data, carreras_list = almacen.obtener(anio)
+    kpis = ResumenKPI(carreras_data.tabla, carreras_list)
+    carreras = [c for c in carreras_list if c in carreras_data]
+    archivos = nombres_archivo(carreras)
+    # Deja construida la caché de actividades antes de abrir el pool
+    abrir_lector(file_path, carreras_data, file_hash)
+
+    css_ruta = os.path.join(DIRECTORIO_STATIC, ARCHIVO_ESTILOS)
+    with open(css_ruta, encoding="utf-8") as f:
+        css = f.read()
+
+    contexto = {
+        'salida': salida,
+        'file_path': file_path,
+        'file_hash': file_hash,
+        'anio': anio if anio is not None else '',
+        'fecha': datetime.now().strftime('%Y-%m-%d'),
+        'carreras_data': carreras_data,
+        'carreras_list': carreras_list,
+        'kpis': kpis,
+        'css': css,
+        'logo': url_logo(False),
+        'plotlyjs': plotlyjs,
+        'archivos': archivos,
+        # Las actividades se leen una sola vez, en el pool, y se agregan allí a la huella
+        'huellas_base': {c: _huella(VERSION_PLANTILLA, anio, plotlyjs, c, archivos[c], carreras_data[c])
+                         for c in carreras},
+        'anteriores': _leer_manifiesto(salida) if incremental else {},
+    }
+    os.makedirs(salida, exist_ok=True)
+    if plotlyjs == 'archivo':
+        ruta_js = os.path.join(salida, ARCHIVO_PLOTLYJS)
+        if not os.path.exists(ruta_js):
+            _escribir_texto(ruta_js, plotly.offline.get_plotlyjs())
+
+    huellas = {PAGINA_GENERAL: _huella(VERSION_PLANTILLA, anio, plotlyjs, carreras_data.tabla.to_dict('index'),
+                                       carreras_list, archivos)}
+    generadas = []
+    if (contexto['anteriores'].get(PAGINA_GENERAL) != huellas[PAGINA_GENERAL]
+            or not os.path.exists(os.path.join(salida, PAGINA_GENERAL))):
+        _escribir_texto(os.path.join(salida, PAGINA_GENERAL), render_general(contexto))
+        generadas.append(PAGINA_GENERAL)
+
+    if carreras:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(contexto,)) as pool:
+            for carrera, huella, generada in pool.map(_exportar_carrera, carreras):
+                huellas[archivos[carrera]] = huella
+                if generada:
+                    generadas.append(archivos[carrera])
+
+    _escribir_texto(os.path.join(salida, ARCHIVO_MANIFIESTO), json.dumps(huellas, indent=2, ensure_ascii=False))
+    omitidas = [p for p in huellas if p not in generadas]
+    return {'generadas': generadas, 'omitidas': omitidas}
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Exporta el dashboard POA a HTML estático.")
+    parser.add_argument('--salida', default=DIRECTORIO_SALIDA, help="Directorio de salida.")
+    parser.add_argument('--anio', type=int, default=None, help="Año a exportar (por defecto, el más reciente).")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos del pool (por defecto, uno por CPU).")
+    parser.add_argument('--incremental', action='store_true', help="Solo regenera las carreras que cambiaron.")
+    parser.add_argument('--plotlyjs', choices=['inline', 'archivo'], default='inline',
+                        help="'inline' (por defecto): cada página autónoma, unos 5 MB más por página; "
+                             "'archivo': un plotly.min.js compartido, las páginas no se pueden copiar solas.")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    resultado = exportar(args.salida, args.anio, args.procesos, args.incremental, args.plotlyjs)
+    print(f"Páginas generadas: {len(resultado['generadas'])} | sin cambios: {len(resultado['omitidas'])} "
+          f"| {time.perf_counter() - inicio:.1f} s → {os.path.abspath(args.salida)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""
+Gráficos del Dashboard POA Carreras
+===================================
+
+Constructores de figuras Plotly y caché LRU de figuras serializadas,
+indexada por (versión de datos, vista, carrera).
+"""
+
+import json
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from kpis_poa import nivel_avance
+from metricas_poa import METRICAS
+
+# =============================================================================
+# PALETA DE COLORES
+# =============================================================================
+COLORS = {
+    'background': '#0d1117', 'card_bg': '#161b22', 'header': '#1F3A5E',
+    'yellow': '#FFD700', 'orange': '#FFA500', 'orange_dark': '#CC8400',
+    'text': '#e6edf3', 'text_secondary': '#8b949e', 'border': '#30363d',
+    'accent': '#58a6ff', 'success': '#3fb950',
+}
+
+# Color de cada nivel de avance: bajo, medio, alto
+COLORES_NIVEL = np.array([COLORS['orange_dark'], COLORS['orange'], COLORS['yellow']], dtype=object)
+
+def colores_avance(avances):
+    """Lista de colores según el nivel de avance de cada valor."""
+    return COLORES_NIVEL[nivel_avance(avances)].tolist()
+
+# Colores del semáforo de indicadores
+COLORES_SEMAFORO = {
+    'VERDE': COLORS['success'], 'AMARILLO': COLORS['yellow'],
+    'NARANJA': COLORS['orange'], 'ROJO': '#f85149',
+}
+
+# =============================================================================
+# GRÁFICOS
+# =============================================================================
+def grafico_barras(carreras_data, carreras_list):
+    """Crea gráfico de barras horizontales."""
+    if not carreras_data or not carreras_list:
+        return None
+    
+    # Crear lista de datos
+    datos = []
+    for carrera in carreras_list:
+        if carrera in carreras_data:
+            datos.append({
+                'Carrera': carrera,
+                'Avance POA': carreras_data[carrera]['avance_poa']
+            })
+    
+    if not datos:
+        return None
+    
+    df = pd.DataFrame(datos)
+    df = df.sort_values('Avance POA', ascending=True)
+    
+    colores = colores_avance(df['Avance POA'])
+    
+    fig = go.Figure(data=[go.Bar(
+        y=df['Carrera'], x=df['Avance POA'], orientation='h',
+        marker_color=colores,
+        text=[f'{v:.1f}%' for v in df['Avance POA']],
+        textposition='inside',
+        textfont=dict(color='#000000', size=11, family='Arial Black'),
+        hovertemplate='<b>%{y}</b><br>Avance: %{x:.1f}%<extra></extra>'
+    )])
+    
+    fig.update_layout(
+        title=dict(text='<b>AVANCE POA POR CARRERA</b>', font=dict(size=16, color=COLORS['accent'], family='Arial'), x=0.5),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(
+            title=dict(text='Porcentaje de Avance (%)', font=dict(size=12, color=COLORS['text_secondary'])),
+            tickfont=dict(size=10, color=COLORS['text_secondary']),
+            range=[0, 100], gridcolor=COLORS['border'], showgrid=True, gridwidth=1
+        ),
+        yaxis=dict(title='', tickfont=dict(size=10, color=COLORS['text']), automargin=True),
+        margin=dict(l=20, r=20, t=60, b=50),
+        height=max(400, len(df) * 40),
+        showlegend=False
+    )
+    
+    return fig
+
+def grafico_barras_unica(carrera_seleccionada, avance):
+    """Crea gráfico de barras para una sola carrera."""
+    
+    fig = go.Figure(data=[go.Bar(
+        y=[carrera_seleccionada],
+        x=[avance],
+        orientation='h',
+        marker_color=COLORS['yellow'],
+        text=f'{avance:.1f}%',
+        textposition='inside',
+        textfont=dict(color='#000000', size=14, family='Arial Black'),
+        hovertemplate=f'<b>{carrera_seleccionada}</b><br>Avance: {avance:.1f}%<extra></extra>'
+    )])
+    
+    fig.update_layout(
+        title=dict(text=f'<b>{carrera_seleccionada.upper()}</b>', font=dict(size=16, color=COLORS['accent'], family='Arial'), x=0.5),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(
+            title=dict(text='Porcentaje de Avance (%)', font=dict(size=12, color=COLORS['text_secondary'])),
+            tickfont=dict(size=10, color=COLORS['text_secondary']),
+            range=[0, 100], gridcolor=COLORS['border'], showgrid=True, gridwidth=1
+        ),
+        yaxis=dict(title='', tickfont=dict(size=12, color=COLORS['text']), automargin=True),
+        margin=dict(l=20, r=20, t=60, b=50),
+        height=150,
+        showlegend=False
+    )
+    
+    return fig
+
+def grafico_donut(avance):
+    """Crea gráfico donut."""
+    fig = go.Figure(data=[go.Pie(
+        labels=['Completado', 'Pendiente'],
+        values=[avance, 100 - avance],
+        hole=0.7,
+        marker=dict(colors=[COLORS['yellow'], COLORS['border']]),
+        textinfo='none',
+        hoverinfo='label+percent'
+    )])
+    
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)', showlegend=False,
+        margin=dict(l=10, r=10, t=10, b=10),
+        annotations=[dict(text=f'<b>{avance:.1f}%</b>', font=dict(size=24, color=COLORS['accent']), showarrow=False, x=0.5, y=0.5)]
+    )
+    return fig
+
+def grafico_ranking(vista, titulo='AVANCE POA POR CARRERA'):
+    """
+    Crea gráfico de barras horizontales de una vista del ranking (página o
+    mejores/peores), con la fila agregada "Otros" en gris.
+    """
+    if vista is None or vista.empty:
+        return None
+    
+    # El ranking viene de mayor a menor; Plotly dibuja la primera barra abajo
+    df = vista.iloc[::-1]
+    agregado = (df['cantidad'] > 1).to_numpy()
+    colores = np.where(agregado, COLORS['text_secondary'], COLORES_NIVEL[df['nivel'].to_numpy()]).tolist()
+    detalle = np.where(agregado, 'Promedio de ' + df['cantidad'].astype(str) + ' carreras<br>', '').tolist()
+    
+    fig = go.Figure(data=[go.Bar(
+        y=df['carrera'], x=df['avance_poa'], orientation='h',
+        marker_color=colores,
+        text=[f'{v:.1f}%' for v in df['avance_poa']],
+        textposition='inside',
+        textfont=dict(color='#000000', size=11, family='Arial Black'),
+        customdata=detalle,
+        hovertemplate='<b>%{y}</b><br>%{customdata}Avance: %{x:.1f}%<extra></extra>'
+    )])
+    
+    fig.update_layout(
+        title=dict(text=f'<b>{titulo}</b>', font=dict(size=16, color=COLORS['accent'], family='Arial'), x=0.5),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(
+            title=dict(text='Porcentaje de Avance (%)', font=dict(size=12, color=COLORS['text_secondary'])),
+            tickfont=dict(size=10, color=COLORS['text_secondary']),
+            range=[0, 100], gridcolor=COLORS['border'], showgrid=True, gridwidth=1
+        ),
+        yaxis=dict(title='', tickfont=dict(size=10, color=COLORS['text']), automargin=True,
+                   categoryorder='array', categoryarray=df['carrera'].tolist()),
+        margin=dict(l=20, r=20, t=60, b=50),
+        height=max(400, len(df) * 32),
+        showlegend=False
+    )
+    
+    return fig
+
+def grafico_semaforo(carreras, porcentajes, conteos, semaforos):
+    """
+    Crea mapa de calor carreras × color del semáforo con el porcentaje de
+    indicadores en cada color (la primera carrera queda arriba).
+    """
+    if len(carreras) == 0:
+        return None
+    
+    fig = go.Figure(data=[go.Heatmap(
+        z=porcentajes[::-1], x=semaforos, y=list(carreras[::-1]),
+        customdata=conteos[::-1],
+        colorscale=[[0, COLORS['card_bg']], [1, COLORS['accent']]], zmin=0, zmax=100,
+        texttemplate='%{z:.0f}%', textfont=dict(size=10, color=COLORS['text']),
+        hovertemplate='<b>%{y}</b><br>%{x}: %{customdata} indicadores (%{z:.1f}%)<extra></extra>',
+        xgap=2, ygap=2, showscale=False
+    )])
+    
+    fig.update_layout(
+        title=dict(text='<b>SEMÁFORO DE INDICADORES POR CARRERA</b>', font=dict(size=16, color=COLORS['accent'], family='Arial'), x=0.5),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(side='top', tickfont=dict(size=11, color=COLORS['text'])),
+        yaxis=dict(title='', tickfont=dict(size=10, color=COLORS['text']), automargin=True),
+        margin=dict(l=20, r=20, t=90, b=20),
+        height=max(300, len(carreras) * 28 + 110),
+    )
+    
+    return fig
+
+def grafico_comparacion_anios(comparacion, anio_actual, anio_anterior):
+    """Crea gráfico de barras agrupadas con el avance POA de dos años."""
+    if comparacion is None or comparacion.empty:
+        return None
+    
+    df = comparacion.sort_values('avance_actual', ascending=True)
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            y=df.index, x=df['avance_anterior'], orientation='h', name=str(anio_anterior),
+            marker_color=COLORS['text_secondary'],
+            hovertemplate=f'<b>%{{y}}</b><br>{anio_anterior}: %{{x:.1f}}%<extra></extra>'
+        ),
+        go.Bar(
+            y=df.index, x=df['avance_actual'], orientation='h', name=str(anio_actual),
+            marker_color=COLORS['yellow'],
+            hovertemplate=f'<b>%{{y}}</b><br>{anio_actual}: %{{x:.1f}}%<extra></extra>'
+        ),
+    ])
+    
+    fig.update_layout(
+        title=dict(text=f'<b>AVANCE POA {anio_anterior} vs {anio_actual}</b>', font=dict(size=16, color=COLORS['accent'], family='Arial'), x=0.5),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        barmode='group',
+        xaxis=dict(
+            title=dict(text='Porcentaje de Avance (%)', font=dict(size=12, color=COLORS['text_secondary'])),
+            tickfont=dict(size=10, color=COLORS['text_secondary']),
+            range=[0, 100], gridcolor=COLORS['border'], showgrid=True, gridwidth=1
+        ),
+        yaxis=dict(title='', tickfont=dict(size=10, color=COLORS['text']), automargin=True),
+        legend=dict(font=dict(color=COLORS['text']), orientation='h', x=0.5, xanchor='center', y=-0.1),
+        margin=dict(l=20, r=20, t=60, b=50),
+        height=max(400, len(df) * 50),
+    )
+    
+    return fig
+
+# =============================================================================
+# CACHÉ DE FIGURAS
+# =============================================================================
+MAX_FIGURAS = 256
+
+class CacheFiguras:
+    """
+    Caché LRU de figuras serializadas en JSON, compartida entre sesiones.
+    Las claves son (versión de datos, vista, carrera). Una versión deja de
+    figurar como precalentada cuando la LRU desaloja su última figura.
+    """
+
+    def __init__(self, max_entradas=MAX_FIGURAS):
+        self.max_entradas = max_entradas
+        self._figuras = OrderedDict()
+        self._lock = threading.Lock()
+        self._precalentadas = set()
+        self._por_version = Counter()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._figuras)
+
+    def obtener(self, clave, construir):
+        """
+        Devuelve la figura de la clave como diccionario (st.plotly_chart lo
+        acepta sin reconstruir go.Figure); si no está, la construye con
+        construir() y guarda su JSON.
+        """
+        with self._lock:
+            fig_json = self._figuras.get(clave)
+            if fig_json is not None:
+                self._figuras.move_to_end(clave)
+                self.aciertos += 1
+        if fig_json is None:
+            with METRICAS.tramo(f"grafico_{clave[1]}"):
+                fig = construir()
+                if fig is None:
+                    return None
+                fig_json = fig.to_json()
+            with self._lock:
+                self.fallos += 1
+                if clave not in self._figuras:
+                    self._por_version[clave[0]] += 1
+                self._figuras[clave] = fig_json
+                self._figuras.move_to_end(clave)
+                while len(self._figuras) > self.max_entradas:
+                    self._desalojar()
+        with METRICAS.tramo('figura_desde_json'):
+            return json.loads(fig_json)
+
+    def _desalojar(self):
+        """Quita la figura menos usada (con el lock tomado)."""
+        (version, _, _), _ = self._figuras.popitem(last=False)
+        self._por_version[version] -= 1
+        if not self._por_version[version]:
+            del self._por_version[version]
+            self._precalentadas.discard(version)
+
+    def figura_barras(self, version, carreras_data, carreras_list):
+        """Gráfico de barras de la vista general."""
+        return self.obtener((version, 'barras', None),
+                            lambda: grafico_barras(carreras_data, carreras_list))
+
+    def figura_barras_unica(self, version, carrera, avance):
+        """Gráfico de barras de una carrera."""
+        return self.obtener((version, 'barras_unica', carrera),
+                            lambda: grafico_barras_unica(carrera, avance))
+
+    def figura_donut(self, version, carrera, avance):
+        """Gráfico donut de una carrera (carrera=None para el avance general)."""
+        return self.obtener((version, 'donut', carrera),
+                            lambda: grafico_donut(avance))
+
+    def figura_ranking(self, version, clave_vista, vista, titulo='AVANCE POA POR CARRERA'):
+        """
+        Gráfico de una vista del ranking; clave_vista identifica la búsqueda,
+        los filtros, el modo y la página.
+        """
+        return self.obtener((version, 'ranking', clave_vista),
+                            lambda: grafico_ranking(vista, titulo))
+
+    def figura_semaforo(self, version, orden, cubo, limite):
+        """Mapa de calor del semáforo de indicadores, ordenado por un color."""
+        return self.obtener((version, 'semaforo', (orden, limite)),
+                            lambda: grafico_semaforo(*cubo.matriz(orden, limite), cubo.semaforos))
+
+    def figura_comparacion(self, version_actual, version_anterior, comparacion, anio_actual, anio_anterior):
+        """Gráfico de comparación del avance POA entre dos años."""
+        return self.obtener((f"{version_anterior}|{version_actual}", 'comparacion', None),
+                            lambda: grafico_comparacion_anios(comparacion, anio_actual, anio_anterior))
+
+    def precalentar(self, version, carreras_data, carreras_list, avance_general, vista_inicial=None):
+        """
+        Construye la vista general y las figuras de las carreras de una
+        versión de datos. Solo se ejecuta una vez por versión.
+        vista_inicial=(clave_vista, vista) precalienta el ranking en lugar del
+        gráfico con todas las carreras. Se precalientan las carreras, en
+        orden, que quepan en la caché junto a las dos figuras generales.
+        """
+        with self._lock:
+            if version in self._precalentadas:
+                return
+            self._precalentadas.add(version)
+        if vista_inicial is None:
+            self.figura_barras(version, carreras_data, carreras_list)
+        else:
+            self.figura_ranking(version, *vista_inicial)
+        self.figura_donut(version, None, avance_general)
+        for carrera in carreras_list[:(self.max_entradas - 2) // 2]:
+            if carrera in carreras_data:
+                avance = carreras_data[carrera]['avance_poa']
+                self.figura_barras_unica(version, carrera, avance)
+                self.figura_donut(version, carrera, avance)
+
+    def precalentar_en_segundo_plano(self, *args):
+        """Ejecuta precalentar() en un hilo para no bloquear la sesión actual."""
+        if args[0] in self._precalentadas:
+            return None
+        hilo = threading.Thread(target=self.precalentar, args=args, daemon=True)
+        hilo.start()
+        return hilo
@@ -0,0 +1,154 @@
+"""
+Semáforo de indicadores por carrera
+===================================
+
+Lee la hoja indicadores_carreras (conteo de indicadores por carrera en
+VERDE, AMARILLO, NARANJA y ROJO) y la guarda como Parquet junto al
+workbook, indexada por su hash. A partir de ella se construye, en una
+sola pasada vectorizada y una vez por versión de datos, un cubo
+carreras × semáforo con conteos y porcentajes. Cambiar de carrera u
+ordenar el mapa de calor es solo indexar los arreglos del cubo.
+"""
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from actividades_poa import clave_carrera
+from consolidacion_poa import COLUMNA_CARRERA_FUENTE, ubicaciones
+from datos_poa import escribir_atomico, hash_archivo, ruta_cache
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+HOJA_INDICADORES = 'indicadores_carreras'
+VERSION_INDICADORES = 1
+
+# Columnas A:E de la hoja, en orden
+COLUMNAS_INDICADORES = ['año', 'Carrera', 'INDICADORES', 'N° IND', '%']
+SEMAFOROS = ['VERDE', 'AMARILLO', 'NARANJA', 'ROJO']
+# Filas como máximo en el mapa de calor
+MAX_FILAS_MAPA = 40
+
+# =============================================================================
+# LECTURA DE LA HOJA
+# =============================================================================
+def _leer_hoja(file_path):
+    """Recorre la hoja en modo streaming; devuelve un DataFrame vacío si no existe."""
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if HOJA_INDICADORES not in wb.sheetnames:
+            return pd.DataFrame(columns=COLUMNAS_INDICADORES)
+        filas = wb[HOJA_INDICADORES].iter_rows(min_row=2, max_col=len(COLUMNAS_INDICADORES), values_only=True)
+        df = pd.DataFrame([f for f in filas if f[1] is not None], columns=COLUMNAS_INDICADORES)
+    finally:
+        wb.close()
+    df['año'] = pd.to_numeric(df['año'], errors='coerce')
+    df['Carrera'] = df['Carrera'].astype(str).str.strip()
+    df['INDICADORES'] = df['INDICADORES'].astype(str).str.strip().str.upper()
+    df['N° IND'] = pd.to_numeric(df['N° IND'], errors='coerce').fillna(0)
+    df['%'] = pd.to_numeric(df['%'], errors='coerce')
+    return df
+
+def leer_indicadores(file_path, file_hash=None):
+    """
+    Devuelve la hoja indicadores_carreras del workbook, desde su Parquet si
+    corresponde al hash; si no, la lee del Excel y guarda el Parquet.
+    """
+    file_hash = file_hash or hash_archivo(file_path)
+    ruta = ruta_cache(file_path, file_hash, f"indicadores.v{VERSION_INDICADORES}.parquet")
+    try:
+        return pd.read_parquet(ruta)
+    except (OSError, ValueError):
+        pass
+    df = _leer_hoja(file_path)
+    try:
+        escribir_atomico(ruta, lambda p: df.to_parquet(p, index=False))
+    except OSError:
+        pass
+    return df
+
+# =============================================================================
+# CUBO CARRERAS × SEMÁFORO
+# =============================================================================
+class CuboIndicadores:
+    """
+    Conteos y porcentajes de indicadores por carrera (filas, en el orden de
+    carreras_list) y color del semáforo (columnas, en el orden de SEMAFOROS).
+    Los órdenes por cada color se precalculan al construirlo.
+    """
+
+    def __init__(self, df_indicadores, carreras_list, anio=None, version=None):
+        self.version = version
+        self.semaforos = list(SEMAFOROS)
+        self.carreras = np.asarray(carreras_list, dtype=object)
+        self._posicion = {c: i for i, c in enumerate(carreras_list)}
+
+        df = df_indicadores
+        if anio is not None and len(df):
+            df = df[df['año'] == anio]
+        filas = pd.Categorical(df['carrera'], categories=carreras_list).codes
+        columnas = pd.Categorical(df['INDICADORES'], categories=self.semaforos).codes
+        validas = (filas >= 0) & (columnas >= 0)
+
+        self.conteos = np.zeros((len(carreras_list), len(self.semaforos)), dtype=np.int64)
+        np.add.at(self.conteos, (filas[validas], columnas[validas]),
+                  df['N° IND'].to_numpy(dtype=float)[validas].astype(np.int64))
+        self.totales = self.conteos.sum(axis=1)
+        self.porcentajes = np.divide(self.conteos, self.totales[:, None],
+                                     out=np.zeros(self.conteos.shape), where=self.totales[:, None] > 0)
+
+        # Solo las carreras con indicadores; órdenes descendentes por cada color
+        self.con_datos = np.flatnonzero(self.totales > 0)
+        self._ordenes = {
+            semaforo: self.con_datos[np.argsort(-self.porcentajes[self.con_datos, j], kind='stable')]
+            for j, semaforo in enumerate(self.semaforos)
+        }
+
+    def __len__(self):
+        return len(self.con_datos)
+
+    def tiene_carrera(self, carrera):
+        """True si la carrera tiene indicadores registrados."""
+        posicion = self._posicion.get(carrera)
+        return posicion is not None and self.totales[posicion] > 0
+
+    def total(self, carrera):
+        """Número total de indicadores de una carrera."""
+        posicion = self._posicion.get(carrera)
+        return int(self.totales[posicion]) if posicion is not None else 0
+
+    def desglose(self, carrera):
+        """Lista de {semaforo, conteo, porcentaje} de una carrera (vacía si no tiene)."""
+        if not self.tiene_carrera(carrera):
+            return []
+        posicion = self._posicion[carrera]
+        return [{'semaforo': semaforo, 'conteo': int(self.conteos[posicion, j]),
+                 'porcentaje': float(self.porcentajes[posicion, j]) * 100}
+                for j, semaforo in enumerate(self.semaforos)]
+
+    def matriz(self, orden=None, limite=None):
+        """
+        (carreras, porcentajes, conteos) de las carreras con indicadores,
+        ordenadas de mayor a menor por el color indicado (o en el orden de
+        carreras_list) y recortadas a limite filas.
+        """
+        posiciones = self._ordenes[orden] if orden in self._ordenes else self.con_datos
+        posiciones = posiciones[:limite]
+        return self.carreras[posiciones], self.porcentajes[posiciones] * 100, self.conteos[posiciones]
+
+def construir_cubo(carreras_data, carreras_list, ruta_por_defecto, anio=None, version=None):
+    """
+    Cubo de indicadores de las carreras, leyendo la hoja de cada workbook
+    (uno solo, o el de cada sede si los datos están consolidados).
+    """
+    ubicacion = ubicaciones(carreras_data, carreras_list, ruta_por_defecto)
+    partes = []
+    for archivo, grupo in ubicacion.groupby('archivo', sort=False):
+        df = leer_indicadores(archivo)
+        # Nombre en el workbook → nombre mostrado en el dashboard
+        nombres = dict(zip(grupo[COLUMNA_CARRERA_FUENTE].map(clave_carrera), grupo.index))
+        partes.append(df.assign(carrera=df['Carrera'].map(clave_carrera).map(nombres)))
+    df_indicadores = (pd.concat(partes, ignore_index=True) if partes
+                      else pd.DataFrame(columns=COLUMNAS_INDICADORES + ['carrera']))
+    return CuboIndicadores(df_indicadores, list(ubicacion.index), anio, version)
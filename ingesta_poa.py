@@ -0,0 +1,379 @@
+"""
+Ingesta incremental y recarga en caliente
+=========================================
+
+Un xlsx es un zip: cada hoja (xl/worksheets/sheetN.xml) es una entrada
+propia, que se puede comparar sin abrir el workbook con openpyxl.
+Cada archivo de caché derivado del workbook depende solo de algunas hojas:
+
+    resumen      → resumen_carreras, Resumen y la lista de hojas
+    actividades  → actividades_carreras
+    indicadores  → indicadores_carreras
+    busqueda     → las hojas de resumen y de actividades
+
+Excel guarda los textos de todas las hojas en xl/sharedStrings.xml y las
+celdas solo apuntan a su índice, así que editar un texto de cualquier hoja
+cambia esa entrada (y puede renumerar los índices de las demás). Por eso
+el CRC de cada hoja se calcula sobre su XML con los índices reemplazados
+por los textos: editar una hoja de carrera no cambia el de ninguna otra.
+
+Un catálogo SQLite en .poa_cache guarda los CRC de cada versión del
+workbook. Cuando el archivo cambia, los derivados cuyas hojas no
+cambiaron se trasladan de la versión anterior a la nueva y solo se
+vuelven a parsear los demás.
+
+VigilanteWorkbooks sondea en segundo plano los workbooks registrados,
+reingiere los que cambiaron (cuando dejan de cambiar) y aumenta su número
+de revisión, con el que el dashboard invalida sus cachés sin reiniciar.
+
+Uso por línea de comandos:
+    python ingesta_poa.py [--archivo ARCHIVO]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import zipfile
+import zlib
+from contextlib import closing
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from actividades_poa import HOJA_ACTIVIDADES, LectorActividades
+from busqueda_poa import leer_indice_busqueda, ruta_indice_busqueda
+from datos_poa import (ARCHIVO_EXCEL, DIRECTORIO_CACHE, HOJA_METADATOS, construir_snapshot,
+                       escribir_atomico, hash_archivo, limpiar_cache, ruta_cache, rutas_snapshot)
+from indicadores_poa import HOJA_INDICADORES, VERSION_INDICADORES, leer_indicadores
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+ARCHIVO_CATALOGO = 'ingesta.sqlite'
+INTERVALO_VIGILANCIA = float(os.environ.get('POA_INTERVALO_RECARGA', '5'))
+
+# Entradas del zip que no son hojas
+ENTRADA_LISTA_HOJAS = '#hojas'
+ENTRADA_TEXTOS = 'xl/sharedStrings.xml'
+
+# Derivados del workbook → hojas de las que dependen
+DEPENDENCIAS = {
+    'resumen': ['resumen_carreras', HOJA_METADATOS, ENTRADA_LISTA_HOJAS],
+    'actividades': [HOJA_ACTIVIDADES],
+    'indicadores': [HOJA_INDICADORES],
+    # Se construye al final: lee el snapshot y el Parquet de actividades
+    'busqueda': ['resumen_carreras', HOJA_METADATOS, ENTRADA_LISTA_HOJAS, HOJA_ACTIVIDADES],
+}
+
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_CELDA_TEXTO = re.compile(rb'(<c\b[^>]*\bt="s"[^>]*>\s*<v>)(\d+)(</v>)')
+
+# =============================================================================
+# CRC POR HOJA
+# =============================================================================
+def _textos_compartidos(zf):
+    """Textos de sharedStrings.xml, en el orden de sus índices."""
+    if ENTRADA_TEXTOS not in zf.namelist():
+        return []
+    raiz = ElementTree.fromstring(zf.read(ENTRADA_TEXTOS))
+    return [''.join(t.text or '' for t in si.iter(f'{_NS_MAIN}t')) for si in raiz.iter(f'{_NS_MAIN}si')]
+
+def _crc_resuelto(datos, textos):
+    """CRC del XML de una hoja con los índices de sharedStrings reemplazados por sus textos."""
+    return zlib.crc32(_CELDA_TEXTO.sub(
+        lambda m: m[1] + escape(textos[int(m[2])]).encode('utf-8') + m[3], datos))
+
+def crc_hojas(file_path):
+    """
+    Devuelve {hoja: crc} con el CRC de cada hoja (con los textos de
+    sharedStrings resueltos) y uno calculado sobre la lista de nombres de
+    hojas.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        libro = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+        relaciones = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+        destinos = {r.get('Id'): r.get('Target') for r in relaciones.iter(f'{_NS_PKG}Relationship')}
+        entradas = set(zf.namelist())
+        textos = _textos_compartidos(zf)
+
+        crcs = {}
+        nombres = []
+        for hoja in libro.iter(f'{_NS_MAIN}sheet'):
+            nombre = hoja.get('name')
+            destino = destinos.get(hoja.get(f'{_NS_REL}id'), '')
+            entrada = destino.lstrip('/') if destino.startswith('/') else f"xl/{destino}"
+            nombres.append(nombre)
+            crcs[nombre] = _crc_resuelto(zf.read(entrada), textos) if entrada in entradas else None
+        crcs[ENTRADA_LISTA_HOJAS] = zlib.crc32('\n'.join(nombres).encode('utf-8'))
+    return crcs
+
+def hojas_cambiadas(crcs, crcs_previos):
+    """Hojas (y entradas) cuyo CRC cambió, apareció o desapareció."""
+    return sorted(h for h in set(crcs) | set(crcs_previos) if crcs.get(h) != crcs_previos.get(h))
+
+# =============================================================================
+# CATÁLOGO SQLITE
+# =============================================================================
+class CatalogoIngesta:
+    """
+    Catálogo persistente de las versiones ingeridas de los workbooks de un
+    directorio: CRC de cada hoja por (archivo, hash).
+    """
+
+    def __init__(self, file_path):
+        directorio = os.path.join(os.path.dirname(os.path.abspath(file_path)), DIRECTORIO_CACHE)
+        os.makedirs(directorio, exist_ok=True)
+        self.ruta = os.path.join(directorio, ARCHIVO_CATALOGO)
+        with closing(self._conectar()) as conexion, conexion:
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS hojas ("
+                " archivo TEXT, hash TEXT, hoja TEXT, crc INTEGER,"
+                " PRIMARY KEY (archivo, hash, hoja))")
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS versiones ("
+                " archivo TEXT, hash TEXT, ingerido REAL,"
+                " PRIMARY KEY (archivo, hash))")
+
+    def _conectar(self):
+        return sqlite3.connect(self.ruta, timeout=30)
+
+    def registrar(self, archivo, file_hash, crcs):
+        """Guarda los CRC de una versión del workbook."""
+        with closing(self._conectar()) as conexion, conexion:
+            conexion.execute("DELETE FROM hojas WHERE archivo = ? AND hash = ?", (archivo, file_hash))
+            conexion.executemany("INSERT INTO hojas VALUES (?, ?, ?, ?)",
+                                 [(archivo, file_hash, hoja, crc) for hoja, crc in crcs.items()])
+            conexion.execute("INSERT OR REPLACE INTO versiones VALUES (?, ?, ?)",
+                             (archivo, file_hash, time.time()))
+
+    def crcs(self, archivo, file_hash):
+        """CRC de una versión registrada, o None si no está."""
+        with closing(self._conectar()) as conexion:
+            filas = conexion.execute("SELECT hoja, crc FROM hojas WHERE archivo = ? AND hash = ?",
+                                     (archivo, file_hash)).fetchall()
+        return dict(filas) if filas else None
+
+    def anteriores(self, archivo, file_hash):
+        """Hashes de otras versiones del workbook, de la más reciente a la más antigua."""
+        with closing(self._conectar()) as conexion:
+            filas = conexion.execute(
+                "SELECT hash FROM versiones WHERE archivo = ? AND hash != ? ORDER BY ingerido DESC",
+                (archivo, file_hash)).fetchall()
+        return [fila[0] for fila in filas]
+
+    def olvidar(self, archivo, conservar):
+        """Elimina las versiones del workbook que no están en conservar."""
+        with closing(self._conectar()) as conexion, conexion:
+            for tabla in ('hojas', 'versiones'):
+                conexion.execute(
+                    f"DELETE FROM {tabla} WHERE archivo = ? AND hash NOT IN ({','.join('?' * len(conservar))})",
+                    (archivo, *conservar))
+
+# =============================================================================
+# DERIVADOS POR VERSIÓN
+# =============================================================================
+def archivos_derivado(file_path, file_hash, derivado):
+    """Archivos de caché de un derivado para una versión del workbook."""
+    if derivado == 'resumen':
+        return list(rutas_snapshot(file_path, file_hash))
+    if derivado == 'actividades':
+        return [ruta_cache(file_path, file_hash, "actividades.parquet"),
+                ruta_cache(file_path, file_hash, "actividades.json")]
+    if derivado == 'busqueda':
+        return [ruta_indice_busqueda(file_path, file_hash)]
+    return [ruta_cache(file_path, file_hash, f"indicadores.v{VERSION_INDICADORES}.parquet")]
+
+def _construir(file_path, file_hash, derivado):
+    """Parsea del Excel las hojas de un derivado y escribe su caché."""
+    if derivado == 'resumen':
+        construir_snapshot(file_path, file_hash)
+    elif derivado == 'actividades':
+        LectorActividades(file_path, file_hash)
+    elif derivado == 'busqueda':
+        leer_indice_busqueda(file_path, file_hash)
+    else:
+        leer_indicadores(file_path, file_hash)
+
+def _trasladar(file_path, hash_anterior, file_hash, derivado):
+    """Copia la caché de un derivado de la versión anterior a la nueva."""
+    for origen, destino in zip(archivos_derivado(file_path, hash_anterior, derivado),
+                               archivos_derivado(file_path, file_hash, derivado)):
+        if destino.endswith('.json'):
+            # Los manifiestos registran el hash de su versión
+            with open(origen, encoding="utf-8") as f:
+                manifiesto = json.load(f)
+            manifiesto['hash'] = file_hash
+
+            def escribir(p, manifiesto=manifiesto):
+                with open(p, "w", encoding="utf-8") as f:
+                    json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+            escribir_atomico(destino, escribir)
+        else:
+            escribir_atomico(destino, lambda p, origen=origen: shutil.copyfile(origen, p))
+
+def ingerir(file_path, file_hash=None):
+    """
+    Deja al día la caché del workbook reutilizando de la versión anterior
+    los derivados cuyas hojas no cambiaron. Devuelve un resumen con los
+    derivados vigentes, trasladados y reconstruidos, y las hojas cambiadas.
+    """
+    file_hash = file_hash or hash_archivo(file_path)
+    archivo = os.path.basename(file_path)
+    crcs = crc_hojas(file_path)
+    catalogo = CatalogoIngesta(file_path)
+
+    # Versión anterior más reciente cuyos archivos de caché siguen en disco
+    hash_anterior, crcs_previos = None, {}
+    for candidato in catalogo.anteriores(archivo, file_hash):
+        previos = catalogo.crcs(archivo, candidato)
+        if previos is not None:
+            hash_anterior, crcs_previos = candidato, previos
+            break
+
+    resultado = {'hash': file_hash, 'anterior': hash_anterior, 'vigentes': [], 'trasladados': [],
+                 'reconstruidos': [], 'hojas_cambiadas': hojas_cambiadas(crcs, crcs_previos)}
+    por_construir = []
+    for derivado, hojas in DEPENDENCIAS.items():
+        if all(os.path.exists(r) for r in archivos_derivado(file_path, file_hash, derivado)):
+            resultado['vigentes'].append(derivado)
+        elif (hash_anterior is not None
+              and all(crcs.get(h) == crcs_previos.get(h) for h in hojas)
+              and all(os.path.exists(r) for r in archivos_derivado(file_path, hash_anterior, derivado))):
+            _trasladar(file_path, hash_anterior, file_hash, derivado)
+            resultado['trasladados'].append(derivado)
+        else:
+            por_construir.append(derivado)
+
+    # Se construye después de trasladar: construir el resumen limpia las versiones anteriores
+    for derivado in por_construir:
+        _construir(file_path, file_hash, derivado)
+        resultado['reconstruidos'].append(derivado)
+
+    catalogo.registrar(archivo, file_hash, crcs)
+    catalogo.olvidar(archivo, [file_hash])
+    limpiar_cache(file_path, file_hash)
+    return resultado
+
+def registrar_version(file_path, file_hash=None):
+    """Registra en el catálogo los CRC de la versión actual sin construir nada."""
+    file_hash = file_hash or hash_archivo(file_path)
+    archivo = os.path.basename(file_path)
+    catalogo = CatalogoIngesta(file_path)
+    if catalogo.crcs(archivo, file_hash) is None:
+        catalogo.registrar(archivo, file_hash, crc_hojas(file_path))
+    return file_hash
+
+# =============================================================================
+# VIGILANCIA EN SEGUNDO PLANO
+# =============================================================================
+def _firma(archivos):
+    """Firma barata de un grupo de archivos: ruta, fecha de modificación y tamaño."""
+    firma = []
+    for ruta in sorted(archivos):
+        try:
+            estado = os.stat(ruta)
+            firma.append((ruta, estado.st_mtime_ns, estado.st_size))
+        except OSError:
+            firma.append((ruta, None, None))
+    return tuple(firma)
+
+class VigilanteWorkbooks:
+    """
+    Sondea los workbooks de cada clave (por ejemplo, cada año) y, cuando
+    cambian y dejan de cambiar entre dos sondeos, los reingiere y aumenta la
+    revisión de la clave. al_cambiar(clave) se llama antes de publicarla.
+    """
+
+    def __init__(self, obtener_archivos, intervalo=INTERVALO_VIGILANCIA, al_cambiar=None):
+        self.obtener_archivos = obtener_archivos
+        self.intervalo = intervalo
+        self.al_cambiar = al_cambiar
+        self._revisiones = {}
+        self._firmas = {}
+        self._pendientes = {}
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    def revision(self, clave):
+        """Número de revisión de los datos de la clave (0 hasta el primer cambio)."""
+        return self._revisiones.get(clave, 0)
+
+    def sondear(self):
+        """Revisa una vez todos los workbooks; devuelve las claves que se recargaron."""
+        recargadas = []
+        for clave, archivos in self.obtener_archivos().items():
+            firma = _firma(archivos)
+            anterior = self._firmas.get(clave)
+            if anterior is None:
+                # Primer sondeo: solo se registran los CRC de la versión actual
+                self._firmas[clave] = firma
+                for ruta in archivos:
+                    try:
+                        registrar_version(ruta)
+                    except (OSError, zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+                        pass
+                continue
+            if firma == anterior:
+                self._pendientes.pop(clave, None)
+                continue
+            if self._pendientes.get(clave) != firma:
+                # Se espera a que el archivo deje de cambiar (copia o guardado en curso)
+                self._pendientes[clave] = firma
+                continue
+
+            modificados = [entrada[0] for entrada in firma if entrada not in anterior]
+            try:
+                for ruta in modificados:
+                    if os.path.exists(ruta):
+                        ingerir(ruta)
+            except (OSError, zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+                continue
+            self._firmas[clave] = firma
+            self._pendientes.pop(clave, None)
+            if self.al_cambiar is not None:
+                self.al_cambiar(clave)
+            with self._lock:
+                self._revisiones[clave] = self.revision(clave) + 1
+            recargadas.append(clave)
+        return recargadas
+
+    def _bucle(self):
+        while True:
+            try:
+                self.sondear()
+            except Exception:
+                # El vigilante no debe detenerse por un workbook ilegible
+                pass
+            time.sleep(self.intervalo)
+
+    def iniciar(self):
+        """Inicia el sondeo en un hilo en segundo plano (una sola vez)."""
+        with self._lock:
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._bucle, name='vigilante-poa', daemon=True)
+                self._hilo.start()
+        return self._hilo
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Ingesta incremental del workbook POA.")
+    parser.add_argument('--archivo', default=ARCHIVO_EXCEL)
+    args = parser.parse_args(argv)
+
+    resultado = ingerir(args.archivo)
+    for clave in ('hojas_cambiadas', 'vigentes', 'trasladados', 'reconstruidos'):
+        print(f"{clave}: {', '.join(resultado[clave]) or '-'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Indicadores agregados del Dashboard POA Carreras
+================================================
+
+Resumen de KPIs calculado una sola vez por versión de datos a partir de la
+tabla de carreras, para que la vista general solo lea valores ya calculados.
+"""
+
+import numpy as np
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+# Umbrales de avance POA (%): bajo < medio <= ... < alto
+UMBRALES_AVANCE = (60, 80)
+PERCENTILES = (25, 50, 75)
+
+ENTREGADO = 'ENTREGADO'
+COLUMNAS_ENTREGABLES = ['poa', 'informe_semestral', 'matriz_semestral', 'informe_final', 'matriz_final']
+
+# =============================================================================
+# RESUMEN DE KPIs
+# =============================================================================
+def validar_umbrales(umbrales):
+    """
+    Devuelve los umbrales (medio, alto) como tupla. Los niveles son siempre
+    bajo, medio y alto: se necesitan exactamente dos umbrales crecientes.
+    """
+    umbrales = tuple(umbrales)
+    if len(umbrales) != 2 or not umbrales[0] < umbrales[1]:
+        raise ValueError(f"Los umbrales de avance deben ser (medio, alto) con medio < alto, no {umbrales!r}")
+    return umbrales
+
+def nivel_avance(avances, umbrales=UMBRALES_AVANCE):
+    """Clasifica avances en niveles 0 (bajo), 1 (medio) y 2 (alto)."""
+    return np.searchsorted(np.asarray(umbrales, dtype=float), np.asarray(avances, dtype=float), side='right')
+
+class ResumenKPI:
+    """
+    KPIs de la vista general: totales, entregables por estado y
+    distribución del avance POA.
+    """
+
+    def __init__(self, tabla, carreras_list, umbrales=UMBRALES_AVANCE, version=None):
+        df = tabla.loc[tabla.index.intersection(carreras_list)]
+        avances = df['avance_poa'].to_numpy(dtype=float)
+
+        self.version = version
+        self.umbrales = validar_umbrales(umbrales)
+        self.total_carreras = len(df)
+        self.avance_promedio = float(avances.mean()) if len(avances) else 0.0
+        self.percentiles = (
+            dict(zip(PERCENTILES, np.percentile(avances, PERCENTILES).tolist())) if len(avances) else {}
+        )
+
+        # Conteo de estados por entregable (POA, informes, matrices, finales)
+        self.estados = {
+            columna: df[columna].fillna('N/A').astype(str).str.strip().value_counts().to_dict()
+            for columna in COLUMNAS_ENTREGABLES if columna in df.columns
+        }
+        self.entregados = {columna: conteo.get(ENTREGADO, 0) for columna, conteo in self.estados.items()}
+
+        # Histograma por niveles de avance
+        conteo_niveles = np.bincount(nivel_avance(avances, self.umbrales), minlength=3)
+        self.bajo, self.medio, self.alto = (int(n) for n in conteo_niveles)
+
+    def etiquetas_niveles(self):
+        """Etiquetas de los niveles alto, medio y bajo según los umbrales."""
+        medio, alto = self.umbrales
+        return {
+            'alto': f"Alto (>{alto}%)",
+            'medio': f"Medio ({medio}-{alto - 1}%)",
+            'bajo': f"Bajo (<{medio}%)",
+        }
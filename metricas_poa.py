@@ -0,0 +1,249 @@
+"""
+Métricas de rendimiento del Dashboard POA Carreras
+==================================================
+
+Mide cada ejecución del script: tramos de tiempo por fase (carga de datos,
+gráficos, bloques de columnas), aciertos y fallos de las funciones
+cacheadas y tamaño de los mensajes enviados al navegador. Cada
+ejecución se escribe como una línea JSON en un archivo rotativo para
+agregarlas fuera de línea, y las últimas se conservan en memoria para el
+panel de administración.
+
+Se activa con POA_METRICAS=1; POA_PANEL_METRICAS=1 activa además el panel
+en la barra lateral. Desactivadas, tramo() devuelve un contexto vacío
+compartido y cacheada() deja la función sin envolver.
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+import pandas as pd
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+DIRECTORIO_BASE = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_METRICAS = os.path.join(DIRECTORIO_BASE, 'metricas')
+ARCHIVO_METRICAS = 'metricas_poa.jsonl'
+MAX_BYTES_METRICAS = 5 * 2**20
+COPIAS_METRICAS = 5
+# Ejecuciones recientes que se conservan para el panel
+EJECUCIONES_EN_PANEL = 50
+
+PANEL_METRICAS = os.environ.get('POA_PANEL_METRICAS', '0') == '1'
+METRICAS_ACTIVAS = os.environ.get('POA_METRICAS', '0') == '1' or PANEL_METRICAS
+
+_SIN_MEDICION = contextlib.nullcontext()
+
+# =============================================================================
+# REGISTRO DE MÉTRICAS
+# =============================================================================
+class _Tramo:
+    """Contexto que suma la duración de un tramo a la ejecución en curso."""
+
+    __slots__ = ('ejecucion', 'nombre', 'inicio')
+
+    def __init__(self, ejecucion, nombre):
+        self.ejecucion = ejecucion
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duracion = (time.perf_counter() - self.inicio) * 1000
+        tramo = self.ejecucion['tramos'].setdefault(self.nombre, {'ms': 0.0, 'veces': 0})
+        tramo['ms'] += duracion
+        tramo['veces'] += 1
+        return False
+
+class RegistroMetricas:
+    """
+    Métricas por ejecución del script. La ejecución en curso se guarda por
+    hilo (Streamlit ejecuta cada sesión en su propio hilo), de modo que las
+    mediciones de hilos en segundo plano no se mezclan con las de la sesión.
+    """
+
+    def __init__(self, activo=METRICAS_ACTIVAS, directorio=DIRECTORIO_METRICAS,
+                 max_bytes=MAX_BYTES_METRICAS, copias=COPIAS_METRICAS,
+                 max_ejecuciones=EJECUCIONES_EN_PANEL):
+        self.activo = activo
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.copias = copias
+        self._local = threading.local()
+        self._ejecuciones = deque(maxlen=max_ejecuciones)
+        self._lock = threading.Lock()
+        self._logger = None
+
+    def _actual(self):
+        """Ejecución en curso del hilo actual, o None."""
+        return getattr(self._local, 'ejecucion', None)
+
+    def iniciar_ejecucion(self, **contexto):
+        """Comienza a medir una ejecución del script (año, vista, etc. en contexto)."""
+        if not self.activo:
+            return
+        self._local.ejecucion = {
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'inicio': time.perf_counter(),
+            'tramos': {},
+            'cache': {},
+            'payload_bytes': 0,
+            'mensajes': 0,
+            **contexto,
+        }
+        self._interceptar_mensajes()
+
+    @contextlib.contextmanager
+    def ejecucion_parcial(self, nombre):
+        """
+        Mide como una ejecución propia la ejecución aislada de un fragmento
+        (st.fragment). Dentro de una ejecución completa no hace nada.
+        """
+        if not self.activo or self._actual() is not None:
+            yield
+            return
+        self.iniciar_ejecucion(fragmento=nombre)
+        try:
+            yield
+        finally:
+            self.finalizar_ejecucion()
+
+    def anotar(self, **contexto):
+        """Agrega datos de contexto a la ejecución en curso."""
+        ejecucion = self._actual()
+        if ejecucion is not None:
+            ejecucion.update(contexto)
+
+    def tramo(self, nombre):
+        """Contexto que mide la duración de un tramo de la ejecución en curso."""
+        if not self.activo:
+            return _SIN_MEDICION
+        ejecucion = self._actual()
+        if ejecucion is None:
+            return _SIN_MEDICION
+        return _Tramo(ejecucion, nombre)
+
+    def _contador_cache(self, nombre):
+        """Contadores de llamadas y fallos de una función cacheada."""
+        return self._actual()['cache'].setdefault(nombre, {'llamadas': 0, 'fallos': 0})
+
+    def cacheada(self, nombre):
+        """
+        Decorador para una función cacheada (st.cache_data, st.cache_resource
+        o el almacén de años): mide cada llamada y cuenta las llamadas. El
+        cuerpo de la función debe llamar a fallo_cache(nombre) solo cuando
+        no hay acierto.
+        """
+        def decorador(funcion):
+            if not self.activo:
+                return funcion
+
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                if self._actual() is None:
+                    return funcion(*args, **kwargs)
+                self._contador_cache(nombre)['llamadas'] += 1
+                with self.tramo(nombre):
+                    return funcion(*args, **kwargs)
+            return envoltura
+        return decorador
+
+    def fallo_cache(self, nombre):
+        """Registra que la función cacheada se ejecutó (fallo de caché)."""
+        if self.activo and self._actual() is not None:
+            self._contador_cache(nombre)['fallos'] += 1
+
+    def _interceptar_mensajes(self):
+        """
+        Suma el tamaño de cada mensaje que el script envía al navegador.
+        Si la versión de Streamlit no lo permite, el tamaño queda en cero.
+        """
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+            ctx = get_script_run_ctx(suppress_warning=True)
+            if ctx is None or getattr(ctx._enqueue, 'metricas_poa', False):
+                return
+            enviar = ctx._enqueue
+        except (ImportError, AttributeError):
+            return
+
+        def enviar_medido(mensaje):
+            ejecucion = self._actual()
+            if ejecucion is not None:
+                ejecucion['payload_bytes'] += mensaje.ByteSize()
+                ejecucion['mensajes'] += 1
+            enviar(mensaje)
+
+        enviar_medido.metricas_poa = True
+        ctx._enqueue = enviar_medido
+
+    def finalizar_ejecucion(self):
+        """Cierra la ejecución en curso, la guarda en memoria y en el archivo."""
+        ejecucion = self._actual()
+        if ejecucion is None:
+            return None
+        self._local.ejecucion = None
+        ejecucion['total_ms'] = (time.perf_counter() - ejecucion.pop('inicio')) * 1000
+        for contador in ejecucion['cache'].values():
+            contador['aciertos'] = contador['llamadas'] - contador['fallos']
+        with self._lock:
+            self._ejecuciones.append(ejecucion)
+        self._escribir(ejecucion)
+        return ejecucion
+
+    def _escribir(self, ejecucion):
+        """Escribe la ejecución como una línea JSON en el archivo rotativo."""
+        try:
+            if self._logger is None:
+                os.makedirs(self.directorio, exist_ok=True)
+                manejador = RotatingFileHandler(os.path.join(self.directorio, ARCHIVO_METRICAS),
+                                                maxBytes=self.max_bytes, backupCount=self.copias,
+                                                encoding="utf-8")
+                manejador.setFormatter(logging.Formatter('%(message)s'))
+                logger = logging.getLogger('metricas_poa')
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.addHandler(manejador)
+                self._logger = logger
+            self._logger.info(json.dumps(ejecucion, ensure_ascii=False, default=str))
+        except OSError:
+            pass
+
+    def ejecuciones(self):
+        """Ejecuciones recientes, de la más antigua a la más nueva."""
+        with self._lock:
+            return list(self._ejecuciones)
+
+    def resumen_tramos(self):
+        """
+        Tabla por tramo de las ejecuciones recientes: veces medido, mediana,
+        máximo y total en milisegundos.
+        """
+        duraciones = {}
+        for ejecucion in self.ejecuciones():
+            for nombre, tramo in ejecucion['tramos'].items():
+                duraciones.setdefault(nombre, []).append(tramo['ms'])
+        filas = [{
+            'tramo': nombre,
+            'ejecuciones': len(valores),
+            'mediana_ms': statistics.median(valores),
+            'max_ms': max(valores),
+            'total_ms': sum(valores),
+        } for nombre, valores in duraciones.items()]
+        if not filas:
+            return pd.DataFrame(columns=['tramo', 'ejecuciones', 'mediana_ms', 'max_ms', 'total_ms'])
+        return pd.DataFrame(filas).sort_values('total_ms', ascending=False, ignore_index=True)
+
+# Registro compartido por el dashboard y los módulos de gráficos
+METRICAS = RegistroMetricas()
@@ -0,0 +1,125 @@
+"""
+Ranking de carreras del Dashboard POA Carreras
+==============================================
+
+Índice de carreras preordenado por avance POA, calculado una sola vez por
+versión de datos, con búsqueda y filtros por nivel de avance y director.
+Las vistas (páginas o mejores/peores con el resto agrupado en "Otros")
+tienen un número acotado de barras, sin importar cuántas carreras haya.
+"""
+
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from kpis_poa import UMBRALES_AVANCE, nivel_avance, validar_umbrales
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+# A partir de este número de carreras la vista general usa el ranking
+UMBRAL_INSTITUCION_GRANDE = 40
+CARRERAS_POR_PAGINA = 25
+CARRERAS_EXTREMOS = 10
+
+MODO_EXTREMOS = 'extremos'
+MODO_PAGINAS = 'paginas'
+NIVELES = {0: 'bajo', 1: 'medio', 2: 'alto'}
+
+def normalizar_texto(texto):
+    """Texto sin tildes, sin mayúsculas y con espacios simples, para búsquedas."""
+    texto = unicodedata.normalize('NFKD', str(texto))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.casefold().split())
+
+# =============================================================================
+# ÍNDICE ORDENADO
+# =============================================================================
+class IndiceCarreras:
+    """
+    Carreras ordenadas por avance POA (mayor a menor, desempate por nombre)
+    con sus columnas de búsqueda y filtro en arreglos numpy.
+    """
+
+    def __init__(self, tabla, carreras_list, umbrales=UMBRALES_AVANCE, version=None):
+        df = tabla.loc[tabla.index.intersection(carreras_list), ['avance_poa', 'director']]
+        df = df.rename_axis('carrera').reset_index()
+        df['avance_poa'] = pd.to_numeric(df['avance_poa'], errors='coerce').fillna(0.0)
+        df = df.sort_values(['avance_poa', 'carrera'], ascending=[False, True], kind='stable')
+
+        self.version = version
+        self.umbrales = validar_umbrales(umbrales)
+        self.carreras = df['carrera'].to_numpy(dtype=object)
+        self.avances = df['avance_poa'].to_numpy(dtype=float)
+        self.directores_carrera = df['director'].fillna('N/A').astype(str).str.strip().to_numpy(dtype=object)
+        self.niveles = nivel_avance(self.avances, self.umbrales)
+        self._claves = pd.Series([normalizar_texto(c) for c in self.carreras], dtype=object)
+
+    def __len__(self):
+        return len(self.carreras)
+
+    def directores(self):
+        """Directores distintos, en orden alfabético."""
+        return sorted(set(self.directores_carrera))
+
+    def filtrar(self, texto='', niveles=None, directores=None):
+        """
+        Posiciones (en el orden del índice) de las carreras cuyo nombre
+        contiene el texto y que pertenecen a los niveles y directores dados.
+        """
+        mascara = np.ones(len(self), dtype=bool)
+        texto = normalizar_texto(texto)
+        if texto:
+            mascara &= self._claves.str.contains(texto, regex=False).to_numpy()
+        if niveles:
+            mascara &= np.isin(self.niveles, [n for n, nombre in NIVELES.items() if nombre in niveles])
+        if directores:
+            mascara &= np.isin(self.directores_carrera, list(directores))
+        return np.flatnonzero(mascara)
+
+    def _vista(self, posiciones):
+        """Filas de la vista para las posiciones dadas (sin agregados)."""
+        return pd.DataFrame({
+            'carrera': self.carreras[posiciones],
+            'avance_poa': self.avances[posiciones],
+            'nivel': self.niveles[posiciones],
+            'cantidad': 1,
+        })
+
+    @staticmethod
+    def total_paginas(posiciones, por_pagina=CARRERAS_POR_PAGINA):
+        """Número de páginas de las posiciones filtradas (al menos una)."""
+        return max(1, -(-len(posiciones) // por_pagina))
+
+    def pagina(self, posiciones, numero, por_pagina=CARRERAS_POR_PAGINA):
+        """Página numero (desde 1) de las posiciones filtradas."""
+        numero = min(max(1, numero), self.total_paginas(posiciones, por_pagina))
+        inicio = (numero - 1) * por_pagina
+        return self._vista(posiciones[inicio:inicio + por_pagina])
+
+    def extremos(self, posiciones, n=CARRERAS_EXTREMOS):
+        """
+        Las n mejores y las n peores carreras de las posiciones filtradas,
+        con las intermedias agrupadas en una fila "Otros" (avance promedio).
+        """
+        if len(posiciones) <= 2 * n:
+            return self._vista(posiciones)
+        intermedias = posiciones[n:-n]
+        promedio = float(self.avances[intermedias].mean())
+        otros = pd.DataFrame({
+            'carrera': [f"Otras {len(intermedias)} carreras"],
+            'avance_poa': [promedio],
+            'nivel': nivel_avance([promedio], self.umbrales),
+            'cantidad': [len(intermedias)],
+        })
+        return pd.concat([self._vista(posiciones[:n]), otros, self._vista(posiciones[-n:])],
+                         ignore_index=True)
+
+    def vista_inicial(self):
+        """(clave_vista, vista) de la vista por defecto: mejores y peores sin filtros."""
+        return clave_vista(), self.extremos(self.filtrar())
+
+def clave_vista(texto='', niveles=(), directores=(), modo=MODO_EXTREMOS, pagina=1):
+    """Clave que identifica una vista del ranking en la caché de figuras."""
+    return (normalizar_texto(texto), tuple(sorted(niveles)), tuple(sorted(directores)), modo, pagina)
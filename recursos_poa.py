@@ -0,0 +1,116 @@
+"""
+Recursos estáticos del Dashboard POA Carreras
+=============================================
+
+Prepara el logo (reducido al tamaño en pantalla y en WebP) y la hoja de
+estilos como archivos estáticos servidos por Streamlit desde ./static, de
+modo que el navegador los descargue una vez y los guarde en caché en vez
+de recibirlos embebidos en cada rerun. Si el servicio de archivos
+estáticos está desactivado, se usa el contenido embebido, calculado una
+sola vez por proceso.
+
+Uso por línea de comandos:
+    python recursos_poa.py [--forzar]
+"""
+
+import argparse
+import base64
+import os
+import sys
+from functools import lru_cache
+
+from PIL import Image
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+DIRECTORIO_BASE = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_STATIC = os.path.join(DIRECTORIO_BASE, 'static')
+URL_STATIC = 'app/static'
+
+LOGO_ORIGINAL = os.path.join(DIRECTORIO_BASE, 'LOGO-RECTANGULAR_SIN-FONDO.png')
+LOGO_OPTIMIZADO = 'logo.webp'
+ARCHIVO_ESTILOS = 'estilos.css'
+
+# Alto con el que se muestra el logo en el encabezado; se genera al doble
+# para pantallas de alta densidad
+ALTO_LOGO_PX = 100
+ESCALA_LOGO = 2
+
+# =============================================================================
+# GENERACIÓN DE RECURSOS
+# =============================================================================
+def preparar_logo(forzar=False):
+    """
+    Genera static/logo.webp con el alto de visualización a partir del PNG
+    original. Devuelve la ruta del logo optimizado o None si no hay logo.
+    """
+    destino = os.path.join(DIRECTORIO_STATIC, LOGO_OPTIMIZADO)
+    if not os.path.exists(LOGO_ORIGINAL):
+        return destino if os.path.exists(destino) else None
+    if (not forzar and os.path.exists(destino)
+            and os.path.getmtime(destino) >= os.path.getmtime(LOGO_ORIGINAL)):
+        return destino
+
+    with Image.open(LOGO_ORIGINAL) as imagen:
+        alto = ALTO_LOGO_PX * ESCALA_LOGO
+        ancho = max(1, round(imagen.width * alto / imagen.height))
+        reducida = imagen.convert('RGBA').resize((ancho, alto), Image.LANCZOS)
+        os.makedirs(DIRECTORIO_STATIC, exist_ok=True)
+        temporal = f"{destino}.tmp{os.getpid()}"
+        reducida.save(temporal, format='WEBP', quality=90, method=6)
+        os.replace(temporal, destino)
+    return destino
+
+def preparar_recursos(forzar=False):
+    """Genera todos los recursos estáticos necesarios."""
+    return {'logo': preparar_logo(forzar)}
+
+# =============================================================================
+# RECURSOS PARA LA PÁGINA
+# =============================================================================
+@lru_cache(maxsize=None)
+def _leer_estilos():
+    """Contenido de la hoja de estilos (leída una vez por proceso)."""
+    with open(os.path.join(DIRECTORIO_STATIC, ARCHIVO_ESTILOS), encoding="utf-8") as f:
+        return f.read()
+
+@lru_cache(maxsize=None)
+def _logo_data_url():
+    """Logo optimizado codificado en base64 (calculado una vez por proceso)."""
+    ruta = preparar_logo()
+    if ruta is None:
+        return None
+    with open(ruta, "rb") as f:
+        return f"data:image/webp;base64,{base64.b64encode(f.read()).decode()}"
+
+def bloque_estilos(servir_estaticos):
+    """
+    Bloque <style> para la página: un @import del archivo estático (que el
+    navegador guarda en caché) o, si no se sirven estáticos, el CSS completo.
+    """
+    if servir_estaticos:
+        return f'<style>@import url("{URL_STATIC}/{ARCHIVO_ESTILOS}");</style>'
+    return f"<style>\n{_leer_estilos()}</style>"
+
+def url_logo(servir_estaticos):
+    """URL del logo: archivo estático o, si no se sirven estáticos, data URL."""
+    if servir_estaticos and preparar_logo() is not None:
+        return f"{URL_STATIC}/{LOGO_OPTIMIZADO}"
+    return _logo_data_url()
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Genera los recursos estáticos del dashboard.")
+    parser.add_argument('--forzar', action='store_true', help="Regenera aunque ya existan.")
+    args = parser.parse_args(argv)
+
+    for nombre, ruta in preparar_recursos(args.forzar).items():
+        print(f"{nombre}: {ruta}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""Datos compartidos por las pruebas: workbooks sintéticos pequeños."""
+
+import pytest
+
+from benchmarks.generar_workbook import generar_workbook, nombre_workbook
+
+CARRERAS = 6
+ACTIVIDADES = 60
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Workbook sintético con pocas carreras, en un directorio propio (y su propia caché)."""
+    return generar_workbook(str(tmp_path / nombre_workbook()), CARRERAS, ACTIVIDADES)
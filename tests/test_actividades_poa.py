@@ -0,0 +1,39 @@
+import pytest
+from openpyxl import Workbook
+
+from actividades_poa import (COLUMNAS_ACTIVIDADES, HOJA_ACTIVIDADES, LectorActividades, clave_carrera,
+                             detalle_estado, resumen_actividades)
+
+LARGA = 'Tecnología Superior en Desarrollo de Software'
+
+def _workbook_actividades(tmp_path, filas):
+    """Workbook con solo la hoja de actividades: (carrera, estado, prioridad) por fila."""
+    wb = Workbook()
+    hoja = wb.active
+    hoja.title = HOJA_ACTIVIDADES
+    hoja.append(COLUMNAS_ACTIVIDADES)
+    for carrera, estado, prioridad in filas:
+        hoja.append([carrera, 1, 1, estado, prioridad, None, 'Tarea', None, None, None, 0.5, 0, 10, 5])
+    ruta = tmp_path / 'actividades.xlsx'
+    wb.save(ruta)
+    return str(ruta)
+
+def test_nombres_que_difieren_tras_31_caracteres_se_rechazan(tmp_path):
+    otra = LARGA.replace('Software', 'Sistemas')
+    assert clave_carrera(LARGA) == clave_carrera(otra)
+    ruta = _workbook_actividades(tmp_path, [(LARGA, True, 'Alta'), (otra, False, 'Baja')])
+    with pytest.raises(ValueError, match='31 caracteres'):
+        LectorActividades(ruta)
+
+def test_mismo_nombre_con_otra_escritura_no_es_colision(tmp_path):
+    ruta = _workbook_actividades(tmp_path, [(LARGA, True, 'Alta'), (LARGA.upper(), False, 'Baja')])
+    # La hoja de la carrera tiene el nombre recortado a 31 caracteres
+    assert len(LectorActividades(ruta).actividades(LARGA[:31])) == 2
+
+def test_resumen_con_pendientes_y_prioridades(tmp_path):
+    ruta = _workbook_actividades(tmp_path, [('Enfermería', True, 'Alta'), ('Enfermería', False, 'Alta'),
+                                            ('Enfermería', False, None)])
+    resumen = resumen_actividades(LectorActividades(ruta).actividades('Enfermería'))
+    assert (resumen['completadas'], resumen['pendientes']) == (1, 2)
+    assert resumen['por_prioridad'] == {'Alta': 2, 'Sin prioridad': 1}
+    assert detalle_estado(resumen) == 'Pendientes: 2 | Por prioridad: Alta: 2 · Sin prioridad: 1'
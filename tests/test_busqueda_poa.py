@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import actividades_poa
+from actividades_poa import LectorActividades
+from busqueda_poa import (COLUMNAS_TEXTO, TIPO_ACTIVIDAD, IndiceBusqueda, leer_indice_busqueda,
+                          ruta_indice_busqueda, terminos)
+from datos_poa import hash_archivo
+
+@pytest.fixture
+def indice(workbook):
+    return leer_indice_busqueda(workbook)
+
+def _terminos_documentos(indice, workbook):
+    """Términos de cada documento del índice, calculados por fuerza bruta."""
+    tabla = LectorActividades(workbook).tabla(COLUMNAS_TEXTO).to_pylist()
+    documentos = []
+    for tipo, fila in zip(indice.doc_tipo, indice.doc_fila):
+        textos = [tabla[fila][c] for c in COLUMNAS_TEXTO] if tipo == TIPO_ACTIVIDAD \
+            else [str(indice.observaciones[fila])]
+        documentos.append({t for texto in textos for t in terminos(texto)})
+    return documentos
+
+def _esperados(documentos, consulta):
+    """Documentos con un término que empieza por cada término de la consulta."""
+    return [d for d, vistos in enumerate(documentos)
+            if all(any(t.startswith(q) for t in vistos) for q in terminos(consulta))]
+
+def test_terminos_sin_tildes_ni_mayusculas():
+    assert terminos('Revisión y actualización de los PEAS') == \
+        ['revision', 'y', 'actualizacion', 'de', 'los', 'peas']
+    assert terminos(None) == []
+
+def test_vocabulario_ordenado_con_postings_csr(indice):
+    assert list(indice.terminos) == sorted(indice.terminos)
+    assert indice.inicio[0] == 0 and indice.inicio[-1] == len(indice.documentos)
+    for i in range(len(indice.terminos)):
+        postings = indice.documentos[indice.inicio[i]:indice.inicio[i + 1]]
+        assert len(postings) and (np.diff(postings) > 0).all()
+
+@pytest.mark.parametrize('prefijo', ['capac', 'plan', 'moodle', 'inform', 'e', 'zzz'])
+def test_prefijo_igual_a_fuerza_bruta(indice, workbook, prefijo):
+    documentos = _terminos_documentos(indice, workbook)
+    encontrados = indice.documentos_prefijo(prefijo)
+    assert encontrados.tolist() == _esperados(documentos, prefijo)
+    assert (np.diff(encontrados) > 0).all()
+
+@pytest.mark.parametrize('consulta', ['plan capac', 'Capacitaciones DOCENTES', 'informe practicas',
+                                      'seguimiento moodle', 'evidencias segundo'])
+def test_varios_terminos_se_intersectan(indice, workbook, consulta):
+    documentos = _terminos_documentos(indice, workbook)
+    assert indice.buscar(consulta).tolist() == _esperados(documentos, consulta)
+
+def test_consultas_vacias_o_sin_resultados(indice):
+    assert len(indice.buscar('')) == 0
+    assert len(indice.buscar('plan zzzz')) == 0
+
+def test_indice_guardado_da_los_mismos_resultados(indice, workbook):
+    guardado = IndiceBusqueda.leer(ruta_indice_busqueda(workbook, hash_archivo(workbook)),
+                                   LectorActividades(workbook))
+    for consulta in ('plan capac', 'moodle', 'sin novedad'):
+        assert guardado.buscar(consulta).tolist() == indice.buscar(consulta).tolist()
+
+def test_busqueda_sin_cache_escribible(workbook, monkeypatch):
+    def sin_permisos(ruta, escribir):
+        raise OSError(30, 'Read-only file system')
+    monkeypatch.setattr(actividades_poa, 'escribir_atomico', sin_permisos)
+    monkeypatch.setattr('busqueda_poa.escribir_atomico', sin_permisos)
+
+    en_memoria = leer_indice_busqueda(workbook)
+    assert len(en_memoria.buscar('plan capac'))
+    monkeypatch.undo()
+    assert en_memoria.buscar('plan capac').tolist() == leer_indice_busqueda(workbook).buscar('plan capac').tolist()
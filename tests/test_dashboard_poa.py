@@ -0,0 +1,53 @@
+import os
+import shutil
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from datos_poa import ARCHIVO_EXCEL, cargar_datos
+
+DIRECTORIO_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(DIRECTORIO_BASE, 'dashboard_poa_carrerasx.py')
+
+@pytest.fixture
+def directorio_sin_mapa_gid(tmp_path, monkeypatch):
+    """
+    Directorio de datos con el workbook pero sin carreras_gid.json: quedan
+    filas de resumen con gid sin resolver, que no son carreras del selector.
+    """
+    shutil.copy(os.path.join(DIRECTORIO_BASE, ARCHIVO_EXCEL), tmp_path)
+    monkeypatch.setenv('POA_DIRECTORIO_DATOS', str(tmp_path))
+    monkeypatch.setenv('POA_RECARGA', '0')
+    monkeypatch.setenv('POA_PRECALENTAR_FIGURAS', '0')
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield str(tmp_path / ARCHIVO_EXCEL)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+def _abrir(carrera):
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.query_params['carrera'] = carrera
+    return at.run()
+
+def test_enlace_a_fila_sin_hoja_abre_la_vista_general(directorio_sin_mapa_gid):
+    carreras_data, carreras_list = cargar_datos(directorio_sin_mapa_gid)
+    sin_hoja = [c for c in carreras_data if c not in carreras_list]
+    assert sin_hoja and sin_hoja[0].startswith('gid=')
+
+    at = _abrir(sin_hoja[0])
+    assert not at.exception
+    assert at.selectbox(key='carrera').value == 'Todas las Carreras'
+    assert 'carrera' not in at.query_params
+
+def test_enlace_a_carrera_desconocida_abre_la_vista_general(directorio_sin_mapa_gid):
+    at = _abrir('Carrera que no existe')
+    assert not at.exception
+    assert at.selectbox(key='carrera').value == 'Todas las Carreras'
+
+def test_enlace_a_carrera_del_selector(directorio_sin_mapa_gid):
+    _, carreras_list = cargar_datos(directorio_sin_mapa_gid)
+    at = _abrir(carreras_list[0])
+    assert not at.exception
+    assert at.selectbox(key='carrera').value == carreras_list[0]
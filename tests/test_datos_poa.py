@@ -0,0 +1,89 @@
+from openpyxl import Workbook
+
+import datos_poa
+from datos_poa import (HOJA_METADATOS, construir_tabla_carreras, leer_mapa_gid_workbook,
+                       obtener_resumen)
+from tests.conftest import CARRERAS
+
+def _workbook_resumen(ruta, filas):
+    """Workbook con solo la hoja de metadatos, con las filas dadas."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = HOJA_METADATOS
+    for fila in filas:
+        ws.append(fila)
+    wb.save(ruta)
+    return str(ruta)
+
+def test_mapa_gid_resuelve_formulas(tmp_path):
+    ruta = _workbook_resumen(tmp_path / 'resumen.xlsx', [
+        [None, 'MATRIZ DE CUMPLIMIENTO'],
+        [1, 'gid=111', 'Mgtr. Ana', "='Desarrollo de Software'!$I$59"],
+        [2, 'gid=222', 'Mgtr. Luis', '=Turismo!I59'],
+        [3, 'gid=333', None, "='Gestión O''Higgins'!A1"],
+        [4, ' gid=444 ', None, "='Redes y Telecomunicaciones'!$I$59"],
+    ])
+    assert leer_mapa_gid_workbook(ruta) == {
+        'gid=111': 'Desarrollo de Software',
+        'gid=222': 'Turismo',
+        'gid=333': "Gestión O'Higgins",
+        'gid=444': 'Redes y Telecomunicaciones',
+    }
+
+def test_mapa_gid_ignora_filas_sin_formula_y_repetidas(tmp_path):
+    ruta = _workbook_resumen(tmp_path / 'resumen.xlsx', [
+        [1, 'gid=111', "='Primera'!A1"],
+        [2, 'gid=111', "='Segunda'!A1"],
+        [3, 'gid=222', 'sin fórmula'],
+        [4, None, "='Sin gid'!A1"],
+        [5, 'gid=333', '=SUM(A1:A3)'],
+    ])
+    assert leer_mapa_gid_workbook(ruta) == {'gid=111': 'Primera'}
+
+def test_mapa_gid_sin_hoja_de_metadatos(tmp_path):
+    wb = Workbook()
+    wb.active.title = 'Otra'
+    wb.save(tmp_path / 'otro.xlsx')
+    assert leer_mapa_gid_workbook(str(tmp_path / 'otro.xlsx')) == {}
+
+def test_tabla_carreras_con_nombres_de_hoja(workbook):
+    df_resumen, all_sheets, mapa_gid = obtener_resumen(workbook)
+    tabla, carreras = construir_tabla_carreras(df_resumen, all_sheets, mapa_gid, 2025)
+    assert len(carreras) == CARRERAS
+    assert set(carreras) <= set(tabla.index)
+    assert not any(str(c).startswith('gid=') for c in tabla.index)
+
+def _workbook_anio_mixto(ruta):
+    """resumen_carreras con un año no numérico: la columna queda como object al leer el Excel."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'resumen_carreras'
+    ws.append(['Nro.', 'CARRERA', 'Observación', '%Avance poa', 'año'])
+    ws.append([1, 'Turismo', 'SIN NOVEDAD', 0.5, 2025])
+    ws.append([2, 'Software', 42, 0.8, 2025])
+    ws.append([3, 'Redes', None, 'N/A', 'S/A'])
+    wb.save(ruta)
+    return str(ruta)
+
+def test_snapshot_conserva_anio_numerico(tmp_path):
+    ruta = _workbook_anio_mixto(tmp_path / 'mixto.xlsx')
+    obtener_resumen(ruta)
+    # Segunda lectura: desde el snapshot Parquet
+    df_resumen, all_sheets, mapa_gid = obtener_resumen(ruta)
+    assert (df_resumen['año'] == 2025).tolist() == [True, True, False]
+    assert df_resumen['Observación'].tolist()[:2] == ['SIN NOVEDAD', '42']
+    tabla, _ = construir_tabla_carreras(df_resumen, all_sheets + ['Turismo', 'Software'], mapa_gid, 2025)
+    assert tabla.loc[['Turismo', 'Software'], 'avance_poa'].tolist() == [50.0, 80.0]
+
+def test_sin_cache_escribible_da_los_mismos_tipos(tmp_path, monkeypatch):
+    ruta = _workbook_anio_mixto(tmp_path / 'mixto.xlsx')
+    def sin_permisos(ruta, escribir):
+        raise OSError(30, 'Read-only file system')
+    monkeypatch.setattr(datos_poa, 'escribir_atomico', sin_permisos)
+    desde_excel, _, _ = obtener_resumen(ruta)
+    monkeypatch.undo()
+    obtener_resumen(ruta)
+    desde_snapshot, _, _ = obtener_resumen(ruta)
+
+    assert desde_excel.dtypes.to_dict() == desde_snapshot.dtypes.to_dict()
+    assert desde_excel.fillna(-1).values.tolist() == desde_snapshot.fillna(-1).values.tolist()
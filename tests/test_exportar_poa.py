@@ -0,0 +1,31 @@
+import os
+
+from exportar_poa import PAGINA_GENERAL, exportar, nombres_archivo
+
+def test_nombres_de_archivo_unicos():
+    archivos = nombres_archivo(['Turismo', 'TURISMO', 'Turísmo', 'Index', 'Diseño Gráfico', '¿?'])
+    assert archivos == {
+        'Turismo': 'turismo.html',
+        'TURISMO': 'turismo-2.html',
+        'Turísmo': 'turismo-3.html',
+        'Index': 'index-2.html',
+        'Diseño Gráfico': 'diseno-grafico.html',
+        '¿?': 'carrera.html',
+    }
+    assert PAGINA_GENERAL not in archivos.values()
+
+def test_exportacion_incremental(workbook, tmp_path, monkeypatch):
+    monkeypatch.setenv('POA_DIRECTORIO_DATOS', os.path.dirname(workbook))
+    salida = str(tmp_path / 'reportes')
+
+    primera = exportar(salida, procesos=1, incremental=True)
+    assert len(primera['generadas']) == len(os.listdir(salida)) - 1
+    assert primera['omitidas'] == []
+
+    segunda = exportar(salida, procesos=1, incremental=True)
+    assert segunda['generadas'] == []
+    assert sorted(segunda['omitidas']) == sorted(primera['generadas'])
+
+    os.remove(os.path.join(salida, primera['generadas'][-1]))
+    tercera = exportar(salida, procesos=1, incremental=True)
+    assert tercera['generadas'] == [primera['generadas'][-1]]
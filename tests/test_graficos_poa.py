@@ -0,0 +1,30 @@
+from graficos_poa import CacheFiguras
+
+def _carreras(n):
+    nombres = [f"Carrera {i}" for i in range(n)]
+    return {c: {'avance_poa': 10.0 * i} for i, c in enumerate(nombres)}, nombres
+
+def test_acierto_y_fallo_devuelven_el_mismo_tipo():
+    cache = CacheFiguras(max_entradas=8)
+    fallo = cache.figura_donut('v1', 'Carrera 0', 40.0)
+    acierto = cache.figura_donut('v1', 'Carrera 0', 40.0)
+    assert type(fallo) is type(acierto) is dict
+    assert fallo == acierto
+    assert (cache.fallos, cache.aciertos) == (1, 1)
+
+def test_precalentar_llena_la_cache_sin_desalojar_sus_figuras():
+    carreras_data, carreras_list = _carreras(10)
+    cache = CacheFiguras(max_entradas=10)
+    cache.precalentar('v1', carreras_data, carreras_list, 50.0)
+    assert len(cache) == 10
+    # Las carreras precalentadas siguen en caché
+    cache.figura_donut('v1', 'Carrera 0', 0.0)
+    assert cache.aciertos == 1
+
+def test_versiones_desalojadas_dejan_de_estar_precalentadas():
+    carreras_data, carreras_list = _carreras(3)
+    cache = CacheFiguras(max_entradas=8)
+    for version in ('v1', 'v2', 'v3'):
+        cache.precalentar(version, carreras_data, carreras_list, 50.0)
+    assert cache._precalentadas == {'v3'}
+    assert len(cache) == 8
@@ -0,0 +1,193 @@
+import os
+import re
+import shutil
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+
+from actividades_poa import HOJA_ACTIVIDADES, LectorActividades
+from datos_poa import hash_archivo, ruta_cache
+from indicadores_poa import HOJA_INDICADORES, leer_indicadores
+from ingesta_poa import ENTRADA_TEXTOS, archivos_derivado, crc_hojas, hojas_cambiadas, ingerir
+
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_CELDA_EN_LINEA = re.compile(rb'<c ([^>]*?)\s*t="inlineStr"([^>]*)><is>(?:<t[^>]*>(.*?)</t>|<t[^>]*/>)</is></c>')
+
+@pytest.fixture
+def workbook(workbook):
+    """
+    El workbook sintético con los textos en sharedStrings, como lo guarda
+    Excel (openpyxl los escribe en línea).
+    """
+    textos = {}
+    def compartir(m):
+        indice = textos.setdefault(m[3] or b'', len(textos))
+        return b'<c ' + m[1] + b' t="s"' + m[2] + b'><v>' + str(indice).encode() + b'</v></c>'
+
+    def editar(zf, nombre, datos):
+        if nombre.startswith('xl/worksheets/'):
+            return _CELDA_EN_LINEA.sub(compartir, datos)
+        if nombre == 'xl/_rels/workbook.xml.rels':
+            return datos.replace(b'</Relationships>', (
+                b'<Relationship Id="rIdTextos" Target="sharedStrings.xml" Type="http://schemas.openxmlformats.org'
+                b'/officeDocument/2006/relationships/sharedStrings"/></Relationships>'))
+        if nombre == '[Content_Types].xml':
+            return datos.replace(b'</Types>', (
+                b'<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+                b'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>'))
+        return datos
+    _reescribir(workbook, editar)
+
+    with zipfile.ZipFile(workbook, 'a') as zf:
+        zf.writestr(ENTRADA_TEXTOS, b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    + b''.join(b'<si><t>' + texto + b'</t></si>' for texto in textos) + b'</sst>')
+    return workbook
+
+def _entrada_hoja(zf, hoja):
+    """Nombre de la entrada del zip con el XML de una hoja."""
+    libro = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+    relaciones = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    destinos = {r.get('Id'): r.get('Target') for r in relaciones.iter(f'{_NS_PKG}Relationship')}
+    for elemento in libro.iter(f'{_NS_MAIN}sheet'):
+        if elemento.get('name') == hoja:
+            destino = destinos[elemento.get(f'{_NS_REL}id')]
+            return destino.lstrip('/') if destino.startswith('/') else f"xl/{destino}"
+    raise KeyError(hoja)
+
+def _reescribir(ruta, editar):
+    """Reescribe el workbook pasando cada entrada del zip por editar(zf, nombre, datos)."""
+    with zipfile.ZipFile(ruta) as origen:
+        entradas = [(info, editar(origen, info.filename, origen.read(info))) for info in origen.infolist()]
+    temporal = f"{ruta}.editado"
+    with zipfile.ZipFile(temporal, 'w', zipfile.ZIP_DEFLATED) as destino:
+        for info, datos in entradas:
+            destino.writestr(info, datos)
+    shutil.move(temporal, ruta)
+
+def _sumar_a_celda(ruta, hoja, celda, cantidad=1):
+    """
+    Suma cantidad al número de una celda reescribiendo solo la entrada del
+    zip de su hoja, como cuando se edita una sola hoja del workbook.
+    """
+    def editar(zf, nombre, datos):
+        if nombre != _entrada_hoja(zf, hoja):
+            return datos
+        datos, cambios = re.subn(rf'(<c r="{celda}"[^>]*><v>)([^<]*)(</v>)'.encode(),
+                                 lambda m: m[1] + str(float(m[2]) + cantidad).encode() + m[3], datos)
+        assert cambios == 1
+        return datos
+    _reescribir(ruta, editar)
+
+def _texto_nuevo_en_hoja(ruta, hoja, celda, texto):
+    """
+    Escribe un texto nuevo en una celda como lo hace Excel: lo agrega al
+    inicio de sharedStrings, lo que renumera los índices de todas las hojas.
+    """
+    def editar(zf, nombre, datos):
+        if nombre == ENTRADA_TEXTOS:
+            return re.sub(rb'(<sst\b[^>]*>)', lambda m: m[1] + f"<si><t>{texto}</t></si>".encode(), datos)
+        if not nombre.startswith('xl/worksheets/'):
+            return datos
+        datos = re.sub(rb'(<c\b[^>]*\bt="s"[^>]*><v>)(\d+)(</v>)',
+                       lambda m: m[1] + str(int(m[2]) + 1).encode() + m[3], datos)
+        if nombre == _entrada_hoja(zf, hoja):
+            datos, cambios = re.subn(rf'(<c r="{celda}"[^>]*t="s"[^>]*><v>)\d+(</v>)'.encode(),
+                                     lambda m: m[1] + b'0' + m[2], datos)
+            assert cambios == 1
+        return datos
+    _reescribir(ruta, editar)
+
+def _cambiar_texto(ruta, anterior, nuevo):
+    """Cambia un texto de sharedStrings (en todas las celdas que lo usan)."""
+    def editar(zf, nombre, datos):
+        if nombre != ENTRADA_TEXTOS:
+            return datos
+        assert f"<t>{anterior}</t>".encode() in datos
+        return datos.replace(f"<t>{anterior}</t>".encode(), f"<t>{nuevo}</t>".encode())
+    _reescribir(ruta, editar)
+
+def _versiones_en_cache(workbook):
+    """Prefijos de hash con archivos en la caché del workbook."""
+    directorio = os.path.dirname(ruta_cache(workbook, '0' * 16, ''))
+    prefijo = os.path.splitext(os.path.basename(workbook))[0] + '.'
+    return {n[len(prefijo):].split('.', 1)[0] for n in os.listdir(directorio) if n.startswith(prefijo)}
+
+def test_primera_ingesta_construye_todo(workbook):
+    resultado = ingerir(workbook)
+    assert resultado['anterior'] is None
+    assert resultado['reconstruidos'] == ['resumen', 'actividades', 'indicadores', 'busqueda']
+    for derivado in resultado['reconstruidos']:
+        assert all(os.path.exists(r) for r in archivos_derivado(workbook, resultado['hash'], derivado))
+
+    resultado = ingerir(workbook)
+    assert resultado['vigentes'] == ['resumen', 'actividades', 'indicadores', 'busqueda']
+    assert resultado['reconstruidos'] == resultado['trasladados'] == []
+
+def test_crc_solo_cambia_la_hoja_editada(workbook):
+    crcs = crc_hojas(workbook)
+    _sumar_a_celda(workbook, HOJA_INDICADORES, 'D2')
+    assert hojas_cambiadas(crc_hojas(workbook), crcs) == [HOJA_INDICADORES]
+
+def test_texto_en_hoja_de_carrera_traslada_todo(workbook):
+    primera = ingerir(workbook)
+    _texto_nuevo_en_hoja(workbook, 'Carrera Sintética 0001', 'B1', 'Nota del director')
+    segunda = ingerir(workbook)
+
+    assert segunda['hash'] != primera['hash']
+    assert segunda['hojas_cambiadas'] == ['Carrera Sintética 0001']
+    assert segunda['trasladados'] == ['resumen', 'actividades', 'indicadores', 'busqueda']
+    assert segunda['reconstruidos'] == []
+    assert LectorActividades(workbook, segunda['hash']).tabla(['Carrera']).num_rows > 0
+
+def test_texto_en_actividades_reconstruye_sus_derivados(workbook):
+    ingerir(workbook)
+    _cambiar_texto(workbook, 'Planificar las capacitaciones docentes', 'Planificar los talleres docentes')
+    segunda = ingerir(workbook)
+
+    assert segunda['hojas_cambiadas'] == [HOJA_ACTIVIDADES]
+    assert segunda['trasladados'] == ['resumen', 'indicadores']
+    assert segunda['reconstruidos'] == ['actividades', 'busqueda']
+    tareas = set(LectorActividades(workbook, segunda['hash']).tabla(['Tarea']).column(0).to_pylist())
+    assert 'Planificar los talleres docentes' in tareas
+    assert 'Planificar las capacitaciones docentes' not in tareas
+
+def test_cambio_en_indicadores_traslada_el_resto(workbook):
+    primera = ingerir(workbook)
+    conteo = leer_indicadores(workbook, primera['hash'])['N° IND'].iloc[0]
+
+    _sumar_a_celda(workbook, HOJA_INDICADORES, 'D2')
+    segunda = ingerir(workbook)
+
+    assert segunda['hash'] == hash_archivo(workbook) != primera['hash']
+    assert segunda['anterior'] == primera['hash']
+    assert segunda['hojas_cambiadas'] == [HOJA_INDICADORES]
+    assert segunda['trasladados'] == ['resumen', 'actividades', 'busqueda']
+    assert segunda['reconstruidos'] == ['indicadores']
+    assert leer_indicadores(workbook, segunda['hash'])['N° IND'].iloc[0] == conteo + 1
+
+    # Los derivados trasladados se leen para el hash nuevo sin volver a parsear
+    lector = LectorActividades(workbook, segunda['hash'])
+    assert lector.indice['hash'] == segunda['hash']
+    assert lector.tabla().num_rows == len(LectorActividades(workbook, primera['hash']).tabla())
+
+def test_cambio_en_actividades_reconstruye_sus_derivados(workbook):
+    primera = ingerir(workbook)
+    horas = LectorActividades(workbook, primera['hash']).tabla(['Horas estimadas']).column(0)[0].as_py()
+    _sumar_a_celda(workbook, HOJA_ACTIVIDADES, 'M2', 100)
+    segunda = ingerir(workbook)
+
+    assert segunda['trasladados'] == ['resumen', 'indicadores']
+    assert segunda['reconstruidos'] == ['actividades', 'busqueda']
+    lector = LectorActividades(workbook, segunda['hash'])
+    assert lector.tabla(['Horas estimadas']).column(0)[0].as_py() == horas + 100
+
+def test_conserva_solo_la_version_anterior(workbook):
+    hashes = [ingerir(workbook)['hash']]
+    for _ in range(2):
+        _sumar_a_celda(workbook, HOJA_INDICADORES, 'D2')
+        hashes.append(ingerir(workbook)['hash'])
+    assert _versiones_en_cache(workbook) == {h[:16] for h in hashes[-2:]}
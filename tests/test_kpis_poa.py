@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from kpis_poa import ResumenKPI
+from ranking_poa import IndiceCarreras
+
+def _tabla(avances):
+    return pd.DataFrame({'avance_poa': avances, 'director': 'Mgtr. Ana Pérez', 'poa': 'ENTREGADO'},
+                        index=[f"Carrera {i}" for i in range(len(avances))])
+
+def test_niveles_con_umbrales_configurados():
+    tabla = _tabla([10.0, 45.0, 50.0, 70.0, 95.0])
+    kpis = ResumenKPI(tabla, list(tabla.index), umbrales=(50, 90))
+    assert (kpis.bajo, kpis.medio, kpis.alto) == (2, 2, 1)
+    assert kpis.etiquetas_niveles() == {'alto': 'Alto (>90%)', 'medio': 'Medio (50-89%)', 'bajo': 'Bajo (<50%)'}
+    assert kpis.entregados['poa'] == 5
+
+@pytest.mark.parametrize('umbrales', [(60,), (40, 60, 80), (80, 60), ()])
+def test_umbrales_invalidos(umbrales):
+    tabla = _tabla([10.0, 95.0])
+    with pytest.raises(ValueError, match='umbrales'):
+        ResumenKPI(tabla, list(tabla.index), umbrales=umbrales)
+    with pytest.raises(ValueError, match='umbrales'):
+        IndiceCarreras(tabla, list(tabla.index), umbrales=umbrales)
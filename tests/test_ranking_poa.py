@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from ranking_poa import IndiceCarreras
+
+def _indice(avances):
+    tabla = pd.DataFrame({'avance_poa': avances, 'director': 'Mgtr. Ana Pérez'},
+                         index=[f"Carrera {i:02d}" for i in range(len(avances))])
+    return IndiceCarreras(tabla, list(tabla.index))
+
+def test_extremos_agrupa_las_intermedias():
+    # Avances 0, 5, ..., 95: el índice los ordena de mayor a menor
+    indice = _indice([5.0 * i for i in range(20)])
+    vista = indice.extremos(indice.filtrar(), n=3)
+
+    assert len(vista) == 7
+    assert vista['avance_poa'].tolist()[:3] == [95.0, 90.0, 85.0]
+    assert vista['avance_poa'].tolist()[-3:] == [10.0, 5.0, 0.0]
+    otros = vista.iloc[3]
+    assert otros['carrera'] == 'Otras 14 carreras'
+    assert otros['cantidad'] == 14
+    assert otros['avance_poa'] == pytest.approx(sum(5.0 * i for i in range(3, 17)) / 14)
+    assert otros['nivel'] == 0
+    assert vista['cantidad'].sum() == 20
+
+def test_extremos_sin_agrupar_si_caben_todas():
+    indice = _indice([10.0, 70.0, 90.0, 40.0])
+    vista = indice.extremos(indice.filtrar(), n=2)
+    assert vista['avance_poa'].tolist() == [90.0, 70.0, 40.0, 10.0]
+    assert (vista['cantidad'] == 1).all()
+
+def test_extremos_sobre_posiciones_filtradas():
+    indice = _indice([5.0 * i for i in range(20)])
+    posiciones = indice.filtrar(niveles=['alto'])
+    vista = indice.extremos(posiciones, n=1)
+    assert vista['avance_poa'].tolist()[0] == 95.0
+    assert vista['carrera'].tolist()[1] == f"Otras {len(posiciones) - 2} carreras"
+    assert vista['avance_poa'].tolist()[-1] == min(indice.avances[posiciones])